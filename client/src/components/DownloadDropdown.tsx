@@ -1,7 +1,7 @@
 
 import { useState, useRef, useEffect } from 'react';
-import { Download, ChevronDown, File } from 'lucide-react';
-import { exportResumeToPDF } from '../services/pdfService';
+import { Download, ChevronDown, File, FileText } from 'lucide-react';
+import { exportResumeToDOCX, exportResumeToPDF } from '../services/pdfService';
 import { useCVStore } from '../store/useCVStore';
 import { buildCVPayload } from '../utils/payloadBuilder';
 import { Toast, type ToastType } from './ui/Toast';
@@ -29,18 +29,21 @@ export default function DownloadDropdown({ className = '' }: DownloadDropdownPro
   }, []);
 
   const handleDownload = async (format: 'pdf' | 'doc') => {
-    if (format === 'pdf') {
-      setIsDownloading(true);
-      try {
-        const payload = buildCVPayload(cvData, selectedTemplate);
+    const label = format === 'pdf' ? 'PDF' : 'DOCX';
+    setIsDownloading(true);
+    try {
+      const payload = buildCVPayload(cvData, selectedTemplate);
+      if (format === 'pdf') {
         await exportResumeToPDF(payload, 'cv.pdf');
-        setToast({ message: 'PDF exported successfully!', type: 'success', isVisible: true });
-      } catch (error) {
-        setToast({ message: 'Failed to export PDF. Please try again.', type: 'error', isVisible: true });
-      } finally {
-        setIsDownloading(false);
+      } else {
+        await exportResumeToDOCX(payload, 'cv.docx');
       }
-    } 
+      setToast({ message: `${label} exported successfully!`, type: 'success', isVisible: true });
+    } catch (error) {
+      setToast({ message: `Failed to export ${label}. Please try again.`, type: 'error', isVisible: true });
+    } finally {
+      setIsDownloading(false);
+    }
     setIsOpen(false);
   };
 
@@ -76,6 +79,14 @@ export default function DownloadDropdown({ className = '' }: DownloadDropdownPro
             <File className="w-4 h-4" />
             PDF
           </button>
+          <button
+            onClick={() => handleDownload('doc')}
+            disabled={isDownloading}
+            className="w-full px-4 py-2.5 text-left text-sm text-gray-700 dark:text-slate-200 hover:bg-gray-50 dark:hover:bg-slate-700 flex items-center gap-2 transition-colors disabled:opacity-50 disabled:cursor-not-allowed"
+          >
+            <FileText className="w-4 h-4" />
+            Word (DOCX)
+          </button>
         </div>
       )}
     </div>
@@ -5,11 +5,20 @@ import { getTemplateComponent, type TemplateId } from '../components/Preview/tem
 import { type TemplateProps } from '../types/resume';
 import { api } from '../services/apiClient';
 
+// The PDF exporter waits for this attribute instead of network idle: "true" once the
+// paginated pages are painted, "error" when there is nothing to render
+const READY_ATTRIBUTE = 'data-cv-ready';
+
+function markReady(state: 'true' | 'error') {
+  document.documentElement.setAttribute(READY_ATTRIBUTE, state);
+}
+
 export default function PreviewPage() {
   const [searchParams] = useSearchParams();
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [data, setData] = useState<TemplateProps | null>(null);
+  const [paginated, setPaginated] = useState(false);
 
   const templateId = useMemo<TemplateId>(() => {
     const t = searchParams.get('template') || 'classic';
@@ -36,6 +45,21 @@ export default function PreviewPage() {
     load();
   }, [searchParams]);
 
+  useEffect(() => {
+    document.documentElement.removeAttribute(READY_ATTRIBUTE);
+    if (loading) return;
+    if (error || !data) {
+      markReady('error');
+      return;
+    }
+    if (!paginated) return;
+    // onPaginate fires before React commits the pages; wait for them to be painted
+    let frame = requestAnimationFrame(() => {
+      frame = requestAnimationFrame(() => markReady('true'));
+    });
+    return () => cancelAnimationFrame(frame);
+  }, [loading, error, data, paginated]);
+
   if (loading) return <div className="min-h-screen flex items-center justify-center">Loading…</div>;
   if (error) return <div className="min-h-screen flex items-center justify-center text-red-600">{error}</div>;
   if (!data) return <div className="min-h-screen flex items-center justify-center">No data</div>;
@@ -43,7 +67,7 @@ export default function PreviewPage() {
   const TemplateComponent = getTemplateComponent(templateId);
 
   return (
-    <PaginatedPreview templateId={templateId} accentColor={data.theme.primaryColor} fontFamily={data.theme.fontFamily} renderAll>
+    <PaginatedPreview templateId={templateId} accentColor={data.theme.primaryColor} fontFamily={data.theme.fontFamily} renderAll onPaginate={() => setPaginated(true)}>
       <TemplateComponent
         {...data}
       />
@@ -38,8 +38,30 @@ export interface AIReviewResponse {
   atsCompatibility: { score: number; summary: string[] };
   contentQuality: { score: number; summary: string[] };
   formattingAnalysis: { score: number; summary: string[] };
+  jobMatch?: JobMatchResponse;
 }
 
-export async function submitCVForReview(cvData: CVPayload['data']): Promise<AIReviewResponse> {
-  return api.post<CVPayload['data'], AIReviewResponse>('/review', cvData);
+export interface JobMatchResponse {
+  score: number;
+  similarity: number;
+  keywords: number;
+  matched_keywords: string[];
+  missing_keywords: string[];
+  sections: Array<{
+    name: string;
+    coverage: number;
+    matched_keywords: string[];
+  }>;
+}
+
+export async function submitCVForReview(cvData: CVPayload['data'], jobDescription?: string): Promise<AIReviewResponse> {
+  const body = jobDescription ? { ...cvData, job_description: jobDescription } : cvData;
+  return api.post<CVPayload['data'], AIReviewResponse>('/review', body);
+}
+
+export async function matchJobDescription(cvData: CVPayload['data'], jobDescription: string): Promise<JobMatchResponse> {
+  return api.post<CVPayload['data'] & { job_description: string }, JobMatchResponse>('/review/job-match', {
+    ...cvData,
+    job_description: jobDescription,
+  });
 }
@@ -1,20 +1,35 @@
 import { api } from './apiClient';
 import type { CVPayload } from '../utils/payloadBuilder';
 
+const DOCX_MIME = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document';
+
+function saveBlob(blob: Blob, filename: string) {
+  const url = URL.createObjectURL(blob);
+  const a = document.createElement('a');
+  a.href = url;
+  a.download = filename;
+  document.body.appendChild(a);
+  a.click();
+  a.remove();
+  URL.revokeObjectURL(url);
+}
+
 export async function exportResumeToPDF(payload: CVPayload, filename = 'cv.pdf') {
   try {
     const res = await api.client.post('/export-pdf', payload, { responseType: 'blob' });
-    const blob = new Blob([res.data], { type: 'application/pdf' });
-    const url = URL.createObjectURL(blob);
-    const a = document.createElement('a');
-    a.href = url;
-    a.download = filename;
-    document.body.appendChild(a);
-    a.click();
-    a.remove();
-    URL.revokeObjectURL(url);
+    saveBlob(new Blob([res.data], { type: 'application/pdf' }), filename);
   } catch (error) {
     console.error('Failed to export PDF:', error);
     throw error; // Re-throw to allow calling function to handle
   }
 }
+
+export async function exportResumeToDOCX(payload: CVPayload, filename = 'cv.docx') {
+  try {
+    const res = await api.client.post('/export-docx', payload, { responseType: 'blob' });
+    saveBlob(new Blob([res.data], { type: DOCX_MIME }), filename);
+  } catch (error) {
+    console.error('Failed to export DOCX:', error);
+    throw error;
+  }
+}
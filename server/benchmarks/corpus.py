@@ -0,0 +1,79 @@
+"""Synthetic CV payloads in the shape the client sends to /review, at several sizes."""
+import random
+from typing import Dict, List
+
+# (jobs, bullets per job, summary sentences, skills, projects, education, extras per minor section)
+SIZES: Dict[str, tuple] = {
+    "small": (1, 2, 1, 4, 0, 1, 0),
+    "medium": (3, 4, 3, 10, 2, 1, 1),
+    "large": (6, 8, 6, 20, 4, 2, 3),
+    "xlarge": (15, 12, 20, 40, 8, 3, 6),
+}
+
+_VERBS = ["Led", "Built", "Designed", "Migrated", "Reduced", "Improved", "Automated", "Launched", "Mentored", "Owned"]
+_WEAK = ["Responsible for", "Worked on", "Helped with", "Involved in"]
+_THINGS = [
+    "the billing platform", "a data pipeline", "the mobile app", "CI/CD tooling", "the search service",
+    "an internal design system", "customer onboarding", "the reporting stack", "observability", "the public API",
+]
+_OUTCOMES = [
+    "cutting costs by {n}%", "serving {n}k users a day", "reducing latency by {n}%", "saving {n} hours a week",
+    "raising conversion by {n}%", "with {n} engineers",
+]
+_SKILLS = [
+    "Python", "TypeScript", "Go", "Rust", "SQL", "PostgreSQL", "Redis", "Kafka", "Docker", "Kubernetes",
+    "Terraform", "AWS", "GCP", "React", "FastAPI", "Django", "GraphQL", "Airflow", "Spark", "Linux",
+    "gRPC", "Prometheus", "Grafana", "Elasticsearch", "CI/CD", "Java", "Kotlin", "Swift", "C++", "Scala",
+    "Pandas", "NumPy", "PyTorch", "Figma", "Jira", "Agile", "Leadership", "Mentoring", "Hiring", "Security",
+]
+_LEVELS = ["", "Beginner", "Intermediate", "Advanced", "Expert"]
+
+
+def _bullet(rng: random.Random) -> str:
+    if rng.random() < 0.3:
+        return f"{rng.choice(_WEAK)} {rng.choice(_THINGS)} and related work with stakeholders."
+    outcome = rng.choice(_OUTCOMES).format(n=rng.randint(5, 90))
+    return f"{rng.choice(_VERBS)} {rng.choice(_THINGS)}, {outcome}."
+
+
+def make_payload(size: str, rng: random.Random) -> dict:
+    jobs, bullets, sentences, skills, projects, education, extras = SIZES[size]
+    year = 2025
+    experiences: List[dict] = []
+    for j in range(jobs):
+        start = year - rng.randint(1, 3)
+        items = "".join(f"<li>{_bullet(rng)}</li>" for _ in range(bullets))
+        experiences.append({
+            "position": rng.choice(["Software Engineer", "Senior Engineer", "Staff Engineer", "Engineering Manager"]),
+            "company": f"Company {j + 1}",
+            "location": rng.choice(["Berlin", "Remote", "London", "Lagos", "Toronto"]),
+            "startDate": f"{start}-{rng.randint(1, 12):02d}",
+            "endDate": "" if j == 0 else f"{year}-{rng.randint(1, 12):02d}",
+            "current": j == 0,
+            "description": f"<ul>{items}</ul>",
+        })
+        year = start
+    return {
+        "personalDetails": {"fullName": "Alex Example", "email": "alex@example.com", "jobTitle": "Software Engineer"},
+        "professionalSummary": {"content": " ".join(_bullet(rng) for _ in range(sentences))},
+        "workExperiences": experiences,
+        "education": [
+            {"degree": "BSc", "fieldOfStudy": "Computer Science", "institution": f"University {e + 1}",
+             "startDate": str(year - 4 * (e + 1)), "endDate": str(year - 4 * e)}
+            for e in range(education)
+        ],
+        "skills": [{"name": name, "level": rng.choice(_LEVELS)} for name in rng.sample(_SKILLS, skills)],
+        "projects": [
+            {"name": f"Project {p + 1}", "description": _bullet(rng), "link": f"https://example.com/p{p + 1}"}
+            for p in range(projects)
+        ],
+        "certifications": [{"name": f"Certification {c + 1}", "issuer": "Example Org", "issueDate": str(2020 + c)} for c in range(extras)],
+        "languages": [{"language": lang, "proficiency": "Fluent"} for lang in ["English", "German", "French", "Yoruba"][:extras]],
+        "awards": [{"title": f"Award {a + 1}", "issuer": "Example Org", "date": str(2018 + a)} for a in range(extras)],
+        "publications": [{"title": f"Paper {p + 1}", "publisher": "Example Press", "date": str(2019 + p)} for p in range(extras // 2)],
+    }
+
+
+def make_corpus(sizes: List[str], per_size: int, seed: int = 0) -> Dict[str, List[dict]]:
+    rng = random.Random(seed)
+    return {size: [make_payload(size, rng) for _ in range(per_size)] for size in sizes}
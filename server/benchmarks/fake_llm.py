@@ -0,0 +1,165 @@
+"""Deterministic, offline stand-in for OllamaClient used by the benchmarks.
+
+Answers are built from the prompt itself (section names, score seeded by a prompt
+hash), so the same prompt always gets the same answer. Latency is drawn from a
+configurable distribution, plus a per-token cost for the answer.
+"""
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+from typing import AsyncIterator, Dict, List, Optional
+
+from src.services.prompt_budget import estimate_tokens
+
+LATENCY_MODELS = ("constant", "uniform", "lognormal", "bimodal")
+MALFORMATIONS = ("fence", "prose", "trailing_comma", "single_quotes", "percent", "truncated", "no_json")
+
+_SECTION = re.compile(r"^Section: '(.+)'$", re.MULTILINE)
+_PACKED = re.compile(r"^### (.+)$", re.MULTILINE)
+
+
+def _score(prompt: str, salt: str = "") -> int:
+    digest = hashlib.sha256((salt + prompt).encode("utf-8")).digest()
+    return 40 + digest[0] % 56
+
+
+def _section_answer(name: str, prompt: str) -> dict:
+    return {
+        "name": name,
+        "score": _score(prompt, name),
+        "strengths": [f"{name} is clearly structured"],
+        "areas_to_improve": [f"{name} could show more measurable impact"],
+        "suggestions": [f"Quantify the outcomes in {name}"],
+    }
+
+
+def _dimensions(prompt: str, include_formatting: bool) -> Dict[str, dict]:
+    keys = ["atsCompatibility", "contentQuality"] + (["formattingAnalysis"] if include_formatting else [])
+    return {key: {"score": _score(prompt, key), "summary": [f"{key} looks reasonable"]} for key in keys}
+
+
+def answer_for(prompt: str) -> str:
+    """Well-formed JSON answer for any prompt PromptBuilder produces."""
+    include_formatting = '"formattingAnalysis"' in prompt
+    packed = _PACKED.findall(prompt)
+    if packed:
+        body = {"sections": [_section_answer(name, prompt) for name in packed], **_dimensions(prompt, include_formatting)}
+    elif "atsCompatibility" in prompt:
+        body = _dimensions(prompt, include_formatting)
+    else:
+        match = _SECTION.search(prompt)
+        body = _section_answer(match.group(1) if match else "Summary", prompt)
+    return json.dumps(body, indent=2)
+
+
+def malform(text: str, kind: str) -> str:
+    if kind == "fence":
+        return f"```json\n{text}\n```"
+    if kind == "prose":
+        return f"Sure! Here is the review you asked for:\n{text}\nLet me know if you need anything else."
+    if kind == "trailing_comma":
+        return re.sub(r"(\]|\"|\d)(\n\s*[}\]])", r"\1,\2", text)
+    if kind == "single_quotes":
+        return text.replace('"', "'")
+    if kind == "percent":
+        return re.sub(r'("score": )(\d+)', r"\1\2%", text)
+    if kind == "truncated":
+        return text[: int(len(text) * 0.7)]
+    if kind == "no_json":
+        return "I'm sorry, I can't review this CV."
+    raise ValueError(f"Unknown malformation '{kind}'")
+
+
+class FakeLLMClient:
+    """``LLMClient``/``StreamingLLMClient`` with simulated latency and injected bad output.
+
+    ``latency_ms`` is the median time to the first token; ``ms_per_token`` adds time per
+    answer token (streamed evenly across chunks). ``malformed_rate`` of the answers get one
+    of ``malformations`` applied and ``error_rate`` of the calls raise. Everything random
+    comes from one seeded generator, so a run is reproducible for a fixed call order.
+    """
+
+    def __init__(
+        self,
+        latency: str = "lognormal",
+        latency_ms: float = 300.0,
+        jitter: float = 0.5,
+        ms_per_token: float = 2.0,
+        malformed_rate: float = 0.0,
+        malformations: Optional[List[str]] = None,
+        error_rate: float = 0.0,
+        chunk_chars: int = 16,
+        time_scale: float = 1.0,
+        seed: int = 0,
+    ):
+        if latency not in LATENCY_MODELS:
+            raise ValueError(f"Unknown latency model '{latency}' (expected one of {', '.join(LATENCY_MODELS)})")
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.ms_per_token = ms_per_token
+        self.malformed_rate = malformed_rate
+        self.malformations = list(malformations or MALFORMATIONS)
+        self.error_rate = error_rate
+        self.chunk_chars = max(1, chunk_chars)
+        self.time_scale = time_scale
+        self.base_url = "fake://llm"
+        self._rng = random.Random(seed)
+        self.calls = 0
+        self.malformed = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.answer_tokens = 0
+
+    def _first_token_ms(self) -> float:
+        if self.latency == "constant":
+            return self.latency_ms
+        if self.latency == "uniform":
+            return self._rng.uniform(self.latency_ms * (1 - self.jitter), self.latency_ms * (1 + self.jitter))
+        if self.latency == "lognormal":
+            return self._rng.lognormvariate(math.log(self.latency_ms), self.jitter)
+        # bimodal: mostly fast, with a slow tail (cold model, busy GPU) one call in ten
+        return self.latency_ms * (5.0 if self._rng.random() < 0.1 else 1.0) * self._rng.uniform(0.8, 1.2)
+
+    def _answer(self, prompt: str) -> str:
+        self.calls += 1
+        if self._rng.random() < self.error_rate:
+            self.errors += 1
+            raise RuntimeError("Injected LLM failure")
+        text = answer_for(prompt)
+        if self._rng.random() < self.malformed_rate:
+            self.malformed += 1
+            text = malform(text, self._rng.choice(self.malformations))
+        self.prompt_tokens += estimate_tokens(prompt)
+        self.answer_tokens += estimate_tokens(text)
+        return text
+
+    async def _sleep(self, ms: float) -> None:
+        await asyncio.sleep(max(0.0, ms) * self.time_scale / 1000.0)
+
+    async def generate(self, prompt: str, model: str) -> str:
+        first_token_ms = self._first_token_ms()
+        text = self._answer(prompt)
+        await self._sleep(first_token_ms + self.ms_per_token * estimate_tokens(text))
+        return text
+
+    async def generate_stream(self, prompt: str, model: str) -> AsyncIterator[str]:
+        first_token_ms = self._first_token_ms()
+        text = self._answer(prompt)
+        await self._sleep(first_token_ms)
+        chunks = [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)]
+        per_chunk_ms = self.ms_per_token * estimate_tokens(text) / max(1, len(chunks))
+        owed = 0.0
+        for chunk in chunks:
+            # Sub-millisecond sleeps cost more than they ask for; pay the time in larger steps
+            owed += per_chunk_ms * self.time_scale
+            if owed >= 1.0:
+                await asyncio.sleep(owed / 1000.0)
+                owed = 0.0
+            yield chunk
+
+    async def aclose(self) -> None:
+        pass
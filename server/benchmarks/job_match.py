@@ -0,0 +1,118 @@
+"""Benchmark job description keyword matching: one-off matches and batched matrix scoring.
+
+Run from the server directory:
+
+    python -m benchmarks.job_match [--postings 5000] [--resumes 2000] [--repeat 50] [--seed 0]
+
+CVs come from benchmarks/corpus.py; postings are synthetic, drawn from the same skill
+and project vocabulary plus the boilerplate real postings carry. Reports:
+- one CV against one posting (match_job_description), with and without an IDF table
+- one CV against every posting and every CV against one posting (match_many), split
+  into vectorizing and scoring, next to the per-pair loop it replaces
+- a check of TermMatrix.dot against a dense NumPy product; exits non-zero on mismatch
+"""
+import argparse
+import random
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from src.services.cv_review import ResumeProcessor
+from src.services.job_match import KeywordIndex, TermMatrix, match_job_description, match_many
+
+from benchmarks.corpus import _SKILLS, _THINGS, make_payload
+
+_TITLES = ["Backend Engineer", "Data Engineer", "Platform Engineer", "Frontend Developer", "Engineering Manager", "ML Engineer"]
+_BOILERPLATE = [
+    "We are looking for a {title} to join our growing team.",
+    "You will own {thing} and work closely with product and design.",
+    "Strong experience with {a} and {b} is required; {c} is a plus.",
+    "Familiarity with {a}, {b} or {c}.",
+    "Competitive salary, remote-friendly culture and a learning budget.",
+]
+
+
+def make_posting(rng: random.Random) -> str:
+    lines = []
+    for template in _BOILERPLATE:
+        a, b, c = rng.sample(_SKILLS, 3)
+        lines.append(template.format(title=rng.choice(_TITLES), thing=rng.choice(_THINGS), a=a, b=b, c=c))
+    return "\n".join(lines)
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    """Median milliseconds per call."""
+    samples = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
+
+
+def dense(matrix: TermMatrix) -> np.ndarray:
+    out = np.zeros((matrix.rows, matrix.columns), dtype=np.float32)
+    for i in range(matrix.rows):
+        columns, weights = matrix.row(i)
+        out[i, columns] = weights
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--postings", type=int, default=5000)
+    ap.add_argument("--resumes", type=int, default=2000)
+    ap.add_argument("--repeat", type=int, default=50, help="runs per one-off measurement")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    postings = [make_posting(rng) for _ in range(args.postings)]
+    sizes = ["small", "medium", "large"]
+    resumes: List[Dict[str, str]] = [ResumeProcessor.flatten_resume_sections(make_payload(sizes[i % 3], rng)) for i in range(args.resumes)]
+    resume = ResumeProcessor.flatten_resume_sections(make_payload("medium", rng))
+    failures: List[str] = []
+
+    start = time.perf_counter()
+    index = KeywordIndex.fit(postings, min_df=2)
+    print(f"IDF table: {len(index)} terms from {index.documents} postings in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    print("one CV vs one posting (ms, median)")
+    print(f"  no IDF table             {timed(lambda: match_job_description(resume, postings[0]), args.repeat):8.2f}")
+    print(f"  with IDF table           {timed(lambda: match_job_description(resume, postings[0], index), args.repeat):8.2f}")
+
+    resume_text = "\n".join(resume.values())
+    cv = index.vectorize([resume_text])
+    posting_matrix = index.vectorize(postings)
+    one_cv_score = timed(lambda: cv.binary().dot(posting_matrix.top_per_row(60)), 5)
+    print(f"one CV vs {len(postings)} postings (ms)")
+    print(f"  vectorize postings       {timed(lambda: index.vectorize(postings), 1):8.1f}")
+    print(f"  score (matrix products)  {one_cv_score:8.2f}")
+    print(f"  match_many end to end    {timed(lambda: match_many([resume], postings, index), 1):8.1f}")
+    sample = postings[:200]
+    loop = timed(lambda: [match_job_description(resume, p, index) for p in sample], 1) * len(postings) / len(sample)
+    print(f"  per-pair loop (est.)     {loop:8.1f}")
+
+    resume_texts = ["\n".join(sections.values()) for sections in resumes]
+    print(f"{len(resumes)} CVs vs one posting (ms)")
+    print(f"  vectorize CVs            {timed(lambda: index.vectorize(resume_texts), 1):8.1f}")
+    cvs = index.vectorize(resume_texts)
+    keywords = index.vectorize(postings[:1]).top_per_row(60)
+    print(f"  score (matrix products)  {timed(lambda: cvs.binary().dot(keywords), 5):8.2f}")
+    print(f"  match_many end to end    {timed(lambda: match_many(resumes, postings[:1], index), 1):8.1f}")
+
+    a, b = cvs, posting_matrix
+    sub_a = TermMatrix(a.indptr[:51], a.indices, a.data, a.columns)
+    sub_b = TermMatrix(b.indptr[:301], b.indices, b.data, b.columns)
+    for budget in (1 << 22, 1000):
+        error = float(np.abs(sub_a.dot(sub_b, budget) - dense(sub_a) @ dense(sub_b).T).max())
+        if error > 1e-5:
+            failures.append(f"dot (budget {budget}) differs from the dense product by {error}")
+    for failure in failures:
+        print("FAIL", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,163 @@
+"""Fuzz and benchmark the LLM JSON extractor against the recorded output corpus.
+
+Run from the server directory:
+
+    python -m benchmarks.json_extract [--iterations 200] [--seed 7]
+
+Each corpus line is {"case", "output", "expected"}. Checks:
+- accuracy: extract_json(output) == expected, next to the previous brace-counting extractor
+- chunking: feeding the output in random chunks gives the same result as one call
+- truncation: every prefix of the output parses or returns None, never raises
+- mutation: comments, trailing commas and whitespace injected into valid outputs still parse
+Timings are per call, in microseconds.
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+from src.services.json_repair import IncrementalJSONParser, extract_json
+
+CORPUS = Path(__file__).parent / "data" / "llm_json_outputs.jsonl"
+
+
+def legacy_extract(text: str) -> Optional[dict]:
+    # TextProcessor.extract_json before the incremental parser, kept for comparison
+    text = re.sub(r"```(?:json)?\s*|\s*```", "", text, flags=re.IGNORECASE).strip()
+    start = text.find("{")
+    if start == -1:
+        return None
+    stack = 0
+    end = None
+    for i in range(start, len(text)):
+        if text[i] == "{":
+            stack += 1
+        elif text[i] == "}":
+            stack -= 1
+            if stack == 0:
+                end = i + 1
+                break
+    if end is None:
+        return None
+    try:
+        return json.loads(text[start:end])
+    except json.JSONDecodeError:
+        return None
+
+
+def load_corpus() -> List[dict]:
+    with CORPUS.open(encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def feed_chunks(text: str, rng: random.Random) -> Optional[dict]:
+    parser = IncrementalJSONParser()
+    pos = 0
+    while pos < len(text):
+        size = rng.randint(1, 24)
+        if parser.feed(text[pos:pos + size]) is not None:
+            break
+        pos += size
+    return parser.finish()
+
+
+def mutate(text: str, rng: random.Random) -> str:
+    # Only touch positions outside strings so the expected value is unchanged
+    out: List[str] = []
+    in_string = escape = False
+    for ch in text:
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "]}" and rng.random() < 0.3:
+            out.append(",")
+        elif ch == "," and rng.random() < 0.3:
+            out.append(rng.choice([" // note\n", " /* x */", "\n\t "]))
+            out.append(ch)
+            continue
+        out.append(ch)
+    return "".join(out)
+
+
+def time_per_call(fn: Callable[[str], Any], texts: List[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / (repeat * len(texts)) * 1e6
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--iterations", type=int, default=200, help="random chunkings/mutations per case")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args(argv)
+    rng = random.Random(args.seed)
+    corpus = load_corpus()
+    failures: List[str] = []
+
+    new_ok = sum(extract_json(c["output"]) == c["expected"] for c in corpus)
+    old_ok = sum(legacy_extract(c["output"]) == c["expected"] for c in corpus)
+    for c in corpus:
+        if extract_json(c["output"]) != c["expected"]:
+            failures.append(f"accuracy: {c['case']}")
+
+    chunk_runs = 0
+    for c in corpus:
+        whole = extract_json(c["output"])
+        for _ in range(args.iterations):
+            chunk_runs += 1
+            if feed_chunks(c["output"], rng) != whole:
+                failures.append(f"chunking: {c['case']}")
+                break
+
+    prefixes = 0
+    for c in corpus:
+        for cut in range(len(c["output"]) + 1):
+            prefixes += 1
+            try:
+                result = extract_json(c["output"][:cut])
+            except Exception as exc:
+                failures.append(f"truncation: {c['case']} at {cut}: {exc!r}")
+                break
+            if result is not None and not isinstance(result, dict):
+                failures.append(f"truncation: {c['case']} at {cut}: {type(result).__name__}")
+                break
+
+    mutations = 0
+    valid = [c for c in corpus if c["expected"] is not None and legacy_extract(c["output"]) == c["expected"]]
+    for c in valid:
+        for _ in range(args.iterations):
+            mutations += 1
+            mutated = mutate(c["output"], rng)
+            if extract_json(mutated) != c["expected"]:
+                failures.append(f"mutation: {c['case']}: {mutated[:120]!r}")
+                break
+
+    texts = [c["output"] for c in corpus]
+    clean = [c["output"] for c in valid]
+    print(f"corpus: {len(corpus)} outputs ({len(valid)} already valid JSON)")
+    print(f"accuracy: {new_ok}/{len(corpus)} (previous extractor {old_ok}/{len(corpus)})")
+    print(f"chunked feeds: {chunk_runs}, truncated prefixes: {prefixes}, mutations: {mutations}")
+    print(f"time per call, all outputs:   {time_per_call(extract_json, texts, 50):8.1f} us (previous {time_per_call(legacy_extract, texts, 50):8.1f} us)")
+    print(f"time per call, valid outputs: {time_per_call(extract_json, clean, 50):8.1f} us (previous {time_per_call(legacy_extract, clean, 50):8.1f} us)")
+    print(f"time per call, repair path:   {time_per_call(lambda t: IncrementalJSONParser().feed(t) or None, texts, 50):8.1f} us")
+    for failure in failures:
+        print("FAIL", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,385 @@
+"""Load-test PDF export against a local static stand-in for the client preview.
+
+Run from the server directory (needs Playwright's Chromium: ``playwright install chromium``):
+
+    python -m benchmarks.pdf_load [--strategies launch,pool] [--requests 24] [--concurrency 1,4,8]
+        [--target function|endpoint] [--mode client|server|native] [--template classic] [--size medium]
+        [--pool-size 4] [--asset-kb 256] [--json results.json]
+
+The stand-in answers /preview the way the React client does: an HTML shell plus a
+script bundle (padded to --asset-kb) that fetches /api/cv-data/{token} and renders
+the CV into the page, so client-mode exports go through generate_pdf_from_preview
+without the client running. Its markup comes from the server-side templates.
+``--mode native`` renders without a browser, for comparison; the strategy makes no
+difference there.
+
+Strategies:
+- launch: no pool; every render launches and closes its own Chromium
+- pool: the shared BrowserPool, --pool-size renders at a time on one warm browser
+Targets: ``function`` calls export_pdf_bytes directly; ``endpoint`` posts to
+/export-pdf in-process (through the job queue, as in production). The render cache
+is off so every request renders.
+
+Reports latency percentiles, throughput, failure rate, and peak RSS / PSS and process
+count of the Chromium processes under this one, sampled from /proc (Linux only).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.corpus import SIZES, make_payload
+
+STRATEGIES = ("launch", "pool")
+TARGETS = ("function", "endpoint")
+
+_SHELL = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Preview</title></head>
+<body><div id="root">Loading…</div><script src="/assets/app.js"></script></body></html>
+"""
+_APP_JS = """(function () {
+  var params = new URLSearchParams(location.search);
+  fetch('/api/cv-data/' + params.get('token') + '?template=' + encodeURIComponent(params.get('template')))
+    .then(function (r) { return r.json(); })
+    .then(function (d) {
+      var doc = new DOMParser().parseFromString(d.html, 'text/html');
+      document.head.innerHTML = doc.head.innerHTML;
+      document.body.innerHTML = doc.body.innerHTML;
+      // Same readiness signal as PreviewPage
+      requestAnimationFrame(function () { document.documentElement.setAttribute('data-cv-ready', 'true'); });
+    })
+    .catch(function () { document.documentElement.setAttribute('data-cv-ready', 'error'); });
+})();
+"""
+
+
+class PreviewStandIn:
+    """Threaded HTTP server standing in for CLIENT_BASE_URL during the benchmark."""
+
+    def __init__(self, asset_kb: int = 256):
+        # The bundle is padded so loading it costs roughly what the real client bundle does
+        padding = "/*" + "x" * max(0, asset_kb * 1024 - len(_APP_JS) - 4) + "*/\n"
+        self.app_js = (padding + _APP_JS).encode("utf-8")
+        self.requests = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self) -> type:
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                stand_in.requests += 1
+                url = urlparse(self.path)
+                if url.path == "/preview":
+                    self._send(200, _SHELL.encode("utf-8"), "text/html; charset=utf-8")
+                elif url.path == "/assets/app.js":
+                    self._send(200, stand_in.app_js, "application/javascript")
+                elif url.path.startswith("/api/cv-data/"):
+                    from src.services.html_render import render_resume_html
+                    from src.services.token_store import get_token_store
+
+                    entry = get_token_store().get(url.path.rsplit("/", 1)[-1])
+                    if not entry:
+                        self._send(404, b'{"detail": "Not found"}', "application/json")
+                        return
+                    template = parse_qs(url.query).get("template", ["classic"])[0]
+                    body = json.dumps({"html": render_resume_html(template, entry[0])}).encode("utf-8")
+                    self._send(200, body, "application/json")
+                else:
+                    self._send(404, b"", "text/plain")
+
+        return Handler
+
+
+def _children(pid: int) -> List[int]:
+    parents: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="utf-8") as fh:
+                # The command name can contain spaces; the ppid is the second field after it
+                ppid = int(fh.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        parents.setdefault(ppid, []).append(int(entry))
+    found: List[int] = []
+    stack = [pid]
+    while stack:
+        for child in parents.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def _memory_kb(pid: int) -> Optional[Dict[str, int]]:
+    try:
+        with open(f"/proc/{pid}/comm", encoding="utf-8") as fh:
+            if "chrom" not in fh.read().lower():
+                return None
+        usage = {"rss": 0, "pss": 0}
+        with open(f"/proc/{pid}/status", encoding="utf-8") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    usage["rss"] = int(line.split()[1])
+        try:
+            with open(f"/proc/{pid}/smaps_rollup", encoding="utf-8") as fh:
+                for line in fh:
+                    if line.startswith("Pss:"):
+                        usage["pss"] = int(line.split()[1])
+        except OSError:
+            usage["pss"] = usage["rss"]
+        return usage
+    except OSError:
+        return None
+
+
+class ChromiumMemorySampler:
+    """Peak memory of the Chromium processes started by this one, sampled in the background.
+
+    RSS counts pages shared between Chromium processes once per process, so it overstates
+    the total; PSS splits shared pages between them and is the better sum.
+    """
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.available = os.path.isdir("/proc")
+        self.peak_rss_kb = 0
+        self.peak_pss_kb = 0
+        self.peak_processes = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def sample(self) -> None:
+        usages = [u for u in (_memory_kb(pid) for pid in _children(os.getpid())) if u is not None]
+        self.peak_rss_kb = max(self.peak_rss_kb, sum(u["rss"] for u in usages))
+        self.peak_pss_kb = max(self.peak_pss_kb, sum(u["pss"] for u in usages))
+        self.peak_processes = max(self.peak_processes, len(usages))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.to_thread(self.sample)
+            await asyncio.sleep(self.interval)
+
+    def __enter__(self) -> "ChromiumMemorySampler":
+        if self.available:
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    def result(self) -> Dict[str, Any]:
+        if not self.available:
+            return {"peak_rss_mb": None, "peak_pss_mb": None, "peak_processes": None}
+        return {
+            "peak_rss_mb": round(self.peak_rss_kb / 1024, 1),
+            "peak_pss_mb": round(self.peak_pss_kb / 1024, 1),
+            "peak_processes": self.peak_processes,
+        }
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100.0
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+async def run_level(render, payloads: List[dict], concurrency: int) -> Dict[str, Any]:
+    limiter = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failures: Dict[str, int] = {}
+    sizes: List[int] = []
+
+    async def one(data: dict) -> None:
+        async with limiter:
+            start = time.perf_counter()
+            try:
+                sizes.append(len(await render(data)))
+            except Exception as exc:
+                reason = f"{type(exc).__name__}: {str(exc).splitlines()[0][:80] if str(exc) else ''}"
+                failures[reason] = failures.get(reason, 0) + 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    with ChromiumMemorySampler() as sampler:
+        start = time.perf_counter()
+        await asyncio.gather(*(one(data) for data in payloads))
+        elapsed = time.perf_counter() - start
+        sampler.sample()
+    failed = sum(failures.values())
+    return {
+        "concurrency": concurrency,
+        "requests": len(payloads),
+        "failed": failed,
+        "failure_rate": failed / len(payloads) if payloads else 0.0,
+        "failures": failures,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "mean": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+            **{f"p{q}": percentile(latencies, q) * 1000 for q in (50, 90, 95, 99)},
+            "max": max(latencies, default=0.0) * 1000,
+        },
+        "mean_pdf_kb": sum(sizes) / len(sizes) / 1024 if sizes else 0.0,
+        **sampler.result(),
+    }
+
+
+def _configure(args: argparse.Namespace, client_base_url: str) -> None:
+    # Settings are read once, so everything has to be in the environment before first use
+    for name, value in {
+        "APP_NAME": "cvforge-bench", "APP_VERSION": "bench", "API_PREFIX": "/api", "HOST": "127.0.0.1",
+        "PORT": "0", "DEBUG": "false", "CORS_ALLOWED_ORIGINS": '["http://127.0.0.1"]',
+    }.items():
+        os.environ.setdefault(name, value)
+    os.environ["CLIENT_BASE_URL"] = client_base_url
+    os.environ["PDF_RENDER_CACHE_MAX_BYTES"] = "0"
+    os.environ["PDF_MAX_CONCURRENT_RENDERS"] = str(args.pool_size)
+    os.environ.setdefault("PDF_JOB_WORKERS", str(max(int(c) for c in args.concurrency.split(","))))
+    os.environ.setdefault("PDF_JOB_MAX_QUEUE", str(max(64, args.requests)))
+    from src.config import get_settings
+
+    get_settings.cache_clear()
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    stand_in = PreviewStandIn(args.asset_kb)
+    stand_in.start()
+    _configure(args, stand_in.base_url)
+
+    import httpx
+    from fastapi import FastAPI
+
+    from src.api import create_api_router
+    from src.config import get_settings
+    from src.services import browser_pool
+    from src.services.pdf_export import export_pdf_bytes
+    from src.services.pdf_jobs import start_pdf_job_queue, stop_pdf_job_queue
+    from src.services.token_store import start_token_store, stop_token_store
+
+    rng = random.Random(args.seed)
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    settings = get_settings()
+    results: Dict[str, Any] = {"settings": vars(args), "strategies": {}}
+    await start_token_store()
+    try:
+        for strategy in args.strategies.split(","):
+            if strategy == "pool":
+                os.environ["PDF_BROWSER_POOL_ENABLED"] = "true"
+                get_settings.cache_clear()
+                await browser_pool.start_browser_pool()
+                if browser_pool.get_browser_pool() is None:
+                    print(f"[{strategy}] browser pool failed to start; skipped")
+                    continue
+            if args.target == "endpoint":
+                await start_pdf_job_queue()
+                app = FastAPI()
+                app.include_router(create_api_router(), prefix=settings.API_PREFIX)
+                http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None)
+
+                async def render(data: dict) -> bytes:
+                    response = await http.post(f"{settings.API_PREFIX}/export-pdf", json={"template": args.template, "data": data, "mode": args.mode})
+                    response.raise_for_status()
+                    return response.content
+            else:
+                async def render(data: dict) -> bytes:
+                    return (await export_pdf_bytes(args.template, data, args.mode))[1]
+
+            try:
+                # One warm-up render so the first level does not pay for imports and a cold disk cache
+                await run_level(render, [make_payload(args.size, rng)], 1)
+                outcomes = []
+                for level in levels:
+                    payloads = [make_payload(args.size, rng) for _ in range(args.requests)]
+                    outcomes.append(await run_level(render, payloads, level))
+                results["strategies"][strategy] = outcomes
+            finally:
+                if args.target == "endpoint":
+                    await http.aclose()
+                    await stop_pdf_job_queue()
+                await browser_pool.stop_browser_pool()
+    finally:
+        await stop_token_store()
+        stand_in.stop()
+    return results
+
+
+def report(results: Dict[str, Any]) -> None:
+    print(f"{'strategy':<10}{'conc':>5}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}{'req/s':>8}"
+          f"{'fail':>7}{'RSS MB':>8}{'PSS MB':>8}{'procs':>6}")
+    for strategy, outcomes in results["strategies"].items():
+        for o in outcomes:
+            lat = o["latency_ms"]
+            print(f"{strategy:<10}{o['concurrency']:>5}{lat['p50']:>9.0f}{lat['p90']:>9.0f}{lat['p99']:>9.0f}{lat['max']:>9.0f}"
+                  f"{o['throughput_rps']:>8.2f}{o['failure_rate']:>7.0%}{o['peak_rss_mb'] or 0:>8.0f}{o['peak_pss_mb'] or 0:>8.0f}{o['peak_processes'] or 0:>6}")
+            for reason, count in o["failures"].items():
+                print(f"{'':<15}{count} x {reason}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--strategies", default="launch,pool", help=f"comma-separated, from {', '.join(STRATEGIES)}")
+    ap.add_argument("--target", choices=TARGETS, default="function")
+    ap.add_argument("--mode", choices=("client", "server", "native"), default="client")
+    ap.add_argument("--template", default="classic", help="a template with a server-side renderer")
+    ap.add_argument("--size", choices=list(SIZES), default="medium")
+    ap.add_argument("--requests", type=int, default=24, help="renders per concurrency level")
+    ap.add_argument("--concurrency", default="1,4,8")
+    ap.add_argument("--pool-size", type=int, default=4, help="PDF_MAX_CONCURRENT_RENDERS for the pool strategy")
+    ap.add_argument("--asset-kb", type=int, default=256, help="size of the stand-in script bundle")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--json", help="also write the results to this file")
+    args = ap.parse_args(argv)
+    unknown = [s for s in args.strategies.split(",") if s not in STRATEGIES]
+    if unknown:
+        ap.error(f"unknown strategies: {', '.join(unknown)}")
+
+    from loguru import logger
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    results = asyncio.run(run(args))
+    report(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    failed = sum(o["failed"] for outcomes in results["strategies"].values() for o in outcomes)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""Benchmark the CV review pipeline end to end against a fake LLM, fully offline.
+
+Run from the server directory:
+
+    python -m benchmarks.review_pipeline [--sizes small,large] [--requests 12] [--concurrency 1,8]
+        [--latency lognormal] [--latency-ms 200] [--malformed-rate 0.1] [--stream]
+        [--strategy per_section|single_call] [--time-scale 0.05] [--json results.json]
+
+Reviews run through CVReviewService with FakeLLMClient (benchmarks/fake_llm.py) and
+synthetic payloads (benchmarks/corpus.py); the response cache and request coalescing
+are off so every review pays for its prompts. Reports:
+- stages: flatten_resume_sections, prompt building, heuristics, the LLM call and JSON
+  extraction, per review (LLM and extraction per call)
+- end to end: latency percentiles, throughput and LLM calls per review for each payload
+  size and concurrency level; with --stream also the time to the first event
+``--time-scale`` shrinks the simulated model latency (0 measures pipeline overhead only).
+"""
+import argparse
+import asyncio
+import copy
+import json
+import random
+import sys
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from src.services.cv_review import REVIEW_STRATEGIES, CVReviewConfig, CVReviewService, PromptBuilder, ResumeProcessor, TextProcessor
+from src.services.heuristics import HeuristicScorer
+
+from benchmarks.corpus import SIZES, make_corpus
+from benchmarks.fake_llm import LATENCY_MODELS, MALFORMATIONS, FakeLLMClient, answer_for, malform
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100.0
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "mean": sum(values) / len(values) if values else 0.0,
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else 0.0,
+    }
+
+
+class TimedClient:
+    """Records how long each LLM call takes, as seen by the pipeline."""
+
+    def __init__(self, inner: FakeLLMClient):
+        self.inner = inner
+        self.durations: List[float] = []
+
+    async def generate(self, prompt: str, model: str) -> str:
+        start = time.perf_counter()
+        try:
+            return await self.inner.generate(prompt, model)
+        finally:
+            self.durations.append(time.perf_counter() - start)
+
+    async def generate_stream(self, prompt: str, model: str) -> AsyncIterator[str]:
+        start = time.perf_counter()
+        try:
+            async for chunk in self.inner.generate_stream(prompt, model):
+                yield chunk
+        finally:
+            self.durations.append(time.perf_counter() - start)
+
+
+def time_call(fn: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def stage_timings(service: CVReviewService, payloads: List[dict], strategy: str, malformed_rate: float, seed: int) -> Dict[str, Dict[str, float]]:
+    """CPU stages in milliseconds per review, and extraction per model answer."""
+    rng = random.Random(seed)
+    include_formatting = not service.config.heuristics_enabled
+    stages: Dict[str, List[float]] = {"flatten_resume_sections": [], "prompt_building": [], "heuristics": [], "json_extraction": []}
+    for payload in payloads:
+        sections = ResumeProcessor.flatten_resume_sections(payload)
+
+        def build_prompts() -> List[str]:
+            inputs, resume_sections, _ = service._prepare_prompts(sections)
+            if strategy == "single_call":
+                return [PromptBuilder.compose_multi_section_prompt(service._section_inputs(resume_sections), include_formatting)]
+            resume_text = ResumeProcessor.build_resume_text_from_sections(resume_sections)
+            return [PromptBuilder.compose_content_analysis_prompt(resume_text, include_formatting)] + [
+                PromptBuilder.compose_section_prompt(name, content) for name, content in inputs
+            ]
+
+        stages["flatten_resume_sections"].append(time_call(lambda: ResumeProcessor.flatten_resume_sections(payload), 20) * 1000)
+        stages["prompt_building"].append(time_call(build_prompts, 5) * 1000)
+        stages["heuristics"].append(time_call(lambda: HeuristicScorer.score(sections), 5) * 1000)
+        for prompt in build_prompts():
+            answer = answer_for(prompt)
+            if rng.random() < malformed_rate:
+                answer = malform(answer, rng.choice(MALFORMATIONS))
+            stages["json_extraction"].append(time_call(lambda: TextProcessor.extract_json(answer), 20) * 1000)
+    return {name: summarize(values) for name, values in stages.items()}
+
+
+async def run_reviews(service: CVReviewService, payloads: List[dict], concurrency: int, stream: bool) -> Dict[str, Any]:
+    limiter = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    first_events: List[float] = []
+    failed_sections = 0
+    errors = 0
+
+    async def one(payload: dict) -> None:
+        nonlocal failed_sections, errors
+        async with limiter:
+            start = time.perf_counter()
+            try:
+                if stream:
+                    review: dict = {}
+                    first: Optional[float] = None
+                    async for event in service.stream_review_cv_payload(payload):
+                        if first is None and event["event"] in ("section", "analysis"):
+                            first = time.perf_counter() - start
+                        review = event.get("review", review)
+                    if first is not None:
+                        first_events.append(first)
+                else:
+                    review = await service.review_cv_payload(payload)
+            except Exception:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - start)
+            # A section that came back with nothing usable (unparseable answer, failed call)
+            failed_sections += sum(1 for sec in review.get("sections", []) if not sec.get("score") and not sec.get("suggestions"))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(payload) for payload in payloads))
+    elapsed = time.perf_counter() - start
+    result = {
+        "requests": len(payloads),
+        "errors": errors,
+        "failed_sections": failed_sections,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_ms": {k: v * 1000 for k, v in summarize(latencies).items()},
+    }
+    if stream:
+        result["first_event_ms"] = {k: v * 1000 for k, v in summarize(first_events).items()}
+    return result
+
+
+def _row(label: str, stats: Dict[str, float]) -> str:
+    return f"  {label:<26}{stats['mean']:>9.3f}{stats['p50']:>9.3f}{stats['p90']:>9.3f}{stats['p99']:>9.3f}{stats['max']:>9.3f}"
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    corpus = make_corpus(sizes, args.requests, args.seed)
+    config = CVReviewConfig()
+    config.heuristics_enabled = not args.no_heuristics
+    config.default_strategy = args.strategy
+    results: Dict[str, Any] = {"settings": vars(args), "stages": {}, "end_to_end": {}}
+
+    header = f"  {'':<26}{'mean':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}"
+    for size in sizes:
+        fake = FakeLLMClient(
+            latency=args.latency, latency_ms=args.latency_ms, jitter=args.jitter, ms_per_token=args.ms_per_token,
+            malformed_rate=args.malformed_rate, error_rate=args.error_rate, time_scale=args.time_scale, seed=args.seed,
+        )
+        timed = TimedClient(fake)
+        service = CVReviewService(timed, config, cache=None, stream=args.stream)
+        stages = stage_timings(service, corpus[size], args.strategy, args.malformed_rate, args.seed)
+        print(f"\n[{size}] stage timings (ms)\n{header}")
+        for name, stats in stages.items():
+            print(_row(name, stats))
+
+        results["end_to_end"][size] = {}
+        for level in levels:
+            timed.durations.clear()
+            calls_before = fake.calls
+            outcome = await run_reviews(service, copy.deepcopy(corpus[size]), level, args.stream)
+            outcome["llm_calls_per_review"] = (fake.calls - calls_before) / max(1, len(corpus[size]))
+            outcome["llm_call_ms"] = {k: v * 1000 for k, v in summarize(timed.durations).items()}
+            results["end_to_end"][size][level] = outcome
+        stages["llm_call"] = results["end_to_end"][size][levels[0]]["llm_call_ms"]
+        print(_row("llm_call", stages["llm_call"]))
+        results["stages"][size] = stages
+
+        print(f"[{size}] end to end (ms)\n{header}{'req/s':>9}{'calls':>7}{'bad':>5}")
+        for level, outcome in results["end_to_end"][size].items():
+            print(_row(f"concurrency {level}", outcome["latency_ms"])
+                  + f"{outcome['throughput_rps']:>9.2f}{outcome['llm_calls_per_review']:>7.1f}{outcome['failed_sections'] + outcome['errors']:>5}")
+            if args.stream:
+                print(_row("  first event", outcome["first_event_ms"]))
+        print(f"  fake LLM: {fake.calls} calls, {fake.malformed} malformed, {fake.errors} failed, "
+              f"~{fake.prompt_tokens // max(1, fake.calls)} prompt tokens/call")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", default="small,medium,large", help=f"comma-separated, from {', '.join(SIZES)}")
+    ap.add_argument("--requests", type=int, default=12, help="reviews per size and concurrency level")
+    ap.add_argument("--concurrency", default="1,8", help="comma-separated concurrency levels")
+    ap.add_argument("--latency", choices=LATENCY_MODELS, default="lognormal")
+    ap.add_argument("--latency-ms", type=float, default=200.0, help="median time to first token")
+    ap.add_argument("--jitter", type=float, default=0.5)
+    ap.add_argument("--ms-per-token", type=float, default=1.0)
+    ap.add_argument("--malformed-rate", type=float, default=0.0)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--stream", action="store_true", help="review through the streaming path")
+    ap.add_argument("--strategy", choices=REVIEW_STRATEGIES, default="per_section")
+    ap.add_argument("--no-heuristics", action="store_true")
+    ap.add_argument("--time-scale", type=float, default=1.0, help="multiplier on simulated latency")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--json", help="also write the results to this file")
+    args = ap.parse_args(argv)
+    unknown = [s for s in args.sizes.split(",") if s.strip() and s.strip() not in SIZES]
+    if unknown:
+        ap.error(f"unknown sizes: {', '.join(unknown)}")
+
+    from loguru import logger
+    # Injected failures would otherwise flood the output with warnings
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+    results = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
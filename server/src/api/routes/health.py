@@ -0,0 +1,22 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from typing import Any, Dict
+
+from ...services.model_keeper import get_model_keeper
+
+router = APIRouter()
+
+@router.get("/health/live", include_in_schema=False)
+async def liveness() -> Dict[str, str]:
+    # Async so the event loop itself answers; nothing else is checked so a slow model never restarts the process
+    return {"status": "alive"}
+
+@router.get("/health/ready", include_in_schema=False)
+async def readiness() -> JSONResponse:
+    keeper = get_model_keeper()
+    if keeper is None:
+        return JSONResponse({"status": "ready", "warmup": "disabled"})
+    body: Dict[str, Any] = keeper.stats()
+    ready = body.pop("ready")
+    # 503 until every model is loaded keeps traffic away while models load
+    return JSONResponse({"status": "ready" if ready else "warming", **body}, status_code=200 if ready else 503)
@@ -0,0 +1,70 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from typing import Dict, List, Tuple
+
+from ...services.browser_pool import get_browser_pool
+from ...services.cv_review import get_llm_backends, get_llm_scheduler, get_response_cache, get_single_flight
+from ...services.metrics import REGISTRY
+from ...services.model_keeper import get_model_keeper
+from ...services.pdf_export import get_render_cache
+from ...services.preview_assets import get_asset_cache
+from ...services.pdf_jobs import get_pdf_job_queue
+
+router = APIRouter()
+
+Samples = List[Tuple[Dict[str, str], float]]
+
+def _cache_stat(field: str) -> Samples:
+    samples: Samples = []
+    for name, cache in (("llm", get_response_cache()), ("pdf", get_render_cache()), ("pdf_assets", get_asset_cache())):
+        if cache is not None:
+            samples.append(({"cache": name}, cache.stats()[field]))
+    return samples
+
+def _pool_stat(field: str) -> Samples:
+    pool = get_browser_pool()
+    return [({}, pool.stats()[field])] if pool is not None else []
+
+def _queue_samples() -> Samples:
+    queue = get_pdf_job_queue()
+    if queue is None:
+        return []
+    stats = queue.stats()
+    return [({"status": status}, count) for status, count in stats["jobs"].items()]
+
+def _backend_stat(field: str) -> Samples:
+    # Only a multi-backend router tracks per-backend state
+    return [({"backend": b["url"]}, float(b[field])) for b in get_llm_backends() if field in b]
+
+def _coalescing_stat(field: str) -> Samples:
+    flights = get_single_flight()
+    return [({}, flights.stats()[field])] if flights is not None else []
+
+def _model_samples() -> Samples:
+    keeper = get_model_keeper()
+    if keeper is None:
+        return []
+    return [({"model": model}, 1.0 if state["ready"] else 0.0) for model, state in keeper.stats()["models"].items()]
+
+def _scheduler_stat(field: str) -> Samples:
+    return [({"priority": priority}, value) for priority, value in get_llm_scheduler().stats()[field].items()]
+
+REGISTRY.collector("cache_hits_total", "Response/render cache hits.", lambda: _cache_stat("hits"), kind="counter")
+REGISTRY.collector("cache_misses_total", "Response/render cache misses.", lambda: _cache_stat("misses"), kind="counter")
+REGISTRY.collector("cache_hit_ratio", "Cache hits over lookups since start.", lambda: _cache_stat("hit_rate"))
+REGISTRY.collector("cache_entries", "Entries held in memory.", lambda: _cache_stat("entries"))
+REGISTRY.collector("cache_bytes", "Bytes held in memory.", lambda: _cache_stat("bytes"))
+REGISTRY.collector("review_coalesced_total", "Reviews and prompts that joined an identical in-flight call.", lambda: _coalescing_stat("shared"), kind="counter")
+REGISTRY.collector("browser_pool_active_renders", "Renders holding a pooled browser context.", lambda: _pool_stat("active_renders"))
+REGISTRY.collector("browser_pool_launches_total", "Chromium launches by the pool.", lambda: _pool_stat("launches"), kind="counter")
+REGISTRY.collector("pdf_jobs", "PDF export jobs by status.", _queue_samples)
+REGISTRY.collector("llm_backend_outstanding", "Requests in flight per Ollama backend.", lambda: _backend_stat("outstanding"))
+REGISTRY.collector("llm_backend_healthy", "1 when the backend passed its last health check.", lambda: _backend_stat("healthy"))
+REGISTRY.collector("llm_model_warm", "1 when the model is loaded on at least one backend.", _model_samples)
+REGISTRY.collector("llm_scheduler_in_flight", "LLM calls holding a scheduler slot.", lambda: _scheduler_stat("in_flight"))
+REGISTRY.collector("llm_scheduler_waiting", "LLM calls queued for a scheduler slot.", lambda: _scheduler_stat("waiting"))
+
+# Async so collectors read loop-owned state on the loop, never from a threadpool worker
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,37 +1,144 @@
 from sys import exception
 from venv import logger
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import Response
-from typing import Any, Dict
-from uuid import uuid4
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from typing import Any, Dict, Tuple
 
 from ...config import get_settings
-from ...services.pdf_export import generate_pdf_from_preview, get_token, put_token
+from ...services.native_render import DOCX_MEDIA_TYPE, supports_native_render
+from ...services.pdf_bulk import stream_pdf_zip
+from ...services.pdf_export import export_docx_bytes, export_pdf_bytes, get_render_cache, get_token, render_cache_key, resolve_render_mode
+from ...services.pdf_jobs import DONE, FAILED, PdfJob, QueueFullError, get_pdf_job_queue
 
 router = APIRouter()
 
 @router.get("/cv-data/{token}")
-def get_cv_data(token: str) -> Dict[str, Any]:
-    return get_token(token)
+async def get_cv_data(token: str) -> Dict[str, Any]:
+    return await get_token(token)
 
-@router.post("/export-pdf")
-async def export_pdf(payload: Dict[str, Any]):
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [c.strip().removeprefix("W/") for c in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+@router.get("/export-pdf/cache")
+def export_cache_stats() -> Dict[str, Any]:
+    cache = get_render_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+def _parse_export_payload(payload: Dict[str, Any]) -> Tuple[str, Dict[str, Any], str]:
+    template = payload.get("template")
+    data = payload.get("data")
+    if not template or not data:
+        raise HTTPException(status_code=400, detail="Missing template or data")
+    mode = payload.get("mode")
+    # Anything else reaches settings lookups and str methods and surfaces as a 500
+    if not isinstance(template, str) or not isinstance(data, dict) or not isinstance(mode, (str, type(None))):
+        raise HTTPException(status_code=400, detail="'template' and 'mode' must be strings and 'data' an object")
+    try:
+        mode = resolve_render_mode(template, mode)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return template, data, mode
+
+async def _submit_job(template: str, data: Dict[str, Any], mode: str) -> PdfJob:
+    queue = get_pdf_job_queue()
+    if queue is None or not queue.running:
+        raise HTTPException(status_code=503, detail="PDF export queue is not running")
     try:
-        template = payload.get("template")
-        data = payload.get("data")
-        if not template or not data:
-            raise HTTPException(status_code=400, detail="Missing template or data")
+        return await queue.submit(template, data, mode)
+    except QueueFullError as exc:
+        raise HTTPException(status_code=429, detail=str(exc), headers={"Retry-After": "5"})
+
+def _get_job(job_id: str) -> PdfJob:
+    queue = get_pdf_job_queue()
+    job = queue.get(job_id) if queue is not None else None
+    if job is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return job
+
+def _job_response(job: PdfJob) -> Dict[str, Any]:
+    settings = get_settings()
+    base = f"{settings.API_PREFIX}/export-pdf/jobs/{job.id}"
+    return {**job.to_dict(), "status_url": base, "download_url": f"{base}/download"}
+
+# The job routes touch the queue's loop-owned state, so they must run on the event loop, not in the threadpool
+@router.post("/export-pdf/jobs", status_code=202)
+async def create_export_job(payload: Dict[str, Any]):
+    template, data, mode = _parse_export_payload(payload)
+    job = await _submit_job(template, data, mode)
+    return JSONResponse(status_code=202, content=_job_response(job))
+
+@router.get("/export-pdf/jobs/{job_id}")
+async def get_export_job(job_id: str, wait: float = 0.0):
+    job = _get_job(job_id)
+    # Long-poll: hold the request until the job settles or the wait budget runs out
+    if wait > 0:
+        await job.wait(min(wait, get_settings().PDF_JOB_MAX_WAIT_SECONDS))
+    return _job_response(job)
 
-        token = uuid4().hex
-        put_token(token, data)
+@router.get("/export-pdf/jobs/{job_id}/download")
+async def download_export_job(job_id: str):
+    job = _get_job(job_id)
+    if job.status == FAILED:
+        raise HTTPException(status_code=500, detail=job.error or "Failed to generate PDF")
+    if job.status != DONE:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    headers = {"Content-Disposition": "attachment; filename=cv.pdf", "ETag": f'"{job.key}"', "Cache-Control": "private, no-cache"}
+    return Response(content=job.result, media_type="application/pdf", headers=headers)
 
-        settings = get_settings()
-        preview_url = f"{settings.CLIENT_BASE_URL}/preview?template={template}&token={token}"
-        print(preview_url)
+@router.get("/export-pdf/queue")
+async def export_queue_stats() -> Dict[str, Any]:
+    queue = get_pdf_job_queue()
+    if queue is None:
+        return {"running": False}
+    return queue.stats()
+
+@router.post("/export-pdf/bulk")
+async def export_pdf_bulk(payload: Dict[str, Any]):
+    settings = get_settings()
+    items = payload.get("items")
+    # One CV in several templates: {"data": ..., "templates": [...]}
+    if items is None and isinstance(payload.get("templates"), list):
+        items = [{"template": t, "data": payload.get("data"), "mode": payload.get("mode")} for t in payload["templates"]]
+    if not isinstance(items, list) or not items:
+        raise HTTPException(status_code=400, detail="Missing items")
+    if len(items) > settings.PDF_BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Too many items (max {settings.PDF_BULK_MAX_ITEMS})")
+    headers = {"Content-Disposition": "attachment; filename=cvs.zip", "Cache-Control": "no-store"}
+    return StreamingResponse(stream_pdf_zip(items, settings.PDF_BULK_CONCURRENCY), media_type="application/zip", headers=headers)
+
+async def _render_export(template: str, data: Dict[str, Any], mode: str) -> bytes:
+    queue = get_pdf_job_queue()
+    if queue is None or not queue.running:
+        _, pdf_bytes = await export_pdf_bytes(template, data, mode)
+        return pdf_bytes
+    job = await _submit_job(template, data, mode)
+    await job.wait(None)
+    if job.status != DONE:
+        raise RuntimeError(job.error or "Failed to generate PDF")
+    return job.result
+
+@router.post("/export-pdf")
+async def export_pdf(payload: Dict[str, Any], request: Request):
+    try:
+        template, data, mode = _parse_export_payload(payload)
+
+        # The ETag is derived from the inputs, so a match can be answered before any rendering
+        etag = f'"{render_cache_key(template, data, mode)}"'
+        cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=cache_headers)
         try:
-            pdf_bytes = await generate_pdf_from_preview(preview_url)
-            headers = {"Content-Disposition": "attachment; filename=cv.pdf"}
+            pdf_bytes = await _render_export(template, data, mode)
+            headers = {"Content-Disposition": "attachment; filename=cv.pdf", **cache_headers}
             return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
+        except HTTPException:
+            raise
         except ModuleNotFoundError:
             raise HTTPException(status_code=500, detail="Playwright is not installed")
         except Exception:
@@ -40,3 +147,20 @@ async def export_pdf(payload: Dict[str, Any]):
         raise
     except Exception:
         raise HTTPException(status_code=500, detail="Export failed")
+
+@router.post("/export-docx")
+async def export_docx(payload: Dict[str, Any], request: Request):
+    template, data, _ = _parse_export_payload(payload)
+    # DOCX only comes from the native engine; there is no Chromium fallback to hand off to
+    if not supports_native_render(template):
+        raise HTTPException(status_code=400, detail=f"Template '{template}' cannot be exported as DOCX")
+    etag = f'"{render_cache_key(template, data, "docx")}"'
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=cache_headers)
+    try:
+        _, docx_bytes = await export_docx_bytes(template, data)
+    except Exception:
+        raise HTTPException(status_code=500, detail="Failed to generate DOCX")
+    headers = {"Content-Disposition": "attachment; filename=cv.docx", **cache_headers}
+    return Response(content=docx_bytes, media_type=DOCX_MEDIA_TYPE, headers=headers)
@@ -1,16 +1,148 @@
-from fastapi import APIRouter, HTTPException
-from typing import Any, Dict
-from ...services.cv_review import review_cv_payload
+import asyncio
+import json
+import math
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict
+from ...services.cv_review import (
+    REVIEW_STRATEGIES,
+    CVReviewConfig,
+    ResumeProcessor,
+    get_keyword_index,
+    get_llm_backends,
+    get_llm_scheduler,
+    get_response_cache,
+    get_single_flight,
+    iter_review_many,
+    review_cv_payload,
+    review_many,
+    stream_review_cv_payload,
+)
+from ...services.job_match import match_job_description, match_many
+from ...services.llm_scheduler import SchedulerOverloaded
 from loguru import logger
 
 router = APIRouter()
 
+def _check_strategy(payload: Dict[str, Any]) -> None:
+    strategy = payload.get("strategy")
+    if strategy is not None and strategy not in REVIEW_STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"Unknown strategy '{strategy}'. Use one of: {', '.join(REVIEW_STRATEGIES)}.")
+
+def _client_id(request: Request) -> str:
+    # Fair queuing is per client: an explicit id from a trusted caller, else the peer address
+    return request.headers.get("x-client-id") or (request.client.host if request.client else "anonymous")
+
+def _overloaded(exc: SchedulerOverloaded) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": str(math.ceil(exc.retry_after))})
+
 @router.post("/review")
-def review_resume(payload: Dict[str, Any]):
+async def review_resume(payload: Dict[str, Any], request: Request):
+    _check_strategy(payload)
     try:
         if payload.get("sections"):
-            return review_cv_payload(payload)
+            return await review_cv_payload(payload, _client_id(request))
         raise HTTPException(status_code=400, detail="Provide 'sections' or 'resume_text'.")
+    except SchedulerOverloaded as e:
+        raise _overloaded(e)
     except Exception as e:
         logger.exception("Review failed: {}", e)
-        raise HTTPException(status_code=500, detail=f"Review failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Review failed: {str(e)}")
+
+@router.post("/review/stream")
+async def review_resume_stream(payload: Dict[str, Any], request: Request):
+    if not payload.get("sections"):
+        raise HTTPException(status_code=400, detail="Provide 'sections' or 'resume_text'.")
+    _check_strategy(payload)
+    client_id = _client_id(request)
+
+    async def ndjson() -> AsyncIterator[str]:
+        try:
+            async for event in stream_review_cv_payload(payload, client_id):
+                yield json.dumps(event) + "\n"
+        except SchedulerOverloaded as e:
+            yield json.dumps({"event": "error", "detail": str(e), "retry_after": math.ceil(e.retry_after)}) + "\n"
+        except Exception as e:
+            logger.exception("Streaming review failed: {}", e)
+            yield json.dumps({"event": "error", "detail": f"Review failed: {str(e)}"}) + "\n"
+
+    # X-Accel-Buffering stops nginx-style proxies from holding events back
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson", headers={"X-Accel-Buffering": "no"})
+
+@router.post("/review/batch")
+async def review_resume_batch(payload: Dict[str, Any], request: Request):
+    items = payload.get("items")
+    if not isinstance(items, list) or not items:
+        raise HTTPException(status_code=400, detail="Provide a non-empty 'items' list.")
+    max_items = CVReviewConfig().batch_max_items
+    if len(items) > max_items:
+        raise HTTPException(status_code=413, detail=f"Batch too large: {len(items)} items (max {max_items})")
+    invalid = [index for index, item in enumerate(items) if not isinstance(item, dict)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Every item must be an object (invalid: {', '.join(map(str, invalid[:10]))})")
+    # Same 400 as /review, up front, rather than one error per item inside a 200
+    _check_strategy(payload)
+    for item in items:
+        _check_strategy(item)
+    # A batch-level model, strategy or job description applies to items that do not name their own
+    shared = {key: payload[key] for key in ("model", "strategy", "job_description") if payload.get(key)}
+    payloads = [{**item, **{key: item.get(key) or value for key, value in shared.items()}} for item in items]
+
+    # Batch prompts run at bulk priority, behind interactive reviews
+    client_id = _client_id(request)
+    if not payload.get("stream"):
+        return {"results": await review_many(payloads, client_id)}
+
+    async def ndjson() -> AsyncIterator[str]:
+        async for index, result in iter_review_many(payloads, client_id):
+            yield json.dumps({"index": index, **result}) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson", headers={"X-Accel-Buffering": "no"})
+
+@router.post("/review/job-match")
+async def review_job_match(payload: Dict[str, Any]):
+    job_description = payload.get("job_description")
+    if not payload.get("sections") or not isinstance(job_description, str) or not job_description.strip():
+        raise HTTPException(status_code=400, detail="Provide 'sections' and a 'job_description'.")
+    sections = ResumeProcessor.flatten_resume_sections(payload)
+    try:
+        return match_job_description(sections, job_description, get_keyword_index(), CVReviewConfig().jd_max_keywords)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/review/job-match/batch")
+async def review_job_match_batch(payload: Dict[str, Any]):
+    resumes = payload.get("resumes")
+    postings = payload.get("job_descriptions")
+    if not isinstance(resumes, list) or not resumes or not isinstance(postings, list) or not postings:
+        raise HTTPException(status_code=400, detail="Provide non-empty 'resumes' and 'job_descriptions' lists.")
+    config = CVReviewConfig()
+    largest = max(len(resumes), len(postings))
+    if largest > config.jd_match_max_items:
+        raise HTTPException(status_code=413, detail=f"Batch too large: {largest} items (max {config.jd_match_max_items})")
+    sections = [ResumeProcessor.flatten_resume_sections(item if isinstance(item, dict) else {}) for item in resumes]
+    top_k = payload.get("top_k")
+    if top_k is None:
+        top_k = 10
+    elif isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 1:
+        raise HTTPException(status_code=400, detail="'top_k' must be a positive integer.")
+    # Matrix products release the GIL; keep them off the event loop
+    return await asyncio.to_thread(
+        match_many, sections, [str(p or "") for p in postings], get_keyword_index(), config.jd_max_keywords, top_k
+    )
+
+@router.get("/review/cache")
+def review_cache_stats() -> Dict[str, Any]:
+    cache = get_response_cache()
+    flights = get_single_flight()
+    stats: Dict[str, Any] = {"enabled": False} if cache is None else {"enabled": True, **cache.stats()}
+    stats["coalescing"] = flights.stats() if flights is not None else {"enabled": False}
+    return stats
+
+@router.get("/review/backends")
+def review_backends() -> Dict[str, Any]:
+    return {"backends": get_llm_backends()}
+
+@router.get("/review/scheduler")
+def review_scheduler() -> Dict[str, Any]:
+    return get_llm_scheduler().stats()
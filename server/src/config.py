@@ -1,6 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -24,6 +24,39 @@ class AppSettings(BaseSettings):
 
     CLIENT_BASE_URL: str
     TOKEN_TTL_SECONDS: int = Field(default=300, env="TOKEN_TTL_SECONDS")
+    TOKEN_STORE_BACKEND: str = "memory"
+    TOKEN_STORE_PATH: str = ""
+    TOKEN_STORE_MAX_ENTRIES: int = 10000
+    TOKEN_SWEEP_INTERVAL_SECONDS: float = 60.0
+
+    PDF_BROWSER_POOL_ENABLED: bool = True
+    PDF_MAX_CONCURRENT_RENDERS: int = 4
+    PDF_BROWSER_RECYCLE_AFTER: int = 200
+    PDF_BROWSER_WATCHDOG_SECONDS: float = 15.0
+
+    PDF_READY_SIGNAL: bool = True
+    PDF_READY_TIMEOUT_SECONDS: float = 15.0
+    PDF_BLOCKED_URL_PATTERNS: str = ""
+    PDF_ASSET_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    PDF_ASSET_CACHE_TTL_SECONDS: int = 3600
+
+    PDF_RENDER_MODE: str = "client"
+    PDF_TEMPLATE_RENDER_MODES: Dict[str, str] = {}
+    PDF_RENDERER_VERSION: str = "1"
+    PDF_RENDER_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    PDF_RENDER_CACHE_TTL_SECONDS: int = 3600
+    PDF_RENDER_CACHE_DIR: str = ""
+    PDF_RENDER_CACHE_MAX_DISK_BYTES: int = 512 * 1024 * 1024
+
+    PDF_JOB_WORKERS: int = 4
+    PDF_JOB_MAX_QUEUE: int = 64
+    PDF_JOB_RESULT_TTL_SECONDS: int = 300
+    PDF_JOB_MAX_WAIT_SECONDS: float = 30.0
+
+    PDF_BULK_MAX_ITEMS: int = 100
+    PDF_BULK_CONCURRENCY: int = 4
+
+    METRICS_ENABLED: bool = True
 
     @field_validator("CORS_ALLOWED_ORIGINS", mode="before")
     def _split_csv(cls, v):
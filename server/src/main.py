@@ -6,9 +6,18 @@ from fastapi.exception_handlers import http_exception_handler, request_validatio
 from fastapi.exceptions import RequestValidationError
 from loguru import logger
 from pathlib import Path
+import time
 
 from src.config import get_settings
 from src.api import create_api_router
+from src.api.routes.health import router as health_router
+from src.api.routes.metrics import router as metrics_router
+from src.services.browser_pool import start_browser_pool, stop_browser_pool
+from src.services.cv_review import get_keyword_index, shutdown_llm_client, startup_llm_client
+from src.services.model_keeper import start_model_keeper, stop_model_keeper
+from src.services.metrics import HTTP_IN_FLIGHT, HTTP_LATENCY, HTTP_REQUESTS
+from src.services.pdf_jobs import start_pdf_job_queue, stop_pdf_job_queue
+from src.services.token_store import start_token_store, stop_token_store
 
 logger.add(
     Path(__file__).resolve().parents[1] / "logs" / "app.log",
@@ -20,7 +29,20 @@ logger.add(
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("FastAPI lifespan startup")
+    await startup_llm_client()
+    # Fail fast on a missing or corrupt REVIEW_JD_INDEX_PATH rather than on the first match
+    get_keyword_index()
+    # Loads models in the background; /health/ready reports 503 until they are warm
+    await start_model_keeper()
+    await start_token_store()
+    await start_browser_pool()
+    await start_pdf_job_queue()
     yield
+    await stop_pdf_job_queue()
+    await stop_browser_pool()
+    await stop_token_store()
+    await stop_model_keeper()
+    await shutdown_llm_client()
     logger.info("FastAPI lifespan shutdown")
 
 
@@ -60,6 +82,26 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    if settings.METRICS_ENABLED:
+        @app.middleware("http")
+        async def _metrics_middleware(request: Request, call_next):
+            start = time.perf_counter()
+            status = 500
+            with HTTP_IN_FLIGHT.track():
+                try:
+                    response = await call_next(request)
+                    status = response.status_code
+                    return response
+                finally:
+                    # The route template, not the raw path, keeps label cardinality bounded
+                    route = getattr(request.scope.get("route"), "path", "unmatched")
+                    HTTP_REQUESTS.inc(method=request.method, route=route, status=str(status))
+                    HTTP_LATENCY.observe(time.perf_counter() - start, method=request.method, route=route)
+
+        app.include_router(metrics_router)
+
+    # Probes sit outside the API prefix, next to /metrics
+    app.include_router(health_router)
     app.include_router(create_api_router(), prefix=settings.API_PREFIX)
 
     return app
@@ -0,0 +1,190 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, List, Optional, Set
+
+from loguru import logger
+from playwright.async_api import Browser, Page, Playwright, async_playwright
+
+from ..config import get_settings
+
+CHROMIUM_ARGS = [
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage",
+]
+
+
+class _BrowserHandle:
+    def __init__(self, browser: Browser):
+        self.browser = browser
+        self.renders = 0
+        self.active = 0
+        self.retired = False
+
+
+class BrowserPool:
+    """Keeps one Chromium process warm and hands out an isolated context per render.
+
+    The browser is replaced after ``recycle_after`` renders (old one closes once its
+    in-flight renders finish) and a watchdog relaunches it if the process dies.
+    """
+
+    def __init__(self, max_concurrent_renders: int = 4, recycle_after: int = 200, watchdog_interval: float = 15.0):
+        self.max_concurrent_renders = max(1, max_concurrent_renders)
+        self.recycle_after = max(1, recycle_after)
+        self.watchdog_interval = watchdog_interval
+        self._slots = asyncio.Semaphore(self.max_concurrent_renders)
+        self._lock = asyncio.Lock()
+        self._playwright: Optional[Playwright] = None
+        self._current: Optional[_BrowserHandle] = None
+        self._retiring: List[_BrowserHandle] = []
+        # Closes started outside a request; held so they are not collected mid-close and stop() can wait on them
+        self._closing: Set[asyncio.Task] = set()
+        self._watchdog: Optional[asyncio.Task] = None
+        self.launches = 0
+        self.crashes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._playwright is not None
+
+    async def start(self) -> None:
+        if self._playwright is not None:
+            return
+        self._playwright = await async_playwright().start()
+        try:
+            async with self._lock:
+                await self._launch()
+        except Exception:
+            await self._playwright.stop()
+            self._playwright = None
+            raise
+        self._watchdog = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._watchdog is not None:
+            self._watchdog.cancel()
+            self._watchdog = None
+        async with self._lock:
+            handles = self._retiring + ([self._current] if self._current else [])
+            self._current = None
+            self._retiring = []
+        for handle in handles:
+            await self._close(handle)
+        await asyncio.gather(*self._closing, return_exceptions=True)
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _launch(self) -> _BrowserHandle:
+        browser = await self._playwright.chromium.launch(args=CHROMIUM_ARGS)
+        self._current = _BrowserHandle(browser)
+        self.launches += 1
+        logger.info("Chromium launched for PDF pool (launch #{})", self.launches)
+        return self._current
+
+    async def _close(self, handle: _BrowserHandle) -> None:
+        try:
+            await handle.browser.close()
+        except Exception as exc:
+            logger.warning("Closing pooled Chromium failed: {}", str(exc))
+
+    def _retire(self, handle: _BrowserHandle) -> None:
+        handle.retired = True
+        if self._current is handle:
+            self._current = None
+        if handle.active:
+            self._retiring.append(handle)
+        else:
+            task = asyncio.create_task(self._close(handle))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    async def _acquire(self) -> _BrowserHandle:
+        async with self._lock:
+            handle = self._current
+            if handle is not None and (handle.renders >= self.recycle_after or not handle.browser.is_connected()):
+                self._retire(handle)
+                handle = None
+            if handle is None:
+                handle = await self._launch()
+            handle.renders += 1
+            handle.active += 1
+            return handle
+
+    async def _release(self, handle: _BrowserHandle) -> None:
+        async with self._lock:
+            handle.active -= 1
+            if handle.retired and handle.active == 0 and handle in self._retiring:
+                self._retiring.remove(handle)
+                await self._close(handle)
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.watchdog_interval)
+            try:
+                async with self._lock:
+                    handle = self._current
+                    if handle is not None and not handle.browser.is_connected():
+                        self.crashes += 1
+                        logger.error("Pooled Chromium disconnected; restarting")
+                        self._retire(handle)
+                        await self._launch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.exception("Browser pool watchdog failed: {}", str(exc))
+
+    @asynccontextmanager
+    async def page(self, **context_options: Any) -> AsyncIterator[Page]:
+        async with self._slots:
+            handle = await self._acquire()
+            try:
+                context = await handle.browser.new_context(**context_options)
+                try:
+                    yield await context.new_page()
+                finally:
+                    await context.close()
+            finally:
+                await self._release(handle)
+
+    def stats(self) -> dict:
+        current = self._current
+        return {
+            "running": self.running,
+            "max_concurrent_renders": self.max_concurrent_renders,
+            "launches": self.launches,
+            "crashes": self.crashes,
+            "renders_on_current_browser": current.renders if current else 0,
+            "active_renders": sum(h.active for h in self._retiring) + (current.active if current else 0),
+        }
+
+
+_POOL: Optional[BrowserPool] = None
+
+async def start_browser_pool() -> None:
+    global _POOL
+    settings = get_settings()
+    if not settings.PDF_BROWSER_POOL_ENABLED or _POOL is not None:
+        return
+    pool = BrowserPool(
+        max_concurrent_renders=settings.PDF_MAX_CONCURRENT_RENDERS,
+        recycle_after=settings.PDF_BROWSER_RECYCLE_AFTER,
+        watchdog_interval=settings.PDF_BROWSER_WATCHDOG_SECONDS,
+    )
+    try:
+        await pool.start()
+    except Exception as exc:
+        # Export still works without the pool: each request launches its own browser
+        logger.warning("PDF browser pool unavailable, falling back to per-request launch: {}", str(exc))
+        return
+    _POOL = pool
+
+async def stop_browser_pool() -> None:
+    global _POOL
+    if _POOL is not None:
+        await _POOL.stop()
+        _POOL = None
+
+def get_browser_pool() -> Optional[BrowserPool]:
+    return _POOL
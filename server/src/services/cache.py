@@ -0,0 +1,227 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from loguru import logger
+
+
+def make_cache_key(*parts: Any) -> str:
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _json_encode(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def _json_decode(raw: bytes) -> Any:
+    return json.loads(raw.decode("utf-8"))
+
+
+class LRUCache:
+    """In-memory LRU with TTL and entry/byte bounds, optionally backed by a directory on disk.
+
+    Values are serialised with ``encode``/``decode`` for the disk tier and for byte accounting,
+    so entries written by a previous process are picked up again after a restart. Async
+    callers use ``aget``/``aset``, which do the disk IO in a worker thread; memory hits
+    never leave the event loop. The disk tier keeps its own index of file sizes in write
+    order, built once at startup, so bounding it never rescans the directory.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        disk_dir: Optional[str] = None,
+        max_disk_bytes: Optional[int] = None,
+        encode: Callable[[Any], bytes] = _json_encode,
+        decode: Callable[[bytes], Any] = _json_decode,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_bytes = max_disk_bytes
+        self._encode = encode
+        self._decode = decode
+        self._entries: "OrderedDict[str, Tuple[float, Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._disk_dir: Optional[Path] = None
+        # Oldest write first; guarded by the lock because disk IO runs in worker threads
+        self._disk_index: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._disk_lock = threading.Lock()
+        if disk_dir:
+            self._disk_dir = Path(disk_dir)
+            self._disk_dir.mkdir(parents=True, exist_ok=True)
+            self._scan_disk()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    def _expiry(self) -> float:
+        return time.time() + self.ttl_seconds if self.ttl_seconds else float("inf")
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        return self._disk_dir / f"{key}.bin" if self._disk_dir else None
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._bytes -= entry[2]
+
+    def _store(self, key: str, value: Any, size: int, expires: float) -> None:
+        self._drop(key)
+        self._entries[key] = (expires, value, size)
+        self._bytes += size
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _scan_disk(self) -> None:
+        files = []
+        for path in self._disk_dir.glob("*.bin"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, path.stem, stat.st_size))
+        files.sort()
+        for _, key, size in files:
+            self._disk_index[key] = size
+            self._disk_bytes += size
+
+    def _forget_disk(self, key: str) -> None:
+        size = self._disk_index.pop(key, None)
+        if size is not None:
+            self._disk_bytes -= size
+
+    def _read_disk(self, key: str) -> Optional[Tuple[Any, int, float]]:
+        path = self._disk_path(key)
+        if path is None:
+            return None
+        try:
+            stat = path.stat()
+            expires = stat.st_mtime + self.ttl_seconds if self.ttl_seconds else float("inf")
+            if time.time() > expires:
+                with self._disk_lock:
+                    path.unlink(missing_ok=True)
+                    self._forget_disk(key)
+                return None
+            raw = path.read_bytes()
+            return self._decode(raw), len(raw), expires
+        except FileNotFoundError:
+            with self._disk_lock:
+                self._forget_disk(key)
+            return None
+        except Exception as exc:
+            logger.warning("Cache disk read failed for {}: {}", key, str(exc))
+            return None
+
+    def _write_disk(self, key: str, raw: bytes) -> None:
+        path = self._disk_path(key)
+        if path is None:
+            return
+        try:
+            # A unique temp name per write, so concurrent writers never share a partial file
+            with tempfile.NamedTemporaryFile(dir=self._disk_dir, suffix=".tmp", delete=False) as tmp:
+                tmp.write(raw)
+            with self._disk_lock:
+                try:
+                    os.replace(tmp.name, path)
+                except OSError:
+                    os.unlink(tmp.name)
+                    raise
+                self._forget_disk(key)
+                self._disk_index[key] = len(raw)
+                self._disk_bytes += len(raw)
+                if self.max_disk_bytes is not None:
+                    self._prune_disk()
+        except Exception as exc:
+            logger.warning("Cache disk write failed for {}: {}", key, str(exc))
+
+    def _prune_disk(self) -> None:
+        # Caller holds the disk lock
+        while self._disk_index and self._disk_bytes > self.max_disk_bytes:
+            oldest = next(iter(self._disk_index))
+            self._forget_disk(oldest)
+            self._disk_path(oldest).unlink(missing_ok=True)
+
+    def _get_memory(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, value, _ = entry
+            if time.time() <= expires:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self._drop(key)
+        return None
+
+    def _admit(self, key: str, from_disk: Optional[Tuple[Any, int, float]]) -> Optional[Any]:
+        if from_disk is None:
+            self.misses += 1
+            return None
+        value, size, expires = from_disk
+        self._store(key, value, size, expires)
+        self.hits += 1
+        self.disk_hits += 1
+        return value
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._get_memory(key)
+        if value is not None:
+            return value
+        return self._admit(key, self._read_disk(key))
+
+    async def aget(self, key: str) -> Optional[Any]:
+        value = self._get_memory(key)
+        if value is not None:
+            return value
+        from_disk = await asyncio.to_thread(self._read_disk, key) if self._disk_dir else None
+        return self._admit(key, from_disk)
+
+    def set(self, key: str, value: Any) -> None:
+        raw = self._encode(value)
+        self._store(key, value, len(raw), self._expiry())
+        self._write_disk(key, raw)
+
+    async def aset(self, key: str, value: Any) -> None:
+        raw = self._encode(value)
+        self._store(key, value, len(raw), self._expiry())
+        if self._disk_dir:
+            await asyncio.to_thread(self._write_disk, key, raw)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        if self._disk_dir:
+            with self._disk_lock:
+                for path in self._disk_dir.glob("*.bin"):
+                    path.unlink(missing_ok=True)
+                self._disk_index.clear()
+                self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
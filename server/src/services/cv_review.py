@@ -1,36 +1,205 @@
 import os
 import re
 import json
-from typing import Dict, List, Optional, Protocol
-import requests
+import asyncio
+import copy
+import time
+from contextlib import asynccontextmanager, nullcontext
+from typing import Any, AsyncContextManager, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Protocol, Set, Tuple
+import httpx
 from loguru import logger
 
+from .cache import LRUCache, make_cache_key
+from . import json_repair
+from .heuristics import HeuristicScorer
+from .job_match import KeywordIndex, match_job_description
+from .llm_router import Backend, LLMRouter, normalize_model
+from .llm_scheduler import BULK, INTERACTIVE, LLMScheduler
+from .metrics import LLM_FIRST_TOKEN, LLM_IN_FLIGHT, LLM_LATENCY, LLM_MODEL_LOAD, LLM_REQUESTS, REVIEW_STAGE, observe_tokens
+from .prompt_budget import PromptBudget, estimate_tokens
+from .single_flight import SingleFlight
+
 
 class LLMClient(Protocol):
-    def generate(self, prompt: str, model: str) -> str:
+    async def generate(self, prompt: str, model: str) -> str:
+        ...
+
+class StreamingLLMClient(LLMClient, Protocol):
+    def generate_stream(self, prompt: str, model: str) -> AsyncIterator[str]:
         ...
 
 class OllamaClient:
-    def __init__(self, base_url: str):
-        self.base_url = base_url
-    def generate(self, prompt: str, model: str) -> str:
+    def __init__(self, base_url: str, connect_timeout: float = 5.0, read_timeout: float = 120.0, max_connections: int = 32):
+        self.base_url = base_url.rstrip("/")
+        # One keep-alive pool per client; callers share the client for the app's lifetime
+        self._http = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        # Seconds Ollama keeps the model loaded after each call (-1: indefinitely); None leaves
+        # Ollama's default. Set by the ModelKeeper so requests do not cut a preload short, and
+        # sent only for the models it manages: any other model a caller names unloads as usual.
+        self.keep_alive: Optional[int] = None
+        self.keep_alive_models: Set[str] = set()
+    def _payload(self, model: str, **fields: Any) -> Dict[str, Any]:
+        if self.keep_alive is not None and normalize_model(model) in self.keep_alive_models:
+            fields["keep_alive"] = self.keep_alive
+        return {"model": model, **fields}
+    async def generate(self, prompt: str, model: str) -> str:
+        outcome = "error"
         try:
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json={"model": model, "prompt": prompt, "stream": False},
-                timeout=120,
-            )
-            response.raise_for_status()
-            return response.json().get("response", "")
+            with LLM_IN_FLIGHT.track(backend=self.base_url), LLM_LATENCY.time(backend=self.base_url, model=model, mode="generate"):
+                response = await self._http.post(
+                    "/api/generate",
+                    json=self._payload(model, prompt=prompt, stream=False),
+                )
+                response.raise_for_status()
+                body = response.json()
+            observe_tokens(self.base_url, model, body)
+            outcome = "ok"
+            return body.get("response", "")
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
         except Exception as exc:
             logger.error("Ollama API call failed: {}", str(exc))
             raise
+        finally:
+            LLM_REQUESTS.inc(backend=self.base_url, model=model, outcome=outcome)
+    async def generate_stream(self, prompt: str, model: str) -> AsyncIterator[str]:
+        start = time.perf_counter()
+        first = True
+        # A caller that stops reading once it has what it needs closes the stream early; that is a success
+        outcome = "ok"
+        LLM_IN_FLIGHT.inc(backend=self.base_url)
+        try:
+            async with self._http.stream(
+                "POST",
+                "/api/generate",
+                json=self._payload(model, prompt=prompt, stream=True),
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise RuntimeError(chunk["error"])
+                    if chunk.get("response"):
+                        if first:
+                            LLM_FIRST_TOKEN.observe(time.perf_counter() - start, backend=self.base_url, model=model)
+                            first = False
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        observe_tokens(self.base_url, model, chunk)
+                        break
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        except Exception as exc:
+            outcome = "error"
+            logger.error("Ollama streaming call failed: {}", str(exc))
+            raise
+        finally:
+            LLM_IN_FLIGHT.dec(backend=self.base_url)
+            LLM_LATENCY.observe(time.perf_counter() - start, backend=self.base_url, model=model, mode="stream")
+            LLM_REQUESTS.inc(backend=self.base_url, model=model, outcome=outcome)
+    async def preload(self, model: str, keep_alive: Optional[int] = None, timeout: Optional[float] = None) -> float:
+        """Load ``model`` without generating anything; returns Ollama's load time in seconds."""
+        body: Dict[str, Any] = {"model": model, "stream": False}
+        if keep_alive is not None:
+            body["keep_alive"] = keep_alive
+        response = await self._http.post("/api/generate", json=body, timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT)
+        response.raise_for_status()
+        load_seconds = response.json().get("load_duration", 0) / 1e9
+        LLM_MODEL_LOAD.observe(load_seconds, backend=self.base_url, model=model)
+        return load_seconds
+    async def list_models(self) -> List[str]:
+        response = await self._http.get("/api/tags")
+        response.raise_for_status()
+        return [m.get("name") or m.get("model") for m in response.json().get("models", [])]
+    async def aclose(self) -> None:
+        await self._http.aclose()
 
 
 class CVReviewConfig:
     def __init__(self):
         self.ollama_url = os.getenv("OLLAMA_URL", "http://localhost:11434")
+        # Several comma-separated URLs put an LLMRouter in front of them
+        self.ollama_urls = [u.strip() for u in os.getenv("OLLAMA_URLS", "").split(",") if u.strip()] or [self.ollama_url]
+        # Optional JSON object pinning the models each URL serves; others are discovered via /api/tags
+        self.backend_models: Dict[str, List[str]] = json.loads(os.getenv("OLLAMA_BACKEND_MODELS") or "{}")
+        self.retry_attempts = max(0, int(os.getenv("LLM_RETRY_ATTEMPTS", "2")))
+        self.retry_backoff = float(os.getenv("LLM_RETRY_BACKOFF_SECONDS", "0.2"))
+        self.breaker_failures = max(1, int(os.getenv("LLM_BREAKER_FAILURES", "3")))
+        self.breaker_reset = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+        self.health_interval = float(os.getenv("LLM_HEALTH_CHECK_SECONDS", "15"))
         self.default_model = os.getenv("OLLAMA_MODEL", "gemma3:4b")
+        # Models loaded at startup, before readiness reports ready: the default model plus LLM_WARMUP_MODELS
+        self.warmup_enabled = os.getenv("LLM_WARMUP", "true").lower() not in ("0", "false", "no", "off")
+        self.warmup_models = [m.strip() for m in os.getenv("LLM_WARMUP_MODELS", "").split(",") if m.strip()]
+        self.warmup_timeout = float(os.getenv("LLM_WARMUP_TIMEOUT_SECONDS", "300"))
+        # Keep-alive window ("08:00-20:00" and "mon,tue,wed,thu,fri"); both empty keeps the models loaded at all times
+        self.keepalive_hours = os.getenv("LLM_KEEPALIVE_HOURS", "")
+        self.keepalive_days = os.getenv("LLM_KEEPALIVE_DAYS", "")
+        self.keepalive_timezone = os.getenv("LLM_KEEPALIVE_TIMEZONE", "")
+        self.keepalive_interval = max(1.0, float(os.getenv("LLM_KEEPALIVE_INTERVAL_SECONDS", "240")))
+        # Max LLM calls a single review may have in flight, and across the whole process
+        self.max_concurrency_per_request = max(1, int(os.getenv("REVIEW_MAX_CONCURRENCY", "10")))
+        self.max_concurrency_global = max(1, int(os.getenv("OLLAMA_MAX_CONCURRENCY", "16")))
+        # When set (Ollama's own OLLAMA_NUM_PARALLEL), the global cap is that many slots per backend instead
+        self.backend_parallel = max(0, int(os.getenv("OLLAMA_NUM_PARALLEL", "0")))
+        # Scheduler: bulk (batch) calls leave slots free for interactive ones and are shed
+        # when they cannot start within their class deadline
+        self.bulk_max_in_flight = max(0, int(os.getenv("LLM_BULK_MAX_IN_FLIGHT", "0"))) or None
+        self.queue_deadlines = {
+            INTERACTIVE: float(os.getenv("LLM_QUEUE_DEADLINE_INTERACTIVE_SECONDS", "30")),
+            BULK: float(os.getenv("LLM_QUEUE_DEADLINE_BULK_SECONDS", "900")),
+        }
+        self.queue_max_waiting = max(1, int(os.getenv("LLM_QUEUE_MAX_WAITING", "2000")))
+        self.connect_timeout = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "5"))
+        self.read_timeout = float(os.getenv("OLLAMA_READ_TIMEOUT", "120"))
+        self.max_connections = max(1, int(os.getenv("OLLAMA_MAX_CONNECTIONS", "32")))
+        self.cache_max_entries = max(0, int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2048")))
+        self.cache_ttl_seconds = float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+        self.cache_dir = os.getenv("LLM_CACHE_DIR") or None
+        self.cache_max_disk_bytes = max(0, int(os.getenv("LLM_CACHE_MAX_DISK_BYTES", "268435456")))
+        self.batch_max_items = max(1, int(os.getenv("REVIEW_BATCH_MAX_ITEMS", "500")))
+        self.batch_max_concurrency = max(1, int(os.getenv("REVIEW_BATCH_MAX_CONCURRENCY", "16")))
+        # Rule-based scores blended into the LLM dimensions; formatting comes from the rules alone
+        self.heuristics_enabled = os.getenv("REVIEW_HEURISTICS", "true").lower() not in ("0", "false", "no", "off")
+        self.heuristic_weight = min(1.0, max(0.0, float(os.getenv("REVIEW_HEURISTIC_WEIGHT", "0.3"))))
+        # "per_section": one prompt per section plus a combined one; "single_call": everything in one prompt
+        self.default_strategy = os.getenv("REVIEW_STRATEGY", "per_section")
+        # Token budgets for resume text in prompts; REVIEW_SECTION_TOKEN_BUDGETS is a JSON object keyed by section
+        self.prompt_max_tokens = max(1, int(os.getenv("REVIEW_PROMPT_MAX_TOKENS", "3000")))
+        self.section_token_budget = max(1, int(os.getenv("REVIEW_SECTION_TOKEN_BUDGET", "300")))
+        self.section_token_budgets = {k: int(v) for k, v in json.loads(os.getenv("REVIEW_SECTION_TOKEN_BUDGETS") or "{}").items()}
+        # Job description matching: a saved vocabulary/IDF table (see job_match.KeywordIndex) and limits
+        self.jd_index_path = os.getenv("REVIEW_JD_INDEX_PATH") or None
+        self.jd_max_keywords = max(1, int(os.getenv("REVIEW_JD_MAX_KEYWORDS", "60")))
+        self.jd_match_max_items = max(1, int(os.getenv("REVIEW_JD_MATCH_MAX_ITEMS", "5000")))
+        # Identical reviews and prompts already in flight are shared instead of started again
+        self.coalesce_enabled = os.getenv("REVIEW_COALESCE", "true").lower() not in ("0", "false", "no", "off")
+
+
+REVIEW_STRATEGIES = ("per_section", "single_call")
+
+_SCHEDULER: Optional[LLMScheduler] = None
+
+def get_llm_scheduler() -> LLMScheduler:
+    global _SCHEDULER
+    if _SCHEDULER is None:
+        config = CVReviewConfig()
+        capacity = config.backend_parallel * len(config.ollama_urls) if config.backend_parallel else config.max_concurrency_global
+        _SCHEDULER = LLMScheduler(
+            max_in_flight=capacity,
+            bulk_max_in_flight=config.bulk_max_in_flight,
+            deadlines=config.queue_deadlines,
+            max_waiting=config.queue_max_waiting,
+        )
+    return _SCHEDULER
 
 
 class TextProcessor:
@@ -39,27 +208,8 @@ class TextProcessor:
         return re.sub(r"```(?:json)?\s*|\s*```", "", text, flags=re.IGNORECASE).strip()
     @staticmethod
     def extract_json(text: str) -> Optional[dict]:
-        text = TextProcessor.strip_code_fences(text)
-        start = text.find("{")
-        if start == -1:
-            return None
-        stack = 0
-        end = None
-        for i in range(start, len(text)):
-            ch = text[i]
-            if ch == "{":
-                stack += 1
-            elif ch == "}":
-                stack -= 1
-                if stack == 0:
-                    end = i + 1
-                    break
-        if end is None:
-            return None
-        try:
-            return json.loads(text[start:end])
-        except json.JSONDecodeError:
-            return None
+        with REVIEW_STAGE.time(stage="json_extraction"):
+            return json_repair.extract_json(text)
     @staticmethod
     def safe_number(value, default: float = 0.0) -> float:
         try:
@@ -73,14 +223,64 @@ class TextProcessor:
             return default
 
 
+async def complete_prompt(llm_client: LLMClient, prompt: str, model: str, stream: bool = False) -> str:
+    # Streaming keeps the read timeout per chunk rather than per response
+    if stream and hasattr(llm_client, "generate_stream"):
+        chunks: List[str] = []
+        parser = json_repair.IncrementalJSONParser()
+        stream_iter = llm_client.generate_stream(prompt, model)
+        try:
+            async for chunk in stream_iter:
+                chunks.append(chunk)
+                # Stop reading once the object closes; closing the stream stops generation too
+                if parser.feed(chunk) is not None:
+                    break
+        finally:
+            if hasattr(stream_iter, "aclose"):
+                await stream_iter.aclose()
+        return "".join(chunks)
+    return await llm_client.generate(prompt, model)
+
+
+class DedupingLLMClient:
+    """Shares one model call between identical (model, prompt) pairs for the lifetime of the wrapper."""
+
+    def __init__(self, inner: LLMClient):
+        self.inner = inner
+        self._calls: Dict[str, asyncio.Future] = {}
+        self.requested = 0
+        self.issued = 0
+    def _forget_failure(self, key: str, call: asyncio.Future) -> None:
+        # Only answers are shared; a failed call is retried by the next identical prompt
+        if (call.cancelled() or call.exception() is not None) and self._calls.get(key) is call:
+            del self._calls[key]
+    async def generate(self, prompt: str, model: str) -> str:
+        self.requested += 1
+        key = make_cache_key(model, prompt)
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(self.inner.generate(prompt, model))
+            call.add_done_callback(lambda done: self._forget_failure(key, done))
+            self._calls[key] = call
+            self.issued += 1
+        return await asyncio.shield(call)
+
+
 class PromptBuilder:
+    # Every prompt starts with the same text, and the section instructions come before
+    # the section name, so Ollama can reuse the cached prefix between calls.
+    SYSTEM_PROMPT = (
+        "You are a CV reviewer. Return ONLY valid JSON with exactly the structure requested. "
+        "Do NOT include any text outside the JSON.\n\n"
+    )
     @staticmethod
     def compose_section_prompt(name: str, content: str) -> str:
         return (
-            f"You are a CV reviewer. Analyze the '{name}' section below and provide feedback.\n\n"
-            "Return ONLY valid JSON with exactly this structure:\n"
+            PromptBuilder.SYSTEM_PROMPT
+            + "Task: analyze one CV section and provide feedback.\n\n"
+            "JSON structure:\n"
             "{\n"
-            f'  "name": "{name}",\n'
+            '  "name": string,  // the section name\n'
             '  "score": number,  // 0-100\n'
             '  "strengths": [string],\n'
             '  "areas_to_improve": [string],\n'
@@ -91,17 +291,43 @@ class PromptBuilder:
             "- Strengths: what works well\n"
             "- Areas to improve: specific weaknesses\n"
             "- Suggestions: actionable improvements\n\n"
-            "Do NOT include any text outside the JSON.\n\n"
+            f"Section: '{name}'\n"
             f"Section content:\n\"\"\"\n{content}\n\"\"\"\n"
         )
     @staticmethod
-    def compose_content_analysis_prompt(content: str) -> str:
+    def compose_content_analysis_prompt(content: str, include_formatting: bool = True) -> str:
+        if not include_formatting:
+            # Formatting, action verbs and metrics are scored by HeuristicScorer
+            return (
+                PromptBuilder.SYSTEM_PROMPT
+                + "Task: In ONE pass, evaluate the whole resume for:\n"
+                "- ATS Compatibility\n"
+                "- Content Quality\n\n"
+                "JSON structure:\n"
+                "{\n"
+                '  "atsCompatibility": {\n'
+                '    "score": number,  // 0-100\n'
+                '    "summary": [string]\n'
+                "  },\n"
+                '  "contentQuality": {\n'
+                '    "score": number,  // 0-100\n'
+                '    "summary": [string]\n'
+                "  }\n"
+                "}\n\n"
+                "Guidelines:\n"
+                "- ATS: keyword use, clear titles\n"
+                "- Content: specificity, relevance, clarity of impact\n\n"
+                "Provide concise bullet-style strings for each summary.\n\n"
+                "Resume to analyze:\n"
+                f"\"\"\"\n{content}\n\"\"\"\n"
+            )
         return (
-            "You are a CV reviewer. In ONE pass, evaluate the resume for:\n"
+            PromptBuilder.SYSTEM_PROMPT
+            + "Task: In ONE pass, evaluate the whole resume for:\n"
             "- ATS Compatibility\n"
             "- Content Quality\n"
             "- Formatting\n\n"
-            "Return ONLY valid JSON with exactly this structure:\n"
+            "JSON structure:\n"
             "{\n"
             '  "atsCompatibility": {\n'
             '    "score": number,  // 0-100\n'
@@ -120,27 +346,86 @@ class PromptBuilder:
             "- ATS: section headings, simple formatting, keyword use, clear titles\n"
             "- Content: measurable outcomes, specificity, coverage of key sections, action verbs\n"
             "- Formatting: consistency in headings, bullets, whitespace, punctuation, date ranges\n\n"
-            "Provide concise bullet-style strings for each summary. Do NOT include any text outside the JSON.\n\n"
+            "Provide concise bullet-style strings for each summary.\n\n"
             "Resume to analyze:\n"
             f"\"\"\"\n{content}\n\"\"\"\n"
         )
+    @staticmethod
+    def compose_multi_section_prompt(sections: List[Tuple[str, str]], include_formatting: bool = True) -> str:
+        formatting_schema = (
+            ',\n  "formattingAnalysis": {\n'
+            '    "score": number,  // 0-100\n'
+            '    "summary": [string]\n'
+            "  }"
+        ) if include_formatting else ""
+        formatting_guideline = "- Formatting: consistency in headings, bullets, whitespace, punctuation, date ranges\n" if include_formatting else ""
+        packed = "\n\n".join(f"### {name}\n\"\"\"\n{content}\n\"\"\"" for name, content in sections)
+        return (
+            PromptBuilder.SYSTEM_PROMPT
+            + "Task: In ONE pass, review every CV section below and the resume as a whole.\n\n"
+            "JSON structure:\n"
+            "{\n"
+            '  "sections": [\n'
+            "    {\n"
+            '      "name": string,  // the section name exactly as given\n'
+            '      "score": number,  // 0-100\n'
+            '      "strengths": [string],\n'
+            '      "areas_to_improve": [string],\n'
+            '      "suggestions": [string]\n'
+            "    }\n"
+            "  ],\n"
+            '  "atsCompatibility": {\n'
+            '    "score": number,  // 0-100\n'
+            '    "summary": [string]\n'
+            "  },\n"
+            '  "contentQuality": {\n'
+            '    "score": number,  // 0-100\n'
+            '    "summary": [string]\n'
+            f"  }}{formatting_schema}\n"
+            "}\n\n"
+            "Guidelines:\n"
+            "- One entry in \"sections\" for every section below, in the same order\n"
+            "- Section score: relevance, clarity, and impact; suggestions must be actionable\n"
+            "- ATS: section headings, keyword use, clear titles\n"
+            "- Content: measurable outcomes, specificity, action verbs\n"
+            f"{formatting_guideline}\n"
+            "Provide concise bullet-style strings.\n\n"
+            "Sections to analyze:\n"
+            f"{packed}\n"
+        )
 
 
 class SectionAnalyzer:
-    def __init__(self, llm_client: LLMClient):
+    def __init__(self, llm_client: LLMClient, cache: Optional[LRUCache] = None, stream: bool = False):
         self.llm_client = llm_client
-    def analyze_section(self, name: str, content: str, model: str) -> dict:
+        self.cache = cache
+        self.stream = stream
+    async def analyze_section(self, name: str, content: str, model: str, slot: Optional[AsyncContextManager[None]] = None) -> dict:
+        with REVIEW_STAGE.time(stage="section_analysis"):
+            return await self._analyze_section(name, content, model, slot)
+    async def _analyze_section(self, name: str, content: str, model: str, slot: Optional[AsyncContextManager[None]] = None) -> dict:
         try:
             prompt = PromptBuilder.compose_section_prompt(name, content)
-            response_text = self.llm_client.generate(prompt, model)
+            key = make_cache_key(model, prompt)
+            cached = await self.cache.aget(key) if self.cache is not None else None
+            if cached is not None:
+                return copy.deepcopy(cached)
+            # Only a call that reaches the model waits for (and holds) a slot
+            async with slot or nullcontext():
+                response_text = await complete_prompt(self.llm_client, prompt, model, self.stream)
             parsed = TextProcessor.extract_json(response_text) or {}
-            return {
-                "name": parsed.get("name", name),
+            result = {
+                # The section name is ours, not the model's: weights and penalties key on it
+                "name": name,
                 "score": TextProcessor.safe_number(parsed.get("score", 0)),
                 "strengths": list(map(str, parsed.get("strengths", []))),
                 "areas_to_improve": list(map(str, parsed.get("areas_to_improve", []))),
                 "suggestions": list(map(str, parsed.get("suggestions", []))),
             }
+            # Unparseable responses are not cached so the next review gets a fresh attempt
+            if parsed and self.cache is not None:
+                await self.cache.aset(key, copy.deepcopy(result))
+            return result
         except Exception as exc:
             logger.warning("Section analysis failed for '{}': {}", name, str(exc))
             return {"name": name, "score": 0.0, "strengths": [], "areas_to_improve": [], "suggestions": []}
@@ -264,7 +549,9 @@ class ResumeProcessor:
     @staticmethod
     def build_resume_text_from_nested(sections_payload: dict) -> str:
         sections_payload = sections_payload or {}
-        flat = ResumeProcessor.flatten_resume_sections(sections_payload)
+        return ResumeProcessor.build_resume_text_from_sections(ResumeProcessor.flatten_resume_sections(sections_payload))
+    @staticmethod
+    def build_resume_text_from_sections(flat: Dict[str, str]) -> str:
         order = ["Summary", "Experience", "Education", "Skills", "Projects", "Certifications", "Publications", "Awards", "Languages"]
         lines: List[str] = []
         for name in order:
@@ -277,22 +564,38 @@ class ResumeProcessor:
         return "\n\n".join(lines).strip()
 
 class ContentAnalyzer:
-    def __init__(self, llm_client: LLMClient):
+    def __init__(self, llm_client: LLMClient, cache: Optional[LRUCache] = None, stream: bool = False):
         self.llm_client = llm_client
-    def analyze_resume_content(self, resume_text: str, model: str) -> dict:
+        self.cache = cache
+        self.stream = stream
+    async def analyze_resume_content(
+        self, resume_text: str, model: str, include_formatting: bool = True, slot: Optional[AsyncContextManager[None]] = None
+    ) -> dict:
+        with REVIEW_STAGE.time(stage="content_analysis"):
+            return await self._analyze_resume_content(resume_text, model, include_formatting, slot)
+    async def _analyze_resume_content(
+        self, resume_text: str, model: str, include_formatting: bool = True, slot: Optional[AsyncContextManager[None]] = None
+    ) -> dict:
         try:
-            prompt = PromptBuilder.compose_content_analysis_prompt(resume_text)
-          
-            response_text = self.llm_client.generate(prompt, model)
+            prompt = PromptBuilder.compose_content_analysis_prompt(resume_text, include_formatting)
+            key = make_cache_key(model, prompt)
+            cached = await self.cache.aget(key) if self.cache is not None else None
+            if cached is not None:
+                return copy.deepcopy(cached)
+            async with slot or nullcontext():
+                response_text = await complete_prompt(self.llm_client, prompt, model, self.stream)
             parsed = TextProcessor.extract_json(response_text) or {}
             ats = parsed.get("atsCompatibility", {}) or {}
             cq = parsed.get("contentQuality", {}) or {}
             fmt = parsed.get("formattingAnalysis", {}) or {}
-            return {
+            result = {
                 "atsCompatibility": {"score": TextProcessor.safe_number(ats.get("score", 0)), "summary": list(map(str, ats.get("summary", [])))},
                 "contentQuality": {"score": TextProcessor.safe_number(cq.get("score", 0)), "summary": list(map(str, cq.get("summary", [])))},
                 "formattingAnalysis": {"score": TextProcessor.safe_number(fmt.get("score", 0)), "summary": list(map(str, fmt.get("summary", [])))},
             }
+            if parsed and self.cache is not None:
+                await self.cache.aset(key, copy.deepcopy(result))
+            return result
         except Exception as exc:
             logger.warning("Combined analysis failed; falling back to separate calls: {}", str(exc))
             return {
@@ -302,12 +605,93 @@ class ContentAnalyzer:
             }
 
 
+class MultiSectionAnalyzer:
+    """Reviews every section and the whole-resume dimensions in a single model call.
+
+    Returns the dimension block (None if it did not parse) and the section entries
+    that parsed, keyed by name; callers fall back to the per-prompt analyzers for the rest.
+    """
+    def __init__(self, llm_client: LLMClient, cache: Optional[LRUCache] = None, stream: bool = False):
+        self.llm_client = llm_client
+        self.cache = cache
+        self.stream = stream
+    @staticmethod
+    def _has_score(block: Any) -> bool:
+        return isinstance(block, dict) and TextProcessor.safe_number(block.get("score"), -1.0) >= 0
+    def _normalize(self, parsed: dict, names: List[str], include_formatting: bool) -> Tuple[Optional[dict], Dict[str, dict]]:
+        keys = ["atsCompatibility", "contentQuality"] + (["formattingAnalysis"] if include_formatting else [])
+        combined: Optional[dict] = None
+        if all(self._has_score(parsed.get(key)) for key in keys):
+            combined = {
+                key: {"score": TextProcessor.safe_number(parsed[key].get("score", 0)), "summary": list(map(str, parsed[key].get("summary", []) or []))}
+                for key in keys
+            }
+            combined.setdefault("formattingAnalysis", {"score": 0.0, "summary": []})
+        by_name = {name.lower(): name for name in names}
+        sections: Dict[str, dict] = {}
+        entries = parsed.get("sections")
+        for entry in entries if isinstance(entries, list) else []:
+            name = by_name.get(str(entry.get("name", "")).strip().lower()) if isinstance(entry, dict) else None
+            if name is None or name in sections or not self._has_score(entry):
+                continue
+            sections[name] = {
+                "name": name,
+                "score": TextProcessor.safe_number(entry.get("score", 0)),
+                "strengths": list(map(str, entry.get("strengths", []) or [])),
+                "areas_to_improve": list(map(str, entry.get("areas_to_improve", []) or [])),
+                "suggestions": list(map(str, entry.get("suggestions", []) or [])),
+            }
+        return combined, sections
+    async def analyze(
+        self, sections: List[Tuple[str, str]], model: str, include_formatting: bool = True, slot: Optional[AsyncContextManager[None]] = None
+    ) -> Tuple[Optional[dict], Dict[str, dict]]:
+        with REVIEW_STAGE.time(stage="multi_section_analysis"):
+            return await self._analyze(sections, model, include_formatting, slot)
+    async def _analyze(
+        self, sections: List[Tuple[str, str]], model: str, include_formatting: bool = True, slot: Optional[AsyncContextManager[None]] = None
+    ) -> Tuple[Optional[dict], Dict[str, dict]]:
+        names = [name for name, _ in sections]
+        try:
+            prompt = PromptBuilder.compose_multi_section_prompt(sections, include_formatting)
+            key = make_cache_key(model, prompt)
+            cached = await self.cache.aget(key) if self.cache is not None else None
+            if cached is not None:
+                return self._normalize(copy.deepcopy(cached), names, include_formatting)
+            async with slot or nullcontext():
+                response_text = await complete_prompt(self.llm_client, prompt, model, self.stream)
+            parsed = TextProcessor.extract_json(response_text) or {}
+            if parsed and self.cache is not None:
+                await self.cache.aset(key, copy.deepcopy(parsed))
+            return self._normalize(parsed, names, include_formatting)
+        except Exception as exc:
+            logger.warning("Single-call review failed; falling back to separate calls: {}", str(exc))
+            return None, {}
+
+
 class CVReviewService:
-    def __init__(self, llm_client: LLMClient, config: CVReviewConfig):
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        config: CVReviewConfig,
+        cache: Optional[LRUCache] = None,
+        stream: bool = False,
+        flights: Optional[SingleFlight] = None,
+        scheduler: Optional[LLMScheduler] = None,
+        priority: str = INTERACTIVE,
+        client_id: str = "default",
+    ):
         self.llm_client = llm_client
         self.config = config
-        self.section_analyzer = SectionAnalyzer(llm_client)
-        self.content_analyzer = ContentAnalyzer(llm_client)
+        self.cache = cache
+        self.flights = flights
+        # Without a scheduler (benchmarks, scripts) only the per-request limiter applies
+        self.scheduler = scheduler
+        self.priority = priority
+        self.client_id = client_id
+        self.section_analyzer = SectionAnalyzer(llm_client, cache, stream)
+        self.content_analyzer = ContentAnalyzer(llm_client, cache, stream)
+        self.multi_section_analyzer = MultiSectionAnalyzer(llm_client, cache, stream)
+        self.prompt_budget = PromptBudget(config.section_token_budgets, config.section_token_budget, config.prompt_max_tokens)
     def _weighted_section_score(self, sections: List[dict]) -> float:
         weights = {
             "Summary": 0.10,
@@ -326,14 +710,68 @@ class CVReviewService:
             accum += score * w
             total_w += w
         return round(accum / total_w, 1) if total_w > 0 else 0.0
-    def review_cv_from_sections(self, sections: Dict[str, str], model: Optional[str] = None) -> dict:
-        model = model or self.config.default_model
-        analyzed: List[dict] = []
-        for name in sections:
-            if name in sections and sections[name].strip():
-                analyzed.append(self.section_analyzer.analyze_section(name, sections[name], model))
-        if not analyzed:
-            analyzed.append(self.section_analyzer.analyze_section("Summary", "\n".join(sections.values()), model))
+    async def _run_limited(self, limiter: asyncio.Semaphore, fn: Callable[..., Awaitable[dict]], *args) -> Any:
+        # The analyzer takes the slot only around its model call, so cache hits never queue
+        if self.flights is None:
+            return await fn(*args, slot=self._model_slot(limiter))
+        # The analyzer and its arguments fix the prompt, so this is per-prompt single-flight;
+        # duplicates wait here rather than holding a concurrency slot. Flights are per priority
+        # class: an interactive call must not inherit a bulk call's queue position or deadline.
+        key = make_cache_key("call", self.priority, fn.__qualname__, *args)
+        return copy.deepcopy(await self.flights.do(key, lambda: fn(*args, slot=self._model_slot(limiter))))
+    @asynccontextmanager
+    async def _model_slot(self, limiter: asyncio.Semaphore) -> AsyncIterator[None]:
+        queued = time.perf_counter()
+        async with limiter:
+            if self.scheduler is None:
+                REVIEW_STAGE.observe(time.perf_counter() - queued, stage="queue_wait")
+                yield
+                return
+            async with self.scheduler.slot(self.priority, self.client_id):
+                REVIEW_STAGE.observe(time.perf_counter() - queued, stage="queue_wait")
+                yield
+    @staticmethod
+    def _section_inputs(sections: Dict[str, str]) -> List[Tuple[str, str]]:
+        inputs = [(name, content) for name, content in sections.items() if content.strip()]
+        if not inputs:
+            inputs.append(("Summary", "\n".join(sections.values())))
+        return inputs
+    def _section_calls(self, limiter: asyncio.Semaphore, inputs: List[Tuple[str, str]], model: str) -> List[Awaitable[dict]]:
+        return [
+            self._run_limited(limiter, self.section_analyzer.analyze_section, name, content, model)
+            for name, content in inputs
+        ]
+    def _prepare_prompts(self, sections: Dict[str, str]) -> Tuple[List[Tuple[str, str]], Dict[str, str], List[str]]:
+        # Section prompts get their own budgets; whole-resume prompts must also fit the resume budget
+        with REVIEW_STAGE.time(stage="prompt_budget"):
+            section_texts, trimmed = self.prompt_budget.compact(sections)
+            resume_sections, resume_trimmed = self.prompt_budget.fit_resume(sections)
+        return self._section_inputs(section_texts), resume_sections, sorted(set(trimmed) | set(resume_trimmed))
+    def _prompt_usage(self, combined_prompt: str, section_inputs: List[Tuple[str, str]], trimmed: List[str]) -> Dict[str, Any]:
+        section_tokens = {name: estimate_tokens(PromptBuilder.compose_section_prompt(name, content)) for name, content in section_inputs}
+        combined_tokens = estimate_tokens(combined_prompt)
+        usage = {
+            "prompt_tokens": combined_tokens + sum(section_tokens.values()),
+            "combined_prompt_tokens": combined_tokens,
+            "section_prompt_tokens": section_tokens,
+            "trimmed_sections": trimmed,
+        }
+        logger.debug("Review prompts: ~{} tokens over {} prompts (trimmed: {})", usage["prompt_tokens"], len(section_inputs) + 1, trimmed)
+        return usage
+    def _strategy(self, payload: dict) -> str:
+        strategy = (payload or {}).get("strategy") or self.config.default_strategy
+        if strategy not in REVIEW_STRATEGIES:
+            raise ValueError(f"Unknown review strategy '{strategy}' (expected one of {', '.join(REVIEW_STRATEGIES)})")
+        return strategy
+    @staticmethod
+    async def _completed(tasks: Dict["asyncio.Future[Any]", Any]) -> AsyncIterator[Tuple[Any, Any]]:
+        # (tag, result) pairs in completion order; callers cancel leftovers in their own finally
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield tasks[task], task.result()
+    def _summarize_sections(self, analyzed: List[dict]) -> dict:
         strengths: List[str] = []
         improvements: List[str] = []
         final_sections: List[dict] = []
@@ -348,15 +786,109 @@ class CVReviewService:
             "areas_to_improve": sorted({a.strip() for a in improvements if a.strip()}),
             "sections": final_sections,
         }
-    def review_cv_payload(self, payload: dict) -> dict:
+    async def review_cv_from_sections(self, sections: Dict[str, str], model: Optional[str] = None) -> dict:
+        model = model or self.config.default_model
+        limiter = asyncio.Semaphore(self.config.max_concurrency_per_request)
+        inputs = self._section_inputs(self.prompt_budget.compact(sections)[0])
+        analyzed = await asyncio.gather(*self._section_calls(limiter, inputs, model))
+        return self._summarize_sections(list(analyzed))
+    def _combined_call(self, limiter: asyncio.Semaphore, resume_text: str, model: str) -> Awaitable[dict]:
+        include_formatting = not self.config.heuristics_enabled
+        return self._run_limited(limiter, self.content_analyzer.analyze_resume_content, resume_text, model, include_formatting)
+    def _heuristics(self, sections: Dict[str, str]) -> Optional[dict]:
+        if not self.config.heuristics_enabled:
+            return None
+        with REVIEW_STAGE.time(stage="heuristics"):
+            return HeuristicScorer.score(sections)
+    def _merge_heuristics(self, combined: dict, heuristics: Optional[dict]) -> dict:
+        if heuristics is None:
+            return combined
+        weight = self.config.heuristic_weight
+        merged = dict(combined)
+        for key in ("atsCompatibility", "contentQuality", "formattingAnalysis"):
+            llm = combined.get(key) or {"score": 0.0, "summary": []}
+            rules = heuristics[key]
+            llm_score = TextProcessor.safe_number(llm.get("score", 0.0), 0.0)
+            llm_summary = list(llm.get("summary", []))
+            # Formatting is not asked of the model; a zero score with no summary means its call failed
+            if key == "formattingAnalysis" or (not llm_score and not llm_summary):
+                merged[key] = copy.deepcopy(rules)
+                continue
+            merged[key] = {
+                "score": round((1.0 - weight) * llm_score + weight * rules["score"], 1),
+                "summary": llm_summary + [note for note in rules["summary"] if note not in llm_summary],
+            }
+        return merged
+    def review_cv_fast(self, payload: dict) -> dict:
+        sections = ResumeProcessor.flatten_resume_sections(payload)
+        heuristics = HeuristicScorer.score(sections)
+        review = self._blend_review(self._summarize_sections(heuristics["sections"]), heuristics, sections)
+        review["mode"] = "fast"
+        review["metrics"] = heuristics["metrics"]
+        return review
+    def _review_key(self, payload: dict) -> str:
+        # Defaults are resolved first so "no model" and "the default model" coalesce
         model = (payload or {}).get("model") or self.config.default_model
-        resume_text_full = ResumeProcessor.build_resume_text_from_nested(payload)
-        combined = self.content_analyzer.analyze_resume_content(resume_text_full or "", model)
+        # The job description only feeds the keyword match, which runs per caller
+        shared = {k: v for k, v in (payload or {}).items() if k != "job_description"}
+        return make_cache_key("review", self.priority, {**shared, "model": model, "strategy": self._strategy(payload)})
+    def _with_job_match(self, review: dict, payload: dict) -> dict:
+        job_description = (payload or {}).get("job_description")
+        if not job_description:
+            return review
+        try:
+            with REVIEW_STAGE.time(stage="job_match"):
+                match = match_job_description(
+                    ResumeProcessor.flatten_resume_sections(payload), str(job_description), get_keyword_index(), self.config.jd_max_keywords
+                )
+        except ValueError as exc:
+            logger.info("Skipping job description match: {}", str(exc))
+            return review
+        except KeywordIndexError as exc:
+            # The review itself is fine; only the match is lost
+            logger.error("Skipping job description match: {}", str(exc))
+            return review
+        review["jobMatch"] = match
+        if match["missing_keywords"]:
+            ats = review.setdefault("atsCompatibility", {"score": 0.0, "summary": []})
+            ats["summary"] = list(ats.get("summary", [])) + [f"Job description keywords not found: {', '.join(match['missing_keywords'][:10])}"]
+        return review
+    async def review_cv_payload(self, payload: dict, limiter: Optional[asyncio.Semaphore] = None) -> dict:
+        if (payload or {}).get("mode") == "fast":
+            return self._with_job_match(self.review_cv_fast(payload), payload)
+        if self.flights is None:
+            return self._with_job_match(await self._review_cv_payload(payload, limiter), payload)
+        review = await self.flights.do(self._review_key(payload), lambda: self._review_cv_payload(payload, limiter))
+        # Every caller gets its own copy of the shared result
+        return self._with_job_match(copy.deepcopy(review), payload)
+    async def _review_cv_payload(self, payload: dict, limiter: Optional[asyncio.Semaphore] = None) -> dict:
+        if self._strategy(payload) == "single_call":
+            review: dict = {}
+            async for event in self._iter_single_call(payload, limiter):
+                review = event.get("review", review)
+            return review
+        model = (payload or {}).get("model") or self.config.default_model
+        sections = ResumeProcessor.flatten_resume_sections(payload)
+        heuristics = self._heuristics(sections)
+        inputs, resume_sections, trimmed = self._prepare_prompts(sections)
+        resume_text = ResumeProcessor.build_resume_text_from_sections(resume_sections)
+        usage = self._prompt_usage(PromptBuilder.compose_content_analysis_prompt(resume_text, not self.config.heuristics_enabled), inputs, trimmed)
+        # Combined analysis and every section prompt run side by side; gather keeps
+        # submission order so section ordering and scoring are unchanged.
+        limiter = limiter or asyncio.Semaphore(self.config.max_concurrency_per_request)
+        combined, *analyzed = await asyncio.gather(
+            self._combined_call(limiter, resume_text, model),
+            *self._section_calls(limiter, inputs, model),
+        )
+        review = self._blend_review(self._summarize_sections(list(analyzed)), self._merge_heuristics(combined, heuristics), sections)
+        if heuristics is not None:
+            review["metrics"] = heuristics["metrics"]
+        review["prompt_usage"] = usage
+        return review
+    def _blend_review(self, base: dict, combined: dict, sections: Dict[str, str]) -> dict:
         ats = combined.get("atsCompatibility", {"score": 0.0, "summary": []})
         content_quality = combined.get("contentQuality", {"score": 0.0, "summary": []})
         fmt_analysis = combined.get("formattingAnalysis", {"score": 0.0, "summary": []})
-        sections = ResumeProcessor.flatten_resume_sections(payload)
-        base = self.review_cv_from_sections(sections, model=model)
 
         # Blend section score with dimension scores and apply small penalties for missing key sections
         section_overall = TextProcessor.safe_number(base.get("overall_score", 0.0), 0.0)
@@ -378,12 +910,257 @@ class CVReviewService:
         base["contentQuality"] = content_quality
         base["formattingAnalysis"] = fmt_analysis
         return base
+    async def iter_review_many(self, payloads: List[dict]) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        if len(payloads) > self.config.batch_max_items:
+            raise ValueError(f"Batch too large: {len(payloads)} items (max {self.config.batch_max_items})")
+        # Every prompt in the batch goes through one limiter, and identical prompts
+        # (e.g. the same CV submitted twice) reach the model only once.
+        batch_service = CVReviewService(
+            DedupingLLMClient(self.llm_client), self.config, self.cache,
+            flights=self.flights, scheduler=self.scheduler, priority=BULK, client_id=self.client_id,
+        )
+        limiter = asyncio.Semaphore(self.config.batch_max_concurrency)
+
+        async def review_one(index: int, payload: dict) -> Tuple[int, Dict[str, Any]]:
+            try:
+                return index, {"review": await batch_service.review_cv_payload(payload, limiter)}
+            except Exception as exc:
+                logger.warning("Batch review item {} failed: {}", index, str(exc))
+                return index, {"error": str(exc)}
+
+        tasks = [asyncio.ensure_future(review_one(i, p)) for i, p in enumerate(payloads)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    async def review_many(self, payloads: List[dict]) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = [{} for _ in payloads]
+        async for index, result in self.iter_review_many(payloads):
+            results[index] = result
+        return results
+    async def stream_review_cv_payload(self, payload: dict) -> AsyncIterator[Dict[str, Any]]:
+        events = self._stream_review_cv_payload(payload)
+        try:
+            async for event in events:
+                if event.get("event") == "result":
+                    self._with_job_match(event["review"], payload)
+                yield event
+        finally:
+            await events.aclose()
+    async def _stream_review_cv_payload(self, payload: dict) -> AsyncIterator[Dict[str, Any]]:
+        if (payload or {}).get("mode") == "fast":
+            review = self.review_cv_fast(payload)
+            yield {"event": "start", "model": None, "sections": [sec["name"] for sec in review["sections"]]}
+            yield {"event": "result", "overall_score": review["overall_score"], "review": review}
+            return
+        if self._strategy(payload) == "single_call":
+            async for event in self._iter_single_call(payload):
+                yield event
+            return
+        model = (payload or {}).get("model") or self.config.default_model
+        sections = ResumeProcessor.flatten_resume_sections(payload)
+        heuristics = self._heuristics(sections)
+        inputs, resume_sections, trimmed = self._prepare_prompts(sections)
+        resume_text = ResumeProcessor.build_resume_text_from_sections(resume_sections)
+        usage = self._prompt_usage(PromptBuilder.compose_content_analysis_prompt(resume_text, not self.config.heuristics_enabled), inputs, trimmed)
+        limiter = asyncio.Semaphore(self.config.max_concurrency_per_request)
+        tasks: Dict["asyncio.Future[Any]", Optional[int]] = {asyncio.ensure_future(self._combined_call(limiter, resume_text, model)): None}
+        for index, (name, content) in enumerate(inputs):
+            tasks[asyncio.ensure_future(self._run_limited(limiter, self.section_analyzer.analyze_section, name, content, model))] = index
+        analyzed: List[Optional[dict]] = [None] * len(inputs)
+        combined: dict = {}
+        try:
+            yield {"event": "start", "model": model, "sections": [name for name, _ in inputs], "prompt_tokens": usage["prompt_tokens"]}
+            async for index, result in self._completed(tasks):
+                if index is None:
+                    combined = self._merge_heuristics(result, heuristics)
+                    yield {"event": "analysis", **combined}
+                else:
+                    analyzed[index] = result
+                    yield {"event": "section", "index": index, "section": result}
+            yield self._result_event(analyzed, combined, sections, heuristics, usage)
+        finally:
+            # Client went away mid-stream: stop paying for prompts nobody will read
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    def _result_event(self, analyzed: List[Optional[dict]], combined: dict, sections: Dict[str, str], heuristics: Optional[dict], usage: Dict[str, Any]) -> Dict[str, Any]:
+        review = self._blend_review(self._summarize_sections([sec for sec in analyzed if sec is not None]), combined, sections)
+        if heuristics is not None:
+            review["metrics"] = heuristics["metrics"]
+        review["prompt_usage"] = usage
+        return {"event": "result", "overall_score": review["overall_score"], "review": review}
+    async def _iter_single_call(self, payload: dict, limiter: Optional[asyncio.Semaphore] = None) -> AsyncIterator[Dict[str, Any]]:
+        model = (payload or {}).get("model") or self.config.default_model
+        sections = ResumeProcessor.flatten_resume_sections(payload)
+        heuristics = self._heuristics(sections)
+        inputs, resume_sections, trimmed = self._prepare_prompts(sections)
+        packed = self._section_inputs(resume_sections)
+        include_formatting = not self.config.heuristics_enabled
+        limiter = limiter or asyncio.Semaphore(self.config.max_concurrency_per_request)
+        yield {"event": "start", "model": model, "sections": [name for name, _ in inputs], "strategy": "single_call"}
 
-def create_default_cv_review_service() -> CVReviewService:
+        packed_combined, packed_sections = await self._run_limited(
+            limiter, self.multi_section_analyzer.analyze, packed, model, include_formatting
+        )
+        analyzed: List[Optional[dict]] = [packed_sections.get(name) for name, _ in inputs]
+        combined: dict = {}
+        if packed_combined is not None:
+            combined = self._merge_heuristics(packed_combined, heuristics)
+            yield {"event": "analysis", **combined}
+        for index, section in enumerate(analyzed):
+            if section is not None:
+                yield {"event": "section", "index": index, "section": section}
+
+        # Only entries the packed answer got wrong go back to the per-prompt analyzers
+        fallback = [(index, inputs[index]) for index, section in enumerate(analyzed) if section is None]
+        tasks: Dict["asyncio.Future[Any]", Optional[int]] = {}
+        if packed_combined is None:
+            resume_text = ResumeProcessor.build_resume_text_from_sections(resume_sections)
+            tasks[asyncio.ensure_future(self._combined_call(limiter, resume_text, model))] = None
+        for index, (name, content) in fallback:
+            tasks[asyncio.ensure_future(self._run_limited(limiter, self.section_analyzer.analyze_section, name, content, model))] = index
+        if fallback or packed_combined is None:
+            logger.info("Single-call review fell back for {} sections{}", len(fallback), " and the combined analysis" if packed_combined is None else "")
+        try:
+            async for index, result in self._completed(tasks):
+                if index is None:
+                    combined = self._merge_heuristics(result, heuristics)
+                    yield {"event": "analysis", **combined}
+                else:
+                    analyzed[index] = result
+                    yield {"event": "section", "index": index, "section": result}
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        usage = self._prompt_usage(
+            PromptBuilder.compose_multi_section_prompt(packed, include_formatting), [inputs[index] for index, _ in fallback], trimmed
+        )
+        usage["fallback_sections"] = [name for _, (name, _) in fallback]
+        if packed_combined is None:
+            usage["prompt_tokens"] += estimate_tokens(
+                PromptBuilder.compose_content_analysis_prompt(ResumeProcessor.build_resume_text_from_sections(resume_sections), include_formatting)
+            )
+        yield self._result_event(analyzed, combined, sections, heuristics, usage)
+
+_LLM_CLIENT: Optional[Any] = None
+
+def _build_ollama_client(config: CVReviewConfig, url: str) -> OllamaClient:
+    return OllamaClient(
+        url,
+        connect_timeout=config.connect_timeout,
+        read_timeout=config.read_timeout,
+        max_connections=config.max_connections,
+    )
+
+def _build_llm_client(config: CVReviewConfig) -> Any:
+    if len(config.ollama_urls) == 1:
+        return _build_ollama_client(config, config.ollama_urls[0])
+    return LLMRouter(
+        [Backend(_build_ollama_client(config, url), config.backend_models.get(url)) for url in config.ollama_urls],
+        retry_attempts=config.retry_attempts,
+        retry_backoff=config.retry_backoff,
+        breaker_failures=config.breaker_failures,
+        breaker_reset=config.breaker_reset,
+        health_interval=config.health_interval,
+    )
+
+async def startup_llm_client() -> None:
+    global _LLM_CLIENT, _SCHEDULER
+    _SCHEDULER = None
+    if _LLM_CLIENT is None:
+        _LLM_CLIENT = _build_llm_client(CVReviewConfig())
+    if isinstance(_LLM_CLIENT, LLMRouter):
+        await _LLM_CLIENT.start()
+
+async def shutdown_llm_client() -> None:
+    global _LLM_CLIENT
+    if _LLM_CLIENT is not None:
+        await _LLM_CLIENT.aclose()
+        _LLM_CLIENT = None
+
+def get_llm_backends() -> List[Dict[str, Any]]:
+    client = get_llm_client()
+    if isinstance(client, LLMRouter):
+        return client.stats()
+    return [{"url": getattr(client, "base_url", None)}]
+
+def get_llm_client() -> LLMClient:
+    global _LLM_CLIENT
+    if _LLM_CLIENT is None:
+        # Outside the app lifespan (scripts, REPL) fall back to a lazily created client
+        _LLM_CLIENT = _build_llm_client(CVReviewConfig())
+    return _LLM_CLIENT
+
+_RESPONSE_CACHE: Optional[LRUCache] = None
+
+def get_response_cache() -> Optional[LRUCache]:
+    global _RESPONSE_CACHE
+    if _RESPONSE_CACHE is None:
+        config = CVReviewConfig()
+        if config.cache_max_entries <= 0:
+            return None
+        _RESPONSE_CACHE = LRUCache(
+            max_entries=config.cache_max_entries,
+            ttl_seconds=config.cache_ttl_seconds,
+            disk_dir=config.cache_dir,
+            max_disk_bytes=config.cache_max_disk_bytes,
+        )
+    return _RESPONSE_CACHE
+
+_SINGLE_FLIGHT: Optional[SingleFlight] = None
+
+def get_single_flight() -> Optional[SingleFlight]:
+    global _SINGLE_FLIGHT
+    if _SINGLE_FLIGHT is None:
+        if not CVReviewConfig().coalesce_enabled:
+            return None
+        _SINGLE_FLIGHT = SingleFlight()
+    return _SINGLE_FLIGHT
+
+class KeywordIndexError(RuntimeError):
+    """REVIEW_JD_INDEX_PATH names a table that is missing or cannot be read."""
+
+
+_KEYWORD_INDEX: Optional[KeywordIndex] = None
+
+def get_keyword_index() -> Optional[KeywordIndex]:
+    global _KEYWORD_INDEX
+    if _KEYWORD_INDEX is None:
+        path = CVReviewConfig().jd_index_path
+        if not path:
+            # Without a table each match weighs the posting's terms by frequency alone
+            return None
+        try:
+            _KEYWORD_INDEX = KeywordIndex.load(path)
+        except Exception as exc:
+            raise KeywordIndexError(f"Cannot load keyword index from {path}: {str(exc) or type(exc).__name__}") from exc
+        logger.info("Loaded keyword index: {} terms from {} documents", len(_KEYWORD_INDEX), _KEYWORD_INDEX.documents)
+    return _KEYWORD_INDEX
+
+def create_default_cv_review_service(stream: bool = False, client_id: str = "default") -> CVReviewService:
     config = CVReviewConfig()
-    llm_client = OllamaClient(config.ollama_url)
-    return CVReviewService(llm_client, config)
+    return CVReviewService(
+        get_llm_client(), config, get_response_cache(), stream=stream,
+        flights=get_single_flight(), scheduler=get_llm_scheduler(), client_id=client_id,
+    )
+
+async def review_cv_payload(payload: dict, client_id: str = "default") -> dict:
+    service = create_default_cv_review_service(client_id=client_id)
+    return await service.review_cv_payload(payload)
+
+def iter_review_many(payloads: List[dict], client_id: str = "default") -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    service = create_default_cv_review_service(client_id=client_id)
+    return service.iter_review_many(payloads)
+
+async def review_many(payloads: List[dict], client_id: str = "default") -> List[Dict[str, Any]]:
+    service = create_default_cv_review_service(client_id=client_id)
+    return await service.review_many(payloads)
 
-def review_cv_payload(payload: dict) -> dict:
-    service = create_default_cv_review_service()
-    return service.review_cv_payload(payload)
+def stream_review_cv_payload(payload: dict, client_id: str = "default") -> AsyncIterator[Dict[str, Any]]:
+    service = create_default_cv_review_service(stream=True, client_id=client_id)
+    return service.stream_review_cv_payload(payload)
@@ -0,0 +1,292 @@
+import html
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+ACTION_VERBS = {
+    "accelerated", "achieved", "added", "analyzed", "architected", "automated", "boosted", "built",
+    "championed", "coached", "collaborated", "configured", "consolidated", "coordinated", "created",
+    "cut", "debugged", "decreased", "defined", "delivered", "deployed", "designed", "developed",
+    "directed", "doubled", "drove", "enabled", "engineered", "established", "evaluated", "expanded",
+    "facilitated", "founded", "generated", "grew", "guided", "handled", "headed", "implemented",
+    "improved", "increased", "initiated", "integrated", "introduced", "launched", "led", "maintained",
+    "managed", "mentored", "migrated", "modernized", "monitored", "negotiated", "optimized",
+    "orchestrated", "organized", "oversaw", "owned", "partnered", "pioneered", "planned", "presented",
+    "prioritized", "produced", "published", "rebuilt", "redesigned", "reduced", "refactored",
+    "researched", "resolved", "restructured", "revamped", "saved", "scaled", "secured", "shipped",
+    "simplified", "spearheaded", "standardized", "streamlined", "strengthened", "supervised",
+    "supported", "taught", "tested", "trained", "transformed", "tripled", "upgraded", "won", "wrote",
+}
+# Present-tense forms that do not follow the -ed/-d pattern
+_IRREGULAR_VERBS = {
+    "build": "built", "cut": "cut", "drive": "drove", "grow": "grew", "lead": "led", "oversee": "oversaw",
+    "teach": "taught", "win": "won", "write": "wrote",
+}
+
+# Word budgets per section (Skills counts items); scores fall off outside the range
+LENGTH_BUDGETS: Dict[str, Tuple[int, int]] = {
+    "Summary": (30, 120),
+    "Experience": (100, 900),
+    "Education": (5, 150),
+    "Skills": (6, 30),
+    "Projects": (20, 400),
+}
+DEFAULT_BUDGET = (3, 200)
+# Share of the coverage score each key section is worth
+COVERAGE_WEIGHTS = {"Experience": 35.0, "Skills": 25.0, "Education": 20.0, "Summary": 20.0}
+
+_TAG = re.compile(r"<[^>]+>")
+_BLOCK_BREAK = re.compile(r"<\s*(?:li|/li|br\s*/?|/p|/div|/h[1-6])\s*>", re.IGNORECASE)
+_BULLET_PREFIX = re.compile(r"^\s*(?:[•·▪‣◦*\-–]|\d+[.)])\s+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z])")
+_QUANTIFIED = re.compile(
+    r"\d|%|[$€£¥]|\b(?:two|three|four|five|six|seven|eight|nine|ten|twice|dozens?|hundreds?|thousands?|millions?|billions?)\b",
+    re.IGNORECASE,
+)
+_DATE = r"(?:[A-Za-z]{3,9}\.? \d{4}|\d{4}(?:-\d{2}){0,2}(?:T[\d:.]+Z?)?|\d{1,2}/\d{4})"
+_DATE_RANGE = re.compile(rf"(?P<start>{_DATE})\s*(?:–|—|\s-\s)\s*(?P<end>Present|Current|Now|{_DATE})", re.IGNORECASE)
+_SINGLE_DATE = re.compile(rf"\b{_DATE}\b")
+_MONTHS = {m: i + 1 for i, m in enumerate(("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"))}
+
+
+def html_to_lines(text: str) -> List[str]:
+    text = _BLOCK_BREAK.sub("\n", text)
+    text = html.unescape(_TAG.sub("", text))
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def _parse_date(text: str, is_end: bool = False) -> Tuple[str, Optional[Tuple[int, int]]]:
+    """Return the date's format family and (year, month); ongoing ranges parse to None."""
+    text = text.strip()
+    if text.lower() in ("present", "current", "now"):
+        return "present", None
+    if re.fullmatch(r"\d{4}", text):
+        return "year", (int(text), 12 if is_end else 1)
+    if re.match(r"\d{4}-\d{2}", text):
+        return "iso", (int(text[:4]), int(text[5:7]))
+    if re.fullmatch(r"\d{1,2}/\d{4}", text):
+        month, year = text.split("/")
+        return "numeric", (int(year), int(month))
+    month = _MONTHS.get(text[:3].lower())
+    year = re.search(r"\d{4}", text)
+    if month and year:
+        return "month-name", (int(year.group()), month)
+    return "unknown", None
+
+
+def _budget_score(amount: int, budget: Tuple[int, int]) -> float:
+    low, high = budget
+    if amount < low:
+        return max(30.0, 100.0 * amount / low)
+    if amount > high:
+        return max(40.0, 100.0 - 60.0 * (amount - high) / high)
+    return 100.0
+
+
+def _ratio(part: int, whole: int) -> float:
+    return part / whole if whole else 0.0
+
+
+class HeuristicScorer:
+    """Rule-based scoring over ``ResumeProcessor.flatten_resume_sections`` output.
+
+    Pure Python and deterministic: the same sections always produce the same scores,
+    in the same shape the LLM analyzers return.
+    """
+
+    @staticmethod
+    def is_action_verb(word: str) -> bool:
+        word = word.lower().strip(",.;:")
+        return (
+            word in ACTION_VERBS
+            or word in _IRREGULAR_VERBS
+            or word + "ed" in ACTION_VERBS
+            or word + "d" in ACTION_VERBS
+            or (word.endswith("e") and word[:-1] + "ed" in ACTION_VERBS)
+            or (word.endswith("y") and word[:-1] + "ied" in ACTION_VERBS)
+        )
+
+    @staticmethod
+    def is_quantified(text: str) -> bool:
+        return _QUANTIFIED.search(text) is not None
+
+    @staticmethod
+    def statements(name: str, text: str) -> List[str]:
+        """Bullet points and description sentences, without entry headers."""
+        result: List[str] = []
+        for block in text.split("\n\n"):
+            lines = html_to_lines(block)
+            if not lines:
+                continue
+            if name == "Experience":
+                lines = lines[1:]
+            elif name == "Projects":
+                # "Name — description" then an optional "(dates) link" tail
+                first = lines[0].split(" — ", 1)
+                lines = ([first[1]] if len(first) > 1 else []) + [
+                    line for line in lines[1:] if not line.startswith("http") and not _SINGLE_DATE.match(line)
+                ]
+            for line in lines:
+                line = _BULLET_PREFIX.sub("", line)
+                result.extend(part.strip() for part in _SENTENCE_END.split(line) if part.strip())
+        return result
+
+    @staticmethod
+    def _date_ranges(sections: Dict[str, str]) -> Dict[str, Any]:
+        entries = missing = inverted = 0
+        families: Dict[str, int] = {}
+        starts: List[Tuple[int, int]] = []
+        for name in ("Experience", "Education"):
+            for block in (sections.get(name) or "").split("\n\n"):
+                lines = html_to_lines(block)
+                if not lines:
+                    continue
+                entries += 1
+                match = _DATE_RANGE.search(lines[0])
+                if match is None:
+                    missing += 1
+                    continue
+                start_family, start = _parse_date(match.group("start"))
+                end_family, end = _parse_date(match.group("end"), is_end=True)
+                for family in (start_family, end_family):
+                    if family != "present":
+                        families[family] = families.get(family, 0) + 1
+                if start and end and start > end:
+                    inverted += 1
+                if name == "Experience" and start:
+                    starts.append(start)
+        dated = sum(families.values())
+        return {
+            "entries": entries,
+            "missing": missing,
+            "inverted": inverted,
+            "formats": len(families),
+            "format_consistency": _ratio(max(families.values()), dated) if dated else 1.0,
+            "reverse_chronological": all(a >= b for a, b in zip(starts, starts[1:])),
+        }
+
+    @staticmethod
+    def score(sections: Dict[str, str]) -> Dict[str, Any]:
+        present = {name: text for name, text in sections.items() if (text or "").strip()}
+        ats_notes: List[str] = []
+        content_notes: List[str] = []
+        format_notes: List[str] = []
+
+        # Section coverage
+        coverage = sum(w for name, w in COVERAGE_WEIGHTS.items() if name in present)
+        missing_sections = [name for name in COVERAGE_WEIGHTS if name not in present]
+        if missing_sections:
+            ats_notes.append(f"Missing key sections: {', '.join(missing_sections)}")
+        else:
+            ats_notes.append("All key sections (Summary, Experience, Education, Skills) are present")
+
+        # Length budgets
+        lengths: Dict[str, float] = {}
+        for name, text in present.items():
+            amount = len([s for s in text.split(",") if s.strip()]) if name == "Skills" else len(" ".join(html_to_lines(text)).split())
+            budget = LENGTH_BUDGETS.get(name, DEFAULT_BUDGET)
+            lengths[name] = _budget_score(amount, budget)
+            unit = "skills" if name == "Skills" else "words"
+            if amount < budget[0]:
+                ats_notes.append(f"{name} is short ({amount} {unit}; aim for at least {budget[0]})")
+            elif amount > budget[1]:
+                ats_notes.append(f"{name} is long ({amount} {unit}; aim for at most {budget[1]})")
+        length_score = sum(lengths.values()) / len(lengths) if lengths else 0.0
+
+        # Bullets: action verbs, measurable outcomes, punctuation
+        bullets = {name: HeuristicScorer.statements(name, present.get(name, "")) for name in ("Experience", "Projects")}
+        all_bullets = bullets["Experience"] + bullets["Projects"]
+        action = [b for b in all_bullets if HeuristicScorer.is_action_verb(b.split()[0])]
+        quantified = [b for b in all_bullets if _QUANTIFIED.search(b)]
+        action_ratio = _ratio(len(action), len(all_bullets))
+        quantified_ratio = _ratio(len(quantified), len(all_bullets))
+        if all_bullets:
+            content_notes.append(f"{len(action)} of {len(all_bullets)} bullets start with an action verb")
+            content_notes.append(f"{len(quantified)} of {len(all_bullets)} bullets include a measurable outcome")
+        else:
+            content_notes.append("No experience or project bullets to evaluate")
+        # Full marks at 80% action verbs / 50% quantified bullets
+        action_score = min(100.0, 125.0 * action_ratio)
+        quantified_score = min(100.0, 200.0 * quantified_ratio)
+
+        periods = sum(1 for b in all_bullets if b.endswith("."))
+        capitalized = sum(1 for b in all_bullets if b[:1].isupper())
+        if len(all_bullets) >= 2:
+            punctuation = (max(periods, len(all_bullets) - periods) + max(capitalized, len(all_bullets) - capitalized)) / (2 * len(all_bullets))
+        else:
+            punctuation = 1.0
+        if punctuation < 0.9:
+            format_notes.append(f"Inconsistent bullet punctuation: {periods} of {len(all_bullets)} end with a period")
+
+        # Date ranges
+        dates = HeuristicScorer._date_ranges(present)
+        date_coverage = 1.0 - _ratio(dates["missing"], dates["entries"])
+        date_validity = 1.0 - _ratio(dates["inverted"], dates["entries"] - dates["missing"])
+        date_score = 100.0 * (0.4 * date_coverage + 0.3 * dates["format_consistency"] + 0.3 * date_validity)
+        if not dates["reverse_chronological"]:
+            date_score -= 10.0
+            format_notes.append("Experience is not in reverse-chronological order")
+        if dates["missing"]:
+            format_notes.append(f"{dates['missing']} of {dates['entries']} entries have no date range")
+        if dates["inverted"]:
+            format_notes.append(f"{dates['inverted']} date ranges end before they start")
+        if dates["formats"] > 1:
+            format_notes.append(f"Dates use {dates['formats']} different formats")
+        if not dates["entries"] and not all_bullets:
+            format_notes.append("No dated entries or bullets to evaluate")
+        elif not format_notes:
+            format_notes.append("Dates and bullets are formatted consistently")
+        date_score = max(0.0, date_score) if dates["entries"] else 0.0
+
+        ats_score = 0.6 * coverage + 0.4 * length_score
+        content_score = 0.4 * action_score + 0.4 * quantified_score + 0.2 * length_score
+        format_score = 0.6 * date_score + 0.4 * 100.0 * punctuation if dates["entries"] or all_bullets else 0.0
+
+        section_results: List[dict] = []
+        for name, text in present.items():
+            parts = [lengths[name]]
+            strengths: List[str] = []
+            improvements: List[str] = []
+            suggestions: List[str] = []
+            if name in bullets and bullets[name]:
+                items = bullets[name]
+                verbs = sum(1 for b in items if HeuristicScorer.is_action_verb(b.split()[0]))
+                numbers = sum(1 for b in items if _QUANTIFIED.search(b))
+                parts += [min(100.0, 125.0 * _ratio(verbs, len(items))), min(100.0, 200.0 * _ratio(numbers, len(items)))]
+                if verbs < len(items):
+                    suggestions.append("Start every bullet with a strong action verb (e.g. Led, Built, Reduced)")
+                else:
+                    strengths.append(f"{name} bullets lead with action verbs")
+                if numbers * 2 < len(items):
+                    improvements.append(f"Few {name.lower()} bullets quantify their impact")
+                    suggestions.append("Add numbers to outcomes: percentages, money, time saved, users, team size")
+                else:
+                    strengths.append(f"{name} bullets quantify their impact")
+            if name in ("Experience", "Education") and dates["entries"]:
+                parts.append(date_score)
+            low, high = LENGTH_BUDGETS.get(name, DEFAULT_BUDGET)
+            if lengths[name] < 100.0:
+                improvements.append(f"{name} length is outside the recommended range")
+                suggestions.append(f"Keep {name} between {low} and {high} {'skills' if name == 'Skills' else 'words'}")
+            section_results.append({
+                "name": name,
+                "score": round(sum(parts) / len(parts), 1),
+                "strengths": strengths,
+                "areas_to_improve": improvements,
+                "suggestions": suggestions,
+            })
+
+        return {
+            "atsCompatibility": {"score": round(ats_score, 1), "summary": ats_notes},
+            "contentQuality": {"score": round(content_score, 1), "summary": content_notes},
+            "formattingAnalysis": {"score": round(format_score, 1), "summary": format_notes},
+            "sections": section_results,
+            "metrics": {
+                "section_coverage": round(coverage / 100.0, 3),
+                "action_verb_ratio": round(action_ratio, 3),
+                "quantified_ratio": round(quantified_ratio, 3),
+                "punctuation_consistency": round(punctuation, 3),
+                "date_format_consistency": round(dates["format_consistency"], 3),
+                "dated_entries": dates["entries"] - dates["missing"],
+                "bullets": len(all_bullets),
+            },
+        }
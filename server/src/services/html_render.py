@@ -0,0 +1,82 @@
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup
+
+TEMPLATES_DIR = Path(__file__).resolve().parents[1] / "templates" / "pdf"
+SERVER_TEMPLATES = ("classic", "legacy", "professional")
+# Same fallbacks the client templates apply when the theme has no font
+DEFAULT_FONTS = {
+    "classic": '"Times New Roman", Times, serif',
+    "legacy": '"Source Sans Pro", Roboto, "Segoe UI", -apple-system, system-ui, Helvetica, Arial, "Apple Color Emoji", "Segoe UI Emoji"',
+    "professional": 'Georgia, ui-sans-serif, system-ui, -apple-system, Segoe UI, Roboto, Helvetica, Arial, "Apple Color Emoji", "Segoe UI Emoji"',
+}
+
+_DANGEROUS_BLOCKS = re.compile(r"<(script|style|iframe|object|embed|link|meta|base|form)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_DANGEROUS_TAGS = re.compile(r"</?(script|style|iframe|object|embed|link|meta|base|form|img|video|audio|source)\b[^>]*>", re.IGNORECASE)
+_EVENT_ATTRS = re.compile(r"\s+on[a-z]+\s*=\s*(\"[^\"]*\"|'[^']*'|[^\s>]+)", re.IGNORECASE)
+_JS_URLS = re.compile(r"(href|src)\s*=\s*([\"']?)\s*javascript:[^\"'>\s]*\2", re.IGNORECASE)
+
+
+def sanitize_rich_text(html: Any) -> Markup:
+    # Rich text comes from the editor as HTML; keep the formatting tags and drop anything active or external
+    text = str(html or "")
+    text = _DANGEROUS_BLOCKS.sub("", text)
+    text = _DANGEROUS_TAGS.sub("", text)
+    text = _EVENT_ATTRS.sub("", text)
+    text = _JS_URLS.sub(r'\1=""', text)
+    return Markup(text)
+
+
+def format_month_year(value: Any) -> str:
+    if not value:
+        return ""
+    text = str(value).strip()
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%d", "%Y-%m"):
+        try:
+            return datetime.strptime(text, fmt).strftime("%b %Y")
+        except ValueError:
+            continue
+    return text
+
+
+def _ordered_sections(data: Dict[str, Any]) -> List[str]:
+    sections = data.get("sections") or []
+    ordered = sorted(sections, key=lambda s: s.get("order", 0))
+    return [str(s.get("id", "")) for s in ordered]
+
+
+_ENV = Environment(
+    loader=FileSystemLoader(str(TEMPLATES_DIR)),
+    autoescape=select_autoescape(["html"]),
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+_ENV.filters["rich"] = sanitize_rich_text
+_ENV.filters["month_year"] = format_month_year
+
+
+def supports_server_render(template: str) -> bool:
+    return template in SERVER_TEMPLATES
+
+
+def render_resume_html(template: str, data: Dict[str, Any]) -> str:
+    if not supports_server_render(template):
+        raise ValueError(f"Template '{template}' has no server-side renderer")
+    theme = data.get("theme") or {}
+    return _ENV.get_template(f"{template}.html").render(
+        template_name=template,
+        personal=data.get("personalDetails") or {},
+        summary=(data.get("professionalSummary") or {}).get("content") or "",
+        experiences=data.get("workExperiences") or [],
+        education=data.get("education") or [],
+        skills=data.get("skills") or [],
+        projects=data.get("projects") or [],
+        certifications=data.get("certifications") or [],
+        section_order=_ordered_sections(data),
+        accent_color=theme.get("primaryColor") or "",
+        font=theme.get("fontFamily") or DEFAULT_FONTS[template],
+    )
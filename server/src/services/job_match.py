@@ -0,0 +1,369 @@
+import json
+import math
+import re
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .heuristics import html_to_lines
+
+# Function words plus the boilerplate every posting repeats; neither says what the job needs
+STOPWORDS = frozenset("""
+a about above across after again against all also am an and any are around as at be because been before
+being below between both but by can could did do does doing down during each either etc e.g few for from
+further had has have having he her here hers him his how i i.e if in into is it its itself just me more
+most my no nor not now of off on once only or other our ours out over own per same she should so some
+such than that the their theirs them then there these they this those through to too under until up upon
+us very via was we were what when where which while who whom why will with within without would you your
+yours yourself able ability across applicant applicants apply benefits candidate candidates company
+competitive culture day days degree environment equal etc excellent experience experienced familiarity
+familiar good great help ideal ideally including job join knowledge level looking must new nice
+opportunity opportunities plus position preferred qualification qualifications related required
+requirement requirements responsibilities responsibility role salary seeking skill skills strong team
+teams understanding using well work working world year years beginner intermediate advanced expert
+native fluent present current
+""".split())
+
+_CLAUSE_BREAK = re.compile(r"[,;:()\[\]{}|•·▪‣◦!?\"]|(?<=[a-z0-9])\.(?=\s|$)|\s[-–—/]\s")
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[.\-/][a-z0-9+#]+)*")
+
+
+def _normalize(token: str) -> str:
+    # Light plural folding so "APIs" matches "API" and "technologies" matches "technology";
+    # tool names such as "node.js" or "ci/cd" are left alone
+    if not token.isalpha():
+        return token
+    if len(token) > 5 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us")) and not (len(token) > 4 and token.endswith("is")):
+        return token[:-1]
+    return token
+
+
+def extract_terms(text: str) -> Tuple[Counter, Dict[str, str]]:
+    """Unigram and bigram counts of ``text`` and the first surface form of each term.
+
+    Bigrams never span a stopword or a clause break, so "machine learning" is a term
+    but "python and go" contributes only its two words.
+    """
+    counts: Counter = Counter()
+    surface: Dict[str, str] = {}
+    for line in html_to_lines(text or ""):
+        for clause in _CLAUSE_BREAK.split(line.lower()):
+            previous: Optional[Tuple[str, str]] = None
+            for token in _TOKEN.findall(clause):
+                if token in STOPWORDS or not any(c.isalpha() for c in token) or len(token) < 2 and token not in ("c", "r"):
+                    previous = None
+                    continue
+                term = _normalize(token)
+                counts[term] += 1
+                surface.setdefault(term, token)
+                if previous is not None:
+                    bigram = f"{previous[0]} {term}"
+                    counts[bigram] += 1
+                    surface.setdefault(bigram, f"{previous[1]} {token}")
+                previous = (term, token)
+    return counts, surface
+
+
+def _segment_sums(values: np.ndarray, indptr: np.ndarray) -> np.ndarray:
+    """Sum of ``values`` over each CSR row; empty rows sum to zero."""
+    rows = len(indptr) - 1
+    out = np.zeros((rows,) + values.shape[1:], dtype=np.float32)
+    starts, ends = indptr[:-1], indptr[1:]
+    filled = starts < ends
+    if filled.any():
+        # reduceat over the starts of non-empty rows only: each segment then ends where the row does
+        out[filled] = np.add.reduceat(values, starts[filled], axis=0)
+    return out
+
+
+@dataclass
+class TermMatrix:
+    """Sparse rows of term weights in CSR form over a KeywordIndex's columns.
+
+    Row i holds columns ``indices[indptr[i]:indptr[i + 1]]`` with the same slice of
+    ``data`` as weights. Plain NumPy arrays, so no sparse-matrix dependency is needed.
+    """
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    columns: int
+
+    @property
+    def rows(self) -> int:
+        return len(self.indptr) - 1
+
+    def row(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return self.indices[lo:hi], self.data[lo:hi]
+
+    def row_sums(self) -> np.ndarray:
+        return _segment_sums(self.data, self.indptr)
+
+    def binary(self) -> "TermMatrix":
+        return TermMatrix(self.indptr, self.indices, np.ones_like(self.data), self.columns)
+
+    def top_per_row(self, k: int) -> "TermMatrix":
+        """Each row cut down to its ``k`` heaviest terms."""
+        keep = np.ones(len(self.data), dtype=bool)
+        for i in np.flatnonzero(np.diff(self.indptr) > k):
+            lo, hi = self.indptr[i], self.indptr[i + 1]
+            keep[lo:hi] = False
+            keep[lo + np.argpartition(-self.data[lo:hi], k - 1)[:k]] = True
+        indptr = np.concatenate(([0], np.cumsum(np.minimum(np.diff(self.indptr), k)))).astype(np.int64)
+        return TermMatrix(indptr, self.indices[keep], self.data[keep], self.columns)
+
+    def _dense_block(self, start: int, stop: int) -> np.ndarray:
+        """Rows ``start:stop`` as a dense (columns × rows) array."""
+        lo, hi = self.indptr[start], self.indptr[stop]
+        block = np.zeros((self.columns, stop - start), dtype=np.float32)
+        owners = np.repeat(np.arange(stop - start), np.diff(self.indptr[start : stop + 1]))
+        block[self.indices[lo:hi], owners] = self.data[lo:hi]
+        return block
+
+    def _row_blocks(self, max_nnz: int) -> Iterator[Tuple[int, int]]:
+        start = 0
+        while start < self.rows:
+            stop = int(np.searchsorted(self.indptr, self.indptr[start] + max(1, max_nnz), side="right")) - 1
+            stop = max(start + 1, min(stop, self.rows))
+            yield start, stop
+            start = stop
+
+    def dot(self, other: "TermMatrix", budget: int = 1 << 22) -> np.ndarray:
+        """(self.rows × other.rows) dot products of every pair of rows.
+
+        The side with fewer rows is expanded to dense columns and the other side's
+        non-zeros are gathered against it, in blocks of at most ``budget`` floats, so one
+        CV against thousands of postings touches only the postings' non-zeros.
+        """
+        if other.rows > self.rows:
+            return other.dot(self, budget).T
+        out = np.zeros((self.rows, other.rows), dtype=np.float32)
+        if not self.rows or not other.rows:
+            return out
+        width = max(1, min(other.rows, budget // max(1, self.columns)))
+        for col_start in range(0, other.rows, width):
+            col_stop = min(other.rows, col_start + width)
+            dense = other._dense_block(col_start, col_stop)
+            for start, stop in self._row_blocks(budget // (col_stop - col_start)):
+                lo, hi = self.indptr[start], self.indptr[stop]
+                products = self.data[lo:hi, None] * dense[self.indices[lo:hi]]
+                out[start:stop, col_start:col_stop] = _segment_sums(products, self.indptr[start : stop + 1] - lo)
+        return out
+
+
+class KeywordIndex:
+    """Term vocabulary and IDF table, fitted on a corpus of postings and/or CVs.
+
+    The vocabulary fixes the column space, so CVs and postings vectorized separately
+    can be scored against each other with TermMatrix.dot. Terms outside the table get
+    the IDF of a term no document contained.
+    """
+
+    def __init__(self, terms: Sequence[str], idf: Sequence[float], documents: int):
+        self.terms = list(terms)
+        self.vocabulary = {term: i for i, term in enumerate(self.terms)}
+        self.idf = np.asarray(idf, dtype=np.float32)
+        self.documents = documents
+        self.unseen_idf = math.log(1 + documents) + 1.0
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    @classmethod
+    def fit(cls, texts: Iterable[str], min_df: int = 1, min_phrase_df: int = 2, max_terms: int = 100_000) -> "KeywordIndex":
+        """Vocabulary of ``texts``; bigrams need ``min_phrase_df`` documents to count as phrases."""
+        frequencies: Counter = Counter()
+        documents = 0
+        for text in texts:
+            documents += 1
+            frequencies.update(extract_terms(text)[0].keys())
+        kept = [t for t, df in frequencies.items() if df >= (min_phrase_df if " " in t else min_df)]
+        kept = sorted(kept, key=lambda t: (-frequencies[t], t))[:max_terms]
+        terms = sorted(kept)
+        df = np.array([frequencies[t] for t in terms], dtype=np.float64)
+        # Smoothed IDF, as if one extra document contained every term
+        return cls(terms, np.log((1 + documents) / (1 + df)) + 1.0, documents)
+
+    @classmethod
+    def load(cls, path: str) -> "KeywordIndex":
+        with np.load(path) as table:
+            return cls(table["terms"].tolist(), table["idf"], int(table["documents"]))
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            np.savez_compressed(f, terms=np.array(self.terms, dtype=np.str_), idf=self.idf, documents=np.array(self.documents))
+
+    def idf_of(self, term: str) -> float:
+        column = self.vocabulary.get(term)
+        return float(self.idf[column]) if column is not None else self.unseen_idf
+
+    def subset(self, terms: Iterable[str]) -> "KeywordIndex":
+        """A small index over just ``terms`` with this table's weights, for one-off matches."""
+        terms = sorted(set(terms))
+        local = KeywordIndex(terms, [self.idf_of(t) for t in terms], self.documents)
+        local.unseen_idf = self.unseen_idf
+        return local
+
+    def vectorize_counts(self, counts: Sequence[Counter], normalize: bool = True) -> TermMatrix:
+        """TF-IDF rows, (1 + log tf) · idf, L2-normalized unless ``normalize`` is false."""
+        indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+        indices: List[int] = []
+        tf: List[float] = []
+        for i, row in enumerate(counts):
+            for term, count in row.items():
+                column = self.vocabulary.get(term)
+                if column is not None:
+                    indices.append(column)
+                    tf.append(count)
+            indptr[i + 1] = len(indices)
+        columns = np.array(indices, dtype=np.int64)
+        data = (1.0 + np.log(np.array(tf, dtype=np.float32))) * self.idf[columns]
+        if normalize and len(data):
+            norms = np.sqrt(_segment_sums(data * data, indptr))
+            data /= np.repeat(np.where(norms > 0, norms, 1.0), np.diff(indptr))
+        return TermMatrix(indptr, columns, data.astype(np.float32), len(self.terms))
+
+    def vectorize(self, texts: Sequence[str], normalize: bool = True) -> TermMatrix:
+        return self.vectorize_counts([extract_terms(text)[0] for text in texts], normalize)
+
+
+def _ranked(columns: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    return columns[np.argsort(-weights, kind="stable")]
+
+
+def _without_parts(terms: List[str], limit: int) -> List[str]:
+    # "kubernetes" adds nothing next to "kubernetes cluster"
+    bigram_words = {word for term in terms if " " in term for word in term.split(" ")}
+    return [term for term in terms if " " in term or term not in bigram_words][:limit]
+
+
+def match_job_description(
+    sections: Dict[str, str],
+    job_description: str,
+    index: Optional[KeywordIndex] = None,
+    max_keywords: int = 60,
+    limit: int = 20,
+) -> Dict[str, Any]:
+    """Keyword coverage of one CV (``flatten_resume_sections`` output) against a posting.
+
+    The posting's ``max_keywords`` heaviest TF-IDF terms are its keywords; a section's
+    coverage is the share of their weight it contains, and ``score`` the share the
+    whole CV contains. ``similarity`` is the cosine between the full TF-IDF vectors.
+    """
+    started = time.perf_counter()
+    posting_counts, surface = extract_terms(job_description)
+    # A bigram is a phrase when the posting repeats it or the IDF table saw it across postings
+    phrases = index.vocabulary if index is not None else {}
+    posting_counts = Counter({t: c for t, c in posting_counts.items() if " " not in t or c > 1 or t in phrases})
+    if not posting_counts:
+        raise ValueError("The job description has no usable keywords")
+    names = [name for name, text in sections.items() if (text or "").strip()]
+    section_counts = [extract_terms(sections[name])[0] for name in names]
+    resume_counts = sum(section_counts, Counter())
+
+    local = (index or KeywordIndex([], [], 0)).subset(set(posting_counts) | set(resume_counts))
+    posting = local.vectorize_counts([posting_counts])
+    keywords = posting.top_per_row(max_keywords)
+    resume = local.vectorize_counts(section_counts + [resume_counts])
+
+    total = float(keywords.row_sums()[0])
+    coverage = resume.binary().dot(keywords)[:, 0] / total
+    similarity = float(resume.dot(posting)[-1, 0])
+    present = np.zeros(len(local), dtype=bool)
+    present[resume.row(resume.rows - 1)[0]] = True
+    columns, weights = keywords.row(0)
+    order = _ranked(columns, weights)
+    matched = [local.terms[c] for c in order if present[c]]
+    missing = [local.terms[c] for c in order if not present[c]]
+
+    section_results = []
+    for i, name in enumerate(names):
+        in_section = set(resume.row(i)[0].tolist())
+        section_results.append({
+            "name": name,
+            "coverage": round(100.0 * float(coverage[i]), 1),
+            "matched_keywords": [surface[local.terms[c]] for c in order if c in in_section][:limit],
+        })
+    return {
+        "score": round(100.0 * float(coverage[-1]), 1),
+        "similarity": round(similarity, 3),
+        "keywords": len(columns),
+        "matched_keywords": [surface[t] for t in _without_parts(matched, limit)],
+        "missing_keywords": [surface[t] for t in _without_parts(missing, limit)],
+        "sections": section_results,
+        "idf_table": index is not None,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def match_many(
+    resumes: Sequence[Dict[str, str]],
+    job_descriptions: Sequence[str],
+    index: Optional[KeywordIndex] = None,
+    max_keywords: int = 60,
+    top_k: int = 10,
+) -> Dict[str, Any]:
+    """Score every CV against every posting with two matrix products.
+
+    Without a precomputed ``index`` the IDF table is fitted on the request's own CVs
+    and postings. Each CV gets its ``top_k`` postings by keyword coverage.
+    """
+    started = time.perf_counter()
+    resume_texts = ["\n".join(text for text in sections.values() if text) for sections in resumes]
+    index = index or KeywordIndex.fit(list(job_descriptions) + resume_texts)
+    resume_matrix = index.vectorize(resume_texts)
+    postings = index.vectorize(job_descriptions)
+    keywords = postings.top_per_row(max_keywords)
+
+    totals = keywords.row_sums()
+    coverage = resume_matrix.binary().dot(keywords) / np.where(totals > 0, totals, 1.0)[None, :]
+    similarity = resume_matrix.dot(postings)
+
+    k = max(1, min(top_k, postings.rows))
+    results = []
+    for i in range(resume_matrix.rows):
+        best = np.argpartition(-coverage[i], k - 1)[:k] if k < postings.rows else np.arange(postings.rows)
+        best = best[np.lexsort((-similarity[i, best], -coverage[i, best]))]
+        results.append({
+            "index": i,
+            "matches": [
+                {"posting": int(j), "score": round(100.0 * float(coverage[i, j]), 1), "similarity": round(float(similarity[i, j]), 3)}
+                for j in best
+            ],
+        })
+    return {
+        "resumes": resume_matrix.rows,
+        "postings": postings.rows,
+        "vocabulary": len(index),
+        "results": results,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def _corpus_texts(paths: Sequence[str]) -> Iterator[str]:
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                if isinstance(item, dict):
+                    item = item.get("job_description") or item.get("description") or item.get("text") or ""
+                yield str(item)
+
+
+if __name__ == "__main__":
+    # python -m src.services.job_match OUT.npz postings.jsonl [more.jsonl ...]
+    # Each line is a JSON string or an object with job_description/description/text.
+    if len(sys.argv) < 3:
+        sys.exit("usage: python -m src.services.job_match OUT.npz CORPUS.jsonl [CORPUS.jsonl ...]")
+    fitted = KeywordIndex.fit(_corpus_texts(sys.argv[2:]), min_df=2)
+    fitted.save(sys.argv[1])
+    print(f"{len(fitted)} terms from {fitted.documents} documents -> {sys.argv[1]}")
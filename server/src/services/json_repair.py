@@ -0,0 +1,285 @@
+import json
+import re
+from typing import List, Optional
+
+_LITERALS = {"true": "true", "false": "false", "null": "null", "True": "true", "False": "false", "None": "null"}
+_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?")
+# ".5" and "5." are valid Python but not JSON
+_LOOSE_NUMBER = re.compile(r"[-+]?(?:\d+\.\d*|\.\d+)")
+# "85%" and "85/100" are how models most often "improve" a numeric score; any other
+# fraction ("3/4") is not a score and stays text
+_PERCENT = re.compile(r"([-+]?\d+(?:\.\d+)?)%")
+_OUT_OF = re.compile(r"([-+]?\d+(?:\.\d+)?)/(?:5|10|100)")
+_VALID_ESCAPES = set('"\\/bfnrtu')
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t", "\b": "\\b", "\f": "\\f"}
+_TOKEN_CHARS = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.+-%/")
+
+# Scanner states
+_SEEK, _VALUE, _STRING, _LINE_COMMENT, _BLOCK_COMMENT, _DONE = range(6)
+
+
+class IncrementalJSONParser:
+    """Single-pass, chunk-at-a-time extractor for the first JSON object in LLM output.
+
+    Text before the first ``{`` (prose, code fences) and anything after the object
+    closes is ignored. While scanning it repairs what models commonly get wrong:
+    ``//`` and ``/* */`` comments, trailing and missing commas, single-quoted strings,
+    raw newlines and invalid escapes inside strings, Python literals, bare values
+    (read whole, up to ``,``, ``}``, ``]`` or a newline, so a bare URL keeps its ``//``),
+    and "85%" / "85/100" numbers. ``finish()`` also closes output that was cut off
+    mid-object, so a truncated response still yields the fields it got to (a number
+    or word cut off mid-way is dropped rather than guessed).
+    """
+
+    def __init__(self) -> None:
+        self._out: List[str] = []
+        self._state = _SEEK
+        self._stack: List[str] = []
+        self._quote = '"'
+        self._escape = False
+        self._slash = False
+        self._star = False
+        self._token: List[str] = []
+        # The token is a value (after ":" or in an array), not a bare key
+        self._bare = False
+        self._string: List[str] = []
+        self._pending_comma = False
+        # Last significant output: "value" (a value just ended), "open", "comma", "colon"
+        self._last = ""
+        self._result: Optional[dict] = None
+
+    def feed(self, chunk: str) -> Optional[dict]:
+        """Consume a chunk; returns the object once its closing brace has arrived."""
+        for ch in chunk:
+            if self._state == _DONE:
+                break
+            self._step(ch)
+        return self._result
+
+    def finish(self) -> Optional[dict]:
+        """End of input: parse what was seen, closing anything left open."""
+        if self._state == _DONE or self._state == _SEEK:
+            return self._result
+        if self._state == _STRING:
+            if self._escape:
+                self._string.append("\\\\")
+            self._end_string()
+        # A bare word still being read was cut off: "6" may have been "65", so drop it
+        self._token = []
+        self._slash = False
+        self._pending_comma = False
+        self._drop_dangling()
+        while self._stack:
+            self._out.append(self._stack.pop())
+        self._last = "value"
+        return self._parse()
+
+    def _parse(self) -> Optional[dict]:
+        try:
+            value = json.loads("".join(self._out))
+        except json.JSONDecodeError:
+            return None
+        return value if isinstance(value, dict) else None
+
+    def _drop_dangling(self) -> None:
+        # A key with no value (with or without its ":") cannot be closed into valid JSON
+        if self._last == "colon":
+            self._out.pop()
+            self._out.pop()
+        elif self._stack and self._stack[-1] == "}" and self._last == "value" and self._key_without_value():
+            self._out.pop()
+        while self._out and self._out[-1] == ",":
+            self._out.pop()
+
+    def _key_without_value(self) -> bool:
+        # _out holds whole tokens, so the token before the last one tells keys from values
+        return len(self._out) >= 2 and self._out[-2] in ("{", ",")
+
+    def _emit(self, text: str) -> None:
+        self._out.append(text)
+
+    def _begin_value(self) -> None:
+        if self._pending_comma:
+            self._emit(",")
+            self._pending_comma = False
+        elif self._last == "value":
+            # Two values in a row: the model forgot a comma
+            self._emit(",")
+
+    def _push_token(self, ch: str) -> None:
+        if not self._token:
+            self._bare = self._last == "colon" or (bool(self._stack) and self._stack[-1] == "]")
+        self._token.append(ch)
+
+    def _bare_char(self, ch: str) -> bool:
+        """Extend a bare value with ``ch``; False when ``ch`` ends it instead."""
+        token = self._token
+        if ch in ",}]\r\n":
+            return False
+        if ch in "\"'“”" and token[-1] in " \t":
+            # "1 "b"": the model forgot a comma before the next key
+            return False
+        if ch in "/*" and token[-1] == "/" and len(token) > 1 and token[-2] in " \t":
+            # A comment only after whitespace: "https://" is part of the value
+            token.pop()
+            self._flush_token()
+            self._state = _LINE_COMMENT if ch == "/" else _BLOCK_COMMENT
+            self._star = False
+            return True
+        token.append(ch)
+        return True
+
+    def _flush_token(self) -> None:
+        if not self._token:
+            return
+        word = "".join(self._token).rstrip()
+        self._token = []
+        if _NUMBER.fullmatch(word.lstrip("+")):
+            text = word.lstrip("+")
+        elif _LOOSE_NUMBER.fullmatch(word):
+            text = repr(float(word))
+        elif word in _LITERALS:
+            text = _LITERALS[word]
+        else:
+            match = _PERCENT.fullmatch(word) or _OUT_OF.fullmatch(word)
+            text = match.group(1).lstrip("+") if match and _NUMBER.fullmatch(match.group(1).lstrip("+")) else json.dumps(word)
+        self._begin_value()
+        self._emit(text)
+        self._last = "value"
+
+    def _close(self, ch: str) -> None:
+        self._flush_token()
+        self._pending_comma = False
+        if not self._stack:
+            return
+        if self._stack[-1] != ch:
+            # Mismatched closer: trust the structure we opened
+            ch = self._stack[-1]
+        if ch == "}" and self._last == "colon":
+            self._emit("null")
+        self._stack.pop()
+        self._emit(ch)
+        self._last = "value"
+        if not self._stack:
+            self._state = _DONE
+            self._result = self._parse()
+
+    def _step(self, ch: str) -> None:
+        state = self._state
+        if state == _SEEK:
+            if ch == "{":
+                self._state = _VALUE
+                self._stack.append("}")
+                self._emit("{")
+                self._last = "open"
+            return
+        if state == _STRING:
+            self._string_char(ch)
+            return
+        if state == _LINE_COMMENT:
+            if ch == "\n":
+                self._state = _VALUE
+            return
+        if state == _BLOCK_COMMENT:
+            if self._star and ch == "/":
+                self._state = _VALUE
+            self._star = ch == "*"
+            return
+
+        if self._token and self._bare and self._bare_char(ch):
+            return
+        if self._slash:
+            self._slash = False
+            if ch == "/":
+                self._flush_token()
+                self._state = _LINE_COMMENT
+                return
+            if ch == "*":
+                self._flush_token()
+                self._state = _BLOCK_COMMENT
+                self._star = False
+                return
+            self._push_token("/")
+        if ch == "/":
+            self._slash = True
+            return
+        if ch in _TOKEN_CHARS:
+            self._push_token(ch)
+            return
+        self._flush_token()
+        if ch in " \t\r\n":
+            return
+        if ch == ",":
+            if self._last not in ("open", "comma"):
+                self._pending_comma = True
+                self._last = "comma"
+            return
+        if ch == ":":
+            self._pending_comma = False
+            self._emit(":")
+            self._last = "colon"
+            return
+        if ch in "}]":
+            self._close(ch)
+            return
+        if ch in "{[":
+            self._begin_value()
+            self._stack.append("}" if ch == "{" else "]")
+            self._emit(ch)
+            self._last = "open"
+            return
+        if ch in "\"'“”":
+            self._begin_value()
+            self._quote = "”" if ch == "“" else ch
+            self._state = _STRING
+            self._escape = False
+            self._string = []
+            return
+        # Anything else outside a string (stray prose, bullets) is dropped
+
+    def _end_string(self) -> None:
+        self._out.append('"' + "".join(self._string) + '"')
+        self._string = []
+        self._state = _VALUE
+        self._last = "value"
+
+    def _string_char(self, ch: str) -> None:
+        out = self._string
+        if self._escape:
+            self._escape = False
+            if ch in _VALID_ESCAPES:
+                out.append("\\" + ch)
+            elif ch == "'":
+                out.append("'")
+            else:
+                out.append("\\\\" + _CONTROL_ESCAPES.get(ch, ch))
+            return
+        if ch == "\\":
+            self._escape = True
+            return
+        if ch == self._quote:
+            self._end_string()
+            return
+        if ch == '"':
+            out.append('\\"')
+        elif ch in _CONTROL_ESCAPES:
+            out.append(_CONTROL_ESCAPES[ch])
+        elif ch < " ":
+            out.append(f"\\u{ord(ch):04x}")
+        else:
+            out.append(ch)
+
+
+def extract_json(text: str) -> Optional[dict]:
+    """First JSON object in ``text``: strict parse when the model behaved, repair otherwise."""
+    start = text.find("{")
+    if start == -1:
+        return None
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text, start)
+        if isinstance(value, dict):
+            return value
+    except json.JSONDecodeError:
+        pass
+    parser = IncrementalJSONParser()
+    return parser.feed(text[start:]) or parser.finish()
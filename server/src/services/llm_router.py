@@ -0,0 +1,244 @@
+import asyncio
+import random
+import time
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+
+import httpx
+from loguru import logger
+
+
+def normalize_model(name: str) -> str:
+    # Ollama lists untagged models as "<name>:latest"
+    return name if ":" in name else f"{name}:latest"
+
+
+class NoBackendAvailable(RuntimeError):
+    pass
+
+
+class Backend:
+    """One Ollama node as seen by the router: load, health, breaker state and models."""
+
+    def __init__(self, client: Any, models: Optional[Iterable[str]] = None):
+        self.client = client
+        self.url = getattr(client, "base_url", repr(client))
+        self.outstanding = 0
+        self.healthy = True
+        self.failures = 0
+        self.open_until = 0.0
+        # Pinned models are never replaced by discovery; None means "not known yet"
+        self.pinned = models is not None
+        self.models: Optional[Set[str]] = {normalize_model(m) for m in models} if models is not None else None
+        # Models this backend answered 404 for, until the next successful health check
+        self.missing: Set[str] = set()
+        self.requests = 0
+        self.errors = 0
+
+    def circuit(self, now: float) -> str:
+        if self.open_until == 0.0:
+            return "closed"
+        return "open" if now < self.open_until else "half_open"
+
+    def serves(self, model: str) -> bool:
+        model = normalize_model(model)
+        return (self.models is None or model in self.models) and model not in self.missing
+
+    def available(self, now: float) -> bool:
+        state = self.circuit(now)
+        # Half-open lets a single trial request through
+        return self.healthy and (state == "closed" or (state == "half_open" and self.outstanding == 0))
+
+
+class LLMRouter:
+    """``LLMClient`` spreading prompts over several Ollama backends.
+
+    Each call goes to the available backend serving the model with the fewest
+    outstanding requests. Connection errors, timeouts and 5xx answers count against a
+    per-backend circuit breaker and the call is retried, after a jittered backoff, on
+    a backend it has not tried yet. A 404 marks the model missing on that backend.
+    A background task polls ``/api/tags`` to track health and which models each
+    backend has pulled.
+    """
+
+    def __init__(
+        self,
+        backends: List[Backend],
+        retry_attempts: int = 2,
+        retry_backoff: float = 0.2,
+        breaker_failures: int = 3,
+        breaker_reset: float = 30.0,
+        health_interval: float = 15.0,
+    ):
+        if not backends:
+            raise ValueError("LLMRouter needs at least one backend")
+        self.backends = backends
+        self.retry_attempts = max(0, retry_attempts)
+        self.retry_backoff = retry_backoff
+        self.breaker_failures = max(1, breaker_failures)
+        self.breaker_reset = breaker_reset
+        self.health_interval = health_interval
+        self._health_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._health_task is None and self.health_interval > 0:
+            await self.check_health()
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def aclose(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+        for backend in self.backends:
+            await backend.client.aclose()
+
+    async def check_health(self) -> None:
+        await asyncio.gather(*(self._probe(backend) for backend in self.backends))
+
+    async def _probe(self, backend: Backend) -> None:
+        try:
+            models = await backend.client.list_models()
+        except Exception as exc:
+            if backend.healthy:
+                logger.warning("LLM backend {} failed its health check: {}", backend.url, str(exc))
+            backend.healthy = False
+            return
+        if not backend.healthy:
+            logger.info("LLM backend {} is healthy again", backend.url)
+        backend.healthy = True
+        backend.failures = 0
+        backend.open_until = 0.0
+        backend.missing.clear()
+        if not backend.pinned:
+            backend.models = {normalize_model(m) for m in models}
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_interval)
+            try:
+                await self.check_health()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.exception("LLM health check failed: {}", str(exc))
+
+    def _pick(self, model: str, tried: Set[int]) -> Backend:
+        now = time.monotonic()
+        serving = [b for b in self.backends if b.serves(model)]
+        if not serving:
+            raise NoBackendAvailable(f"No LLM backend serves model '{model}'")
+        candidates = [b for b in serving if id(b) not in tried and b.available(now)]
+        if not candidates:
+            raise NoBackendAvailable(f"No healthy LLM backend available for model '{model}'")
+        least = min(b.outstanding for b in candidates)
+        return random.choice([b for b in candidates if b.outstanding == least])
+
+    def _pick_retry(self, model: str, tried: Set[int], last_error: Optional[Exception]) -> Backend:
+        try:
+            return self._pick(model, tried)
+        except NoBackendAvailable:
+            # Nowhere left to retry: surface the failure that sent us here
+            if last_error is not None:
+                raise last_error
+            raise
+
+    def _record_success(self, backend: Backend) -> None:
+        backend.failures = 0
+        backend.open_until = 0.0
+
+    def _record_failure(self, backend: Backend, model: str, exc: Exception) -> bool:
+        """Update breaker/model state; returns whether another backend may succeed."""
+        backend.errors += 1
+        if isinstance(exc, httpx.HTTPStatusError):
+            status = exc.response.status_code
+            if status == 404:
+                backend.missing.add(normalize_model(model))
+                return True
+            if status < 500:
+                return False
+        backend.failures += 1
+        if backend.failures >= self.breaker_failures:
+            if backend.circuit(time.monotonic()) != "open":
+                logger.warning("LLM backend {} circuit opened after {} failures", backend.url, backend.failures)
+            backend.open_until = time.monotonic() + self.breaker_reset
+        return True
+
+    async def _backoff(self, attempt: int) -> None:
+        # Full jitter keeps retries from several callers from landing together
+        await asyncio.sleep(random.uniform(0, self.retry_backoff * (2 ** attempt)))
+
+    async def generate(self, prompt: str, model: str) -> str:
+        tried: Set[int] = set()
+        attempt = 0
+        last_error: Optional[Exception] = None
+        while True:
+            backend = self._pick_retry(model, tried, last_error)
+            tried.add(id(backend))
+            backend.outstanding += 1
+            backend.requests += 1
+            try:
+                result = await backend.client.generate(prompt, model)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                last_error = exc
+                retryable = self._record_failure(backend, model, exc)
+                if not retryable or attempt >= self.retry_attempts or len(tried) >= len(self.backends):
+                    raise
+                logger.info("Retrying LLM call on another backend after {} failed: {}", backend.url, str(exc))
+            else:
+                self._record_success(backend)
+                return result
+            finally:
+                backend.outstanding -= 1
+            await self._backoff(attempt)
+            attempt += 1
+
+    async def generate_stream(self, prompt: str, model: str) -> AsyncIterator[str]:
+        tried: Set[int] = set()
+        attempt = 0
+        last_error: Optional[Exception] = None
+        while True:
+            backend = self._pick_retry(model, tried, last_error)
+            tried.add(id(backend))
+            backend.outstanding += 1
+            backend.requests += 1
+            started = False
+            try:
+                # A consumer that stops early must not leave the backend's stream (and its connection) open
+                async with aclosing(backend.client.generate_stream(prompt, model)) as stream:
+                    async for chunk in stream:
+                        started = True
+                        yield chunk
+            except (asyncio.CancelledError, GeneratorExit):
+                raise
+            except Exception as exc:
+                last_error = exc
+                retryable = self._record_failure(backend, model, exc)
+                # Once text has reached the caller a retry would duplicate it
+                if started or not retryable or attempt >= self.retry_attempts or len(tried) >= len(self.backends):
+                    raise
+                logger.info("Retrying LLM stream on another backend after {} failed: {}", backend.url, str(exc))
+            else:
+                self._record_success(backend)
+                return
+            finally:
+                backend.outstanding -= 1
+            await self._backoff(attempt)
+            attempt += 1
+
+    def stats(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        return [
+            {
+                "url": b.url,
+                "healthy": b.healthy,
+                "circuit": b.circuit(now),
+                "outstanding": b.outstanding,
+                "requests": b.requests,
+                "errors": b.errors,
+                "models": sorted(b.models) if b.models is not None else None,
+            }
+            for b in self.backends
+        ]
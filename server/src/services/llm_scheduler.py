@@ -0,0 +1,190 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+from .metrics import LLM_QUEUE_SHED, LLM_QUEUE_WAIT
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+# Highest first
+PRIORITIES = (INTERACTIVE, BULK)
+
+
+class SchedulerOverloaded(Exception):
+    """The call would wait longer than its priority class allows; retry later."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    def __init__(self, future: "asyncio.Future[None]"):
+        self.future = future
+
+
+class _ClassQueue:
+    """Waiters of one priority class, queued per client and served round-robin."""
+
+    def __init__(self) -> None:
+        self.clients: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self.waiting = 0
+
+    def push(self, client: str, waiter: _Waiter) -> None:
+        self.clients.setdefault(client, deque()).append(waiter)
+        self.waiting += 1
+
+    def remove(self, client: str, waiter: _Waiter) -> None:
+        waiters = self.clients.get(client)
+        if waiters is not None and waiter in waiters:
+            waiters.remove(waiter)
+            self.waiting -= 1
+            if not waiters:
+                del self.clients[client]
+
+    def pop(self) -> Optional[_Waiter]:
+        while self.clients:
+            client, waiters = next(iter(self.clients.items()))
+            waiter = waiters.popleft()
+            self.waiting -= 1
+            # The client goes to the back of the line whether or not it has more queued
+            del self.clients[client]
+            if waiters:
+                self.clients[client] = waiters
+            if not waiter.future.done():
+                return waiter
+        return None
+
+
+class LLMScheduler:
+    """Admission control for LLM calls: priority classes, per-client fairness, a global cap.
+
+    At most ``max_in_flight`` calls run at once. Interactive calls are always admitted
+    before bulk ones, and bulk never holds more than ``bulk_max_in_flight`` slots, so an
+    interactive review finds a free slot without waiting for bulk calls to finish. Within
+    a class, clients take turns, so one client's hundred prompts do not sit in front of
+    another client's one.
+
+    A call that cannot start within its class deadline is shed with SchedulerOverloaded:
+    up front when the estimated wait (queue ahead of it times the average hold time)
+    is already past the deadline, otherwise when the deadline expires in the queue.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 16,
+        bulk_max_in_flight: Optional[int] = None,
+        deadlines: Optional[Dict[str, float]] = None,
+        max_waiting: int = 2000,
+    ):
+        self.max_in_flight = max(1, max_in_flight)
+        default_bulk = self.max_in_flight - max(1, self.max_in_flight // 4) if self.max_in_flight > 1 else 1
+        self.bulk_max_in_flight = max(1, min(self.max_in_flight, bulk_max_in_flight or default_bulk))
+        self.deadlines = {INTERACTIVE: 30.0, BULK: 900.0, **(deadlines or {})}
+        self.max_waiting = max(1, max_waiting)
+        self._queues: Dict[str, _ClassQueue] = {priority: _ClassQueue() for priority in PRIORITIES}
+        self._in_flight: Dict[str, int] = {priority: 0 for priority in PRIORITIES}
+        # Moving average of how long a call holds its slot, for the up-front wait estimate
+        self._avg_hold = 0.0
+        self.admitted = 0
+        self.shed = 0
+
+    @property
+    def in_flight(self) -> int:
+        return sum(self._in_flight.values())
+
+    def _class_cap(self, priority: str) -> int:
+        return self.bulk_max_in_flight if priority == BULK else self.max_in_flight
+
+    def _has_slot(self, priority: str) -> bool:
+        return self.in_flight < self.max_in_flight and self._in_flight[priority] < self._class_cap(priority)
+
+    def _ahead(self, priority: str) -> int:
+        # Everything queued at this priority or higher is served first
+        return sum(self._queues[p].waiting for p in PRIORITIES[: PRIORITIES.index(priority) + 1])
+
+    def estimated_wait(self, priority: str) -> float:
+        return self._ahead(priority) * self._avg_hold / self._class_cap(priority)
+
+    def _shed(self, priority: str, reason: str, message: str) -> SchedulerOverloaded:
+        self.shed += 1
+        LLM_QUEUE_SHED.inc(priority=priority, reason=reason)
+        return SchedulerOverloaded(message, retry_after=max(1.0, self.estimated_wait(priority)))
+
+    def _grant(self, priority: str) -> None:
+        self._in_flight[priority] += 1
+        self.admitted += 1
+
+    def _dispatch(self) -> None:
+        while self.in_flight < self.max_in_flight:
+            for priority in PRIORITIES:
+                if not self._has_slot(priority):
+                    continue
+                waiter = self._queues[priority].pop()
+                if waiter is not None:
+                    self._grant(priority)
+                    waiter.future.set_result(None)
+                    break
+            else:
+                return
+
+    async def _acquire(self, priority: str, client: str) -> None:
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority '{priority}' (expected one of {', '.join(PRIORITIES)})")
+        if self._has_slot(priority) and self._ahead(priority) == 0:
+            self._grant(priority)
+            return
+        deadline = self.deadlines[priority]
+        if sum(q.waiting for q in self._queues.values()) >= self.max_waiting:
+            raise self._shed(priority, "queue_full", "LLM queue is full")
+        if self.estimated_wait(priority) > deadline:
+            raise self._shed(priority, "estimate", f"Estimated LLM queue wait exceeds {deadline:g}s")
+        waiter = _Waiter(asyncio.get_running_loop().create_future())
+        self._queues[priority].push(client, waiter)
+        try:
+            await asyncio.wait_for(waiter.future, deadline)
+        except asyncio.TimeoutError:
+            # Granted in the same tick as the deadline (wait_for on 3.12+ does not check):
+            # the slot is ours, so use it rather than shed and leak it
+            if waiter.future.done() and not waiter.future.cancelled():
+                return
+            self._queues[priority].remove(client, waiter)
+            raise self._shed(priority, "deadline", f"Waited {deadline:g}s for an LLM slot")
+        except asyncio.CancelledError:
+            self._queues[priority].remove(client, waiter)
+            # Granted just as the caller went away: hand the slot on
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(priority, 0.0)
+            raise
+
+    def _release(self, priority: str, held: float) -> None:
+        self._in_flight[priority] -= 1
+        if held > 0:
+            self._avg_hold = held if not self._avg_hold else 0.9 * self._avg_hold + 0.1 * held
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: str = INTERACTIVE, client: str = "default") -> AsyncIterator[None]:
+        queued = time.perf_counter()
+        await self._acquire(priority, client)
+        start = time.perf_counter()
+        LLM_QUEUE_WAIT.observe(start - queued, priority=priority)
+        try:
+            yield
+        finally:
+            self._release(priority, time.perf_counter() - start)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "bulk_max_in_flight": self.bulk_max_in_flight,
+            "in_flight": dict(self._in_flight),
+            "waiting": {priority: queue.waiting for priority, queue in self._queues.items()},
+            "waiting_clients": {priority: len(queue.clients) for priority, queue in self._queues.items()},
+            "deadlines": dict(self.deadlines),
+            "avg_hold_seconds": round(self._avg_hold, 3),
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
@@ -0,0 +1,227 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from loguru import logger
+
+from .cv_review import CVReviewConfig, get_llm_client
+from .llm_router import LLMRouter, normalize_model
+
+DAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+_MINUTES_PER_DAY = 24 * 60
+
+
+def _parse_clock(value: str) -> int:
+    hours, _, minutes = value.strip().partition(":")
+    total = int(hours) * 60 + int(minutes or 0)
+    if not 0 <= total <= _MINUTES_PER_DAY:
+        raise ValueError(f"Invalid time of day '{value}'")
+    return total
+
+
+class KeepAliveWindow:
+    """When models must stay loaded: a daily "HH:MM-HH:MM" span on some weekdays.
+
+    A span whose end is before its start runs past midnight and belongs to the day it
+    starts on. No hours and no days means always.
+    """
+
+    def __init__(self, hours: str = "", days: str = "", timezone: str = ""):
+        hours, days = hours.strip(), days.strip()
+        self.always = not hours and not days
+        if hours:
+            start, _, end = hours.partition("-")
+            self.start, self.end = _parse_clock(start), _parse_clock(end)
+        else:
+            self.start, self.end = 0, _MINUTES_PER_DAY
+        try:
+            self.days = {DAYS.index(d.strip()[:3].lower()) for d in days.split(",") if d.strip()} or set(range(7))
+        except ValueError:
+            raise ValueError(f"Invalid keep-alive days '{days}' (use {','.join(DAYS)})") from None
+        self.timezone = ZoneInfo(timezone) if timezone else None
+
+    def seconds_left(self, now: Optional[datetime] = None) -> float:
+        """Seconds until the window closes; 0 when it is closed."""
+        if self.always:
+            return float("inf")
+        now = now or datetime.now(self.timezone)
+        minute = now.hour * 60 + now.minute + now.second / 60
+        today, yesterday = now.weekday(), (now.weekday() - 1) % 7
+        if self.start < self.end:
+            left = self.end - minute if today in self.days and self.start <= minute < self.end else 0.0
+        elif today in self.days and minute >= self.start:
+            left = _MINUTES_PER_DAY - minute + self.end
+        elif yesterday in self.days and minute < self.end:
+            left = self.end - minute
+        else:
+            left = 0.0
+        return left * 60
+
+    def describe(self) -> str:
+        if self.always:
+            return "always"
+        days = ",".join(DAYS[d] for d in sorted(self.days))
+        clock = lambda m: f"{m // 60:02d}:{m % 60:02d}"
+        return f"{clock(self.start)}-{clock(self.end)} {days}"
+
+
+class ModelKeeper:
+    """Loads the review models into Ollama ahead of traffic and keeps them loaded.
+
+    start() warms every model in the background, retrying until each one has loaded on
+    at least one backend; ``ready`` turns true then. While the keep-alive window is open
+    the models are preloaded again every ``interval`` seconds with a keep_alive that
+    lasts until the window closes. The review clients send the same keep_alive, since a
+    request carrying Ollama's default would cut the model's lifetime back to 5 minutes.
+    Outside the window nothing is refreshed and Ollama unloads idle models as usual.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        models: Iterable[str],
+        window: Optional[KeepAliveWindow] = None,
+        interval: float = 240.0,
+        load_timeout: float = 300.0,
+    ):
+        self.client = client
+        self.models = list(dict.fromkeys(normalize_model(m) for m in models if m))
+        self.window = window or KeepAliveWindow()
+        self.interval = max(1.0, interval)
+        self.load_timeout = load_timeout
+        # model -> backend url -> last preload outcome
+        self._state: Dict[str, Dict[str, Dict[str, Any]]] = {model: {} for model in self.models}
+        self.warmed_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return all(any(s["loaded"] for s in self._state[model].values()) for model in self.models)
+
+    def keep_alive(self, now: Optional[datetime] = None) -> Optional[int]:
+        if self.window.always:
+            return -1
+        left = self.window.seconds_left(now)
+        # One interval of slack, so a late refresh does not let the model go early
+        return int(left + self.interval) if left > 0 else None
+
+    def _targets(self, model: str) -> List[Any]:
+        if isinstance(self.client, LLMRouter):
+            return [b.client for b in self.client.backends if b.healthy and b.serves(model)]
+        return [self.client]
+
+    def _apply_keep_alive(self, keep_alive: Optional[int]) -> None:
+        clients = [b.client for b in self.client.backends] if isinstance(self.client, LLMRouter) else [self.client]
+        for client in clients:
+            if hasattr(client, "keep_alive"):
+                client.keep_alive = keep_alive
+                client.keep_alive_models = set(self.models)
+
+    async def _preload_backend(self, client: Any, models: List[str], keep_alive: Optional[int]) -> None:
+        url = getattr(client, "base_url", repr(client))
+        # One model at a time per backend: concurrent loads only compete for the same memory
+        for model in models:
+            try:
+                load_seconds = await client.preload(model, keep_alive=keep_alive, timeout=self.load_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                if self._state[model].get(url, {}).get("loaded", True):
+                    logger.warning("Preloading {} on {} failed: {}", model, url, str(exc) or type(exc).__name__)
+                self._state[model][url] = {"loaded": False, "error": str(exc) or type(exc).__name__, "checked_at": time.time()}
+                continue
+            if load_seconds > 0.5:
+                logger.info("Loaded {} on {} in {:.1f}s", model, url, load_seconds)
+            self._state[model][url] = {"loaded": True, "load_seconds": round(load_seconds, 3), "checked_at": time.time()}
+
+    async def refresh(self) -> None:
+        keep_alive = self.keep_alive()
+        self._apply_keep_alive(keep_alive)
+        plan: Dict[int, Tuple[Any, List[str]]] = {}
+        for model in self.models:
+            targets = self._targets(model)
+            # A backend that went unhealthy or lost the model no longer counts towards readiness
+            urls = {getattr(client, "base_url", repr(client)) for client in targets}
+            self._state[model] = {url: state for url, state in self._state[model].items() if url in urls}
+            for client in targets:
+                plan.setdefault(id(client), (client, []))[1].append(model)
+        await asyncio.gather(*(self._preload_backend(client, models, keep_alive) for client, models in plan.values()))
+
+    async def _run(self) -> None:
+        delay = 1.0
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                # Keep trying: giving up here would leave /health/ready at 503 for good
+                logger.exception("Model warm-up failed: {}", str(exc))
+            if self.ready:
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.interval)
+        self.warmed_at = time.time()
+        logger.info("Models warm: {} (keep-alive {})", ", ".join(self.models), self.window.describe())
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                if self.keep_alive() is None:
+                    # Window closed: requests go back to Ollama's default keep_alive
+                    self._apply_keep_alive(None)
+                else:
+                    await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.exception("Model keep-alive refresh failed: {}", str(exc))
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "warmed_at": self.warmed_at,
+            "keep_alive_window": self.window.describe(),
+            "keep_alive_seconds": self.keep_alive(),
+            "models": {model: {"ready": any(s["loaded"] for s in backends.values()), "backends": backends} for model, backends in self._state.items()},
+        }
+
+
+_KEEPER: Optional[ModelKeeper] = None
+
+
+async def start_model_keeper() -> None:
+    global _KEEPER
+    config = CVReviewConfig()
+    if _KEEPER is not None or not config.warmup_enabled:
+        return
+    _KEEPER = ModelKeeper(
+        get_llm_client(),
+        [config.default_model, *config.warmup_models],
+        KeepAliveWindow(config.keepalive_hours, config.keepalive_days, config.keepalive_timezone),
+        interval=config.keepalive_interval,
+        load_timeout=config.warmup_timeout,
+    )
+    _KEEPER.start()
+
+
+async def stop_model_keeper() -> None:
+    global _KEEPER
+    if _KEEPER is not None:
+        await _KEEPER.stop()
+        _KEEPER = None
+
+
+def get_model_keeper() -> Optional[ModelKeeper]:
+    return _KEEPER
@@ -0,0 +1,468 @@
+import io
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterator, List, Tuple
+from xml.sax.saxutils import escape
+
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Pt, RGBColor
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.platypus import HRFlowable, KeepTogether, ListFlowable, ListItem, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from .html_render import format_month_year
+
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# The sections the built-in templates draw, keyed by the client's section id
+DEFAULT_TITLES = {
+    "summary": "Professional Summary",
+    "experience": "Work Experience",
+    "education": "Education",
+    "skills": "Skills",
+    "projects": "Projects",
+    "certifications": "Certifications",
+}
+_HEX_COLOR = re.compile(r"^#[0-9a-fA-F]{6}$")
+
+
+class NativeRenderUnsupported(Exception):
+    """The payload needs something the native engine cannot draw; render it in Chromium instead."""
+
+
+@dataclass(frozen=True)
+class NativeStyle:
+    pdf_font: str
+    docx_font: str
+    accent: str
+    header_align: str = "left"
+    header_band: bool = False
+    upper_titles: bool = False
+    rule_weight: float = 0.75
+
+
+# Approximations of the HTML templates with the PDF base fonts, which need no embedding
+STYLES: Dict[str, NativeStyle] = {
+    "classic": NativeStyle(pdf_font="Times-Roman", docx_font="Times New Roman", accent="#111827", header_align="center"),
+    "legacy": NativeStyle(pdf_font="Helvetica", docx_font="Arial", accent="#0f172a", header_band=True, upper_titles=True),
+    "professional": NativeStyle(pdf_font="Times-Roman", docx_font="Georgia", accent="#0f172a", upper_titles=True, rule_weight=1.5),
+}
+NATIVE_TEMPLATES = tuple(STYLES)
+
+Run = Tuple[str, bool, bool]
+
+
+@dataclass
+class TextBlock:
+    runs: List[Run]
+    bullet: bool = False
+
+
+@dataclass
+class Entry:
+    title: str
+    subtitle: str = ""
+    dates: str = ""
+    meta: List[str] = field(default_factory=list)
+    body: List[TextBlock] = field(default_factory=list)
+
+
+@dataclass
+class Section:
+    id: str
+    title: str
+    entries: List[Entry] = field(default_factory=list)
+    inline: List[str] = field(default_factory=list)
+    body: List[TextBlock] = field(default_factory=list)
+
+
+@dataclass
+class ResumeDocument:
+    name: str
+    role: str
+    contact: List[str]
+    sections: List[Section]
+
+
+class _RichTextParser(HTMLParser):
+    """Editor HTML to paragraphs and bullets of (text, bold, italic) runs."""
+
+    _BLOCK_TAGS = {"p", "div", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote"}
+    _SKIP_TAGS = {"script", "style"}
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.blocks: List[TextBlock] = []
+        self._runs: List[Run] = []
+        self._bold = 0
+        self._italic = 0
+        self._skip = 0
+        self._in_item = 0
+
+    def _flush(self) -> None:
+        runs = [(text, bold, italic) for text, bold, italic in self._runs if text]
+        if runs and "".join(t for t, _, _ in runs).strip():
+            first, *rest = runs
+            runs = [(first[0].lstrip(), first[1], first[2])] + rest
+            runs[-1] = (runs[-1][0].rstrip(), runs[-1][1], runs[-1][2])
+            self.blocks.append(TextBlock(runs=runs, bullet=self._in_item > 0))
+        self._runs = []
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag in self._SKIP_TAGS:
+            self._skip += 1
+        elif tag in ("b", "strong"):
+            self._bold += 1
+        elif tag in ("i", "em"):
+            self._italic += 1
+        elif tag == "br":
+            self._flush()
+        elif tag in self._BLOCK_TAGS:
+            self._flush()
+            if tag == "li":
+                self._in_item += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self._SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in ("b", "strong"):
+            self._bold = max(0, self._bold - 1)
+        elif tag in ("i", "em"):
+            self._italic = max(0, self._italic - 1)
+        elif tag in self._BLOCK_TAGS:
+            self._flush()
+            if tag == "li":
+                self._in_item = max(0, self._in_item - 1)
+
+    def handle_data(self, data: str) -> None:
+        if self._skip:
+            return
+        text = re.sub(r"\s+", " ", data)
+        if text:
+            self._runs.append((text, self._bold > 0, self._italic > 0))
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+
+# Characters XML 1.0 cannot carry: python-docx refuses them and ReportLab's paragraph parser trips on them
+_XML_INVALID = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+
+def parse_rich_text(value: Any) -> List[TextBlock]:
+    text = _XML_INVALID.sub("", str(value or "")).strip()
+    if not text:
+        return []
+    if "<" not in text:
+        return [TextBlock(runs=[(line.strip(), False, False)]) for line in text.splitlines() if line.strip()]
+    parser = _RichTextParser()
+    parser.feed(text)
+    parser.close()
+    return parser.blocks
+
+
+def _text(value: Any) -> str:
+    return _XML_INVALID.sub("", str(value or "")).strip()
+
+
+def _join(parts: List[str], sep: str) -> str:
+    return sep.join(p for p in parts if p)
+
+
+def _date_range(start: Any, end: Any, current: bool = False) -> str:
+    return _join([format_month_year(start), "Present" if current else format_month_year(end)], " — ")
+
+
+def _section_order(data: Dict[str, Any]) -> List[Tuple[str, str]]:
+    # Same set and order as html_render._ordered_sections, so every engine draws the same CV
+    listed = sorted(data.get("sections") or [], key=lambda s: s.get("order", 0))
+    return [(str(s.get("id", "")), _text(s.get("title"))) for s in listed]
+
+
+def _entries(data: Dict[str, Any], section_id: str) -> Tuple[List[Entry], List[str], List[TextBlock]]:
+    if section_id == "summary":
+        return [], [], parse_rich_text((data.get("professionalSummary") or {}).get("content"))
+    if section_id == "experience":
+        return [
+            Entry(
+                title=_text(item.get("position")) or "Job Title",
+                subtitle=_text(item.get("company")),
+                dates=_date_range(item.get("startDate"), item.get("endDate"), bool(item.get("current"))),
+                meta=[m for m in [_text(item.get("location"))] if m],
+                body=parse_rich_text(item.get("description")),
+            )
+            for item in data.get("workExperiences") or []
+        ], [], []
+    if section_id == "education":
+        return [
+            Entry(
+                title=_join([_text(item.get("degree")), _text(item.get("fieldOfStudy"))], ", ") or "Degree",
+                subtitle=_text(item.get("institution")),
+                dates=_date_range(item.get("startDate"), item.get("endDate")),
+                body=parse_rich_text(item.get("description")),
+            )
+            for item in data.get("education") or []
+        ], [], []
+    if section_id == "skills":
+        skills = data.get("skills") or []
+        return [], [_text(s.get("name")) + (f" ({_text(s.get('level'))})" if s.get("level") else "") for s in skills if s.get("name")], []
+    if section_id == "projects":
+        return [
+            Entry(
+                title=_text(item.get("name")),
+                dates=_date_range(item.get("startDate"), item.get("endDate")),
+                meta=[m for m in [_text(item.get("link"))] if m],
+                body=parse_rich_text(item.get("description")),
+            )
+            for item in data.get("projects") or []
+        ], [], []
+    if section_id == "certifications":
+        return [
+            Entry(
+                title=_text(item.get("name")),
+                subtitle=_text(item.get("issuer")),
+                dates=_date_range(item.get("issueDate"), item.get("expiryDate")),
+            )
+            for item in data.get("certifications") or []
+        ], [], []
+    return [], [], []
+
+
+def build_document(data: Dict[str, Any]) -> ResumeDocument:
+    personal = data.get("personalDetails") or {}
+    sections: List[Section] = []
+    for section_id, title in _section_order(data):
+        if section_id not in DEFAULT_TITLES:
+            continue
+        entries, inline, body = _entries(data, section_id)
+        if entries or inline or body:
+            sections.append(Section(section_id, title or DEFAULT_TITLES[section_id], entries, inline, body))
+    contact = [_text(personal.get(k)) for k in ("email", "phone", "location", "website", "linkedin")]
+    return ResumeDocument(
+        name=_text(personal.get("fullName")) or "Your Name",
+        role=_text(personal.get("jobTitle")),
+        contact=[c for c in contact if c],
+        sections=sections,
+    )
+
+
+def _strings(doc: ResumeDocument) -> Iterator[str]:
+    yield doc.name
+    yield doc.role
+    yield from doc.contact
+    for section in doc.sections:
+        yield section.title
+        yield from section.inline
+        blocks = list(section.body)
+        for entry in section.entries:
+            yield from (entry.title, entry.subtitle, entry.dates, *entry.meta)
+            blocks += entry.body
+        for block in blocks:
+            yield from (text for text, _, _ in block.runs)
+
+
+def supports_native_render(template: str) -> bool:
+    return template in STYLES
+
+
+def _style(template: str) -> NativeStyle:
+    return STYLES.get(template, STYLES["classic"])
+
+
+def _accent(template: str, data: Dict[str, Any]) -> str:
+    color = _text((data.get("theme") or {}).get("primaryColor"))
+    return color if _HEX_COLOR.match(color) else _style(template).accent
+
+
+# PDF
+
+def _bold_font(font: str) -> str:
+    return {"Times-Roman": "Times-Bold", "Helvetica": "Helvetica-Bold"}.get(font, font)
+
+
+def _markup(runs: List[Run]) -> str:
+    out = []
+    for text, bold, italic in runs:
+        piece = escape(text)
+        if italic:
+            piece = f"<i>{piece}</i>"
+        if bold:
+            piece = f"<b>{piece}</b>"
+        out.append(piece)
+    return "".join(out)
+
+
+def _pdf_styles(style: NativeStyle, accent: str) -> Dict[str, ParagraphStyle]:
+    base = ParagraphStyle("body", fontName=style.pdf_font, fontSize=10.5, leading=14, textColor=colors.HexColor("#111827"))
+    align = TA_CENTER if style.header_align == "center" else TA_LEFT
+    on_band = colors.white if style.header_band else None
+    return {
+        "body": base,
+        "name": ParagraphStyle("name", parent=base, fontName=_bold_font(style.pdf_font), fontSize=21, leading=25, alignment=align, textColor=on_band or colors.HexColor(accent)),
+        "role": ParagraphStyle("role", parent=base, fontSize=12, leading=16, alignment=align, textColor=on_band or colors.HexColor("#374151")),
+        "contact": ParagraphStyle("contact", parent=base, fontSize=10, leading=13, alignment=align, textColor=on_band or colors.HexColor("#4b5563")),
+        "title": ParagraphStyle("title", parent=base, fontName=_bold_font(style.pdf_font), fontSize=11, leading=14, spaceBefore=10, textColor=colors.HexColor(accent)),
+        "item": ParagraphStyle("item", parent=base, fontName=_bold_font(style.pdf_font), spaceBefore=4),
+        "meta": ParagraphStyle("meta", parent=base, fontSize=10, leading=13, textColor=colors.HexColor("#4b5563")),
+    }
+
+
+def _pdf_blocks(blocks: List[TextBlock], styles: Dict[str, ParagraphStyle]) -> list:
+    flowables: list = []
+    bullets: List[ListItem] = []
+
+    def close_list() -> None:
+        if bullets:
+            flowables.append(ListFlowable(list(bullets), bulletType="bullet", start="•", leftIndent=12, bulletFontSize=8))
+            bullets.clear()
+
+    for block in blocks:
+        paragraph = Paragraph(_markup(block.runs), styles["body"])
+        if block.bullet:
+            bullets.append(ListItem(paragraph, leftIndent=12))
+        else:
+            close_list()
+            flowables.append(paragraph)
+    close_list()
+    return flowables
+
+
+def _pdf_header(doc: ResumeDocument, style: NativeStyle, styles: Dict[str, ParagraphStyle], accent: str, width: float) -> list:
+    parts = [Paragraph(escape(doc.name), styles["name"])]
+    if doc.role:
+        parts.append(Paragraph(escape(doc.role), styles["role"]))
+    if doc.contact:
+        parts.append(Paragraph(escape("  •  ".join(doc.contact)), styles["contact"]))
+    if not style.header_band:
+        return parts + [Spacer(1, 4), HRFlowable(width="100%", thickness=style.rule_weight, color=colors.HexColor(accent), spaceAfter=4)]
+    band = Table([[p] for p in parts], colWidths=[width])
+    band.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor(accent)),
+        ("LEFTPADDING", (0, 0), (-1, -1), 12),
+        ("TOPPADDING", (0, 0), (0, 0), 12),
+        ("BOTTOMPADDING", (0, -1), (-1, -1), 12),
+    ]))
+    return [band, Spacer(1, 6)]
+
+
+def render_pdf(template: str, data: Dict[str, Any]) -> bytes:
+    doc = build_document(data)
+    for text in _strings(doc):
+        try:
+            text.encode("cp1252")
+        except UnicodeEncodeError:
+            # The base fonts only cover WinAnsi; anything else would come out as boxes
+            raise NativeRenderUnsupported("Text outside the PDF base font character set")
+    style = _style(template)
+    accent = _accent(template, data)
+    styles = _pdf_styles(style, accent)
+    buf = io.BytesIO()
+    pdf = SimpleDocTemplate(buf, pagesize=A4, leftMargin=16 * mm, rightMargin=16 * mm, topMargin=14 * mm, bottomMargin=14 * mm, title=doc.name, author=doc.name)
+    story = _pdf_header(doc, style, styles, accent, pdf.width)
+    for section in doc.sections:
+        title = section.title.upper() if style.upper_titles else section.title
+        # Held back until it can be kept on a page with the first thing under it
+        heading = [Paragraph(escape(title), styles["title"]), HRFlowable(width="100%", thickness=0.5, color=colors.HexColor("#d1d5db"), spaceAfter=4)]
+        groups: List[Tuple[list, list]] = []
+        lead = _pdf_blocks(section.body, styles)
+        if section.inline:
+            lead.append(Paragraph(escape("  •  ".join(section.inline)), styles["body"]))
+        if lead:
+            groups.append((lead[:1], lead[1:]))
+        for entry in section.entries:
+            line = escape(entry.title) + (f'<font name="{style.pdf_font}"> — {escape(entry.subtitle)}</font>' if entry.subtitle else "")
+            head = [Paragraph(line, styles["item"])]
+            meta = _join([*entry.meta, entry.dates], "  |  ")
+            if meta:
+                head.append(Paragraph(escape(meta), styles["meta"]))
+            rest = _pdf_blocks(entry.body, styles)
+            groups.append((head + rest[:1], rest[1:]))
+        for keep, flow in groups:
+            # KeepTogether does not nest, so each group is flattened into the story here
+            story.append(KeepTogether(heading + keep))
+            story += flow
+            heading = []
+    pdf.build(story)
+    return buf.getvalue()
+
+
+# DOCX
+
+def _docx_color(hex_color: str) -> RGBColor:
+    return RGBColor.from_string(hex_color.lstrip("#").upper())
+
+
+def _docx_runs(paragraph, runs: List[Run]) -> None:
+    for text, bold, italic in runs:
+        run = paragraph.add_run(text)
+        run.bold = bold or None
+        run.italic = italic or None
+
+
+def _docx_blocks(document, blocks: List[TextBlock]) -> None:
+    for block in blocks:
+        paragraph = document.add_paragraph(style="List Bullet" if block.bullet else None)
+        _docx_runs(paragraph, block.runs)
+
+
+def render_docx(template: str, data: Dict[str, Any]) -> bytes:
+    doc = build_document(data)
+    style = _style(template)
+    accent = _docx_color(_accent(template, data))
+    muted = _docx_color("#4b5563")
+    align = WD_ALIGN_PARAGRAPH.CENTER if style.header_align == "center" else WD_ALIGN_PARAGRAPH.LEFT
+
+    document = Document()
+    normal = document.styles["Normal"]
+    normal.font.name = style.docx_font
+    normal.font.size = Pt(10.5)
+    document.core_properties.title = doc.name
+    document.core_properties.author = doc.name
+
+    name = document.add_paragraph()
+    name.alignment = align
+    run = name.add_run(doc.name)
+    run.bold = True
+    run.font.size = Pt(20)
+    run.font.color.rgb = accent
+    for text, size in ((doc.role, 12), ("  •  ".join(doc.contact), 10)):
+        if text:
+            paragraph = document.add_paragraph()
+            paragraph.alignment = align
+            run = paragraph.add_run(text)
+            run.font.size = Pt(size)
+            run.font.color.rgb = muted
+
+    for section in doc.sections:
+        heading = document.add_paragraph()
+        heading.paragraph_format.space_before = Pt(10)
+        run = heading.add_run(section.title.upper() if style.upper_titles else section.title)
+        run.bold = True
+        run.font.size = Pt(11)
+        run.font.color.rgb = accent
+        _docx_blocks(document, section.body)
+        if section.inline:
+            document.add_paragraph("  •  ".join(section.inline))
+        for entry in section.entries:
+            title = document.add_paragraph()
+            title.paragraph_format.space_before = Pt(4)
+            title.paragraph_format.keep_with_next = True
+            title.add_run(entry.title).bold = True
+            if entry.subtitle:
+                title.add_run(f" — {entry.subtitle}")
+            meta = _join([*entry.meta, entry.dates], "  |  ")
+            if meta:
+                run = document.add_paragraph().add_run(meta)
+                run.font.size = Pt(10)
+                run.font.color.rgb = muted
+            _docx_blocks(document, entry.body)
+
+    buf = io.BytesIO()
+    document.save(buf)
+    return buf.getvalue()
@@ -0,0 +1,173 @@
+import asyncio
+import json
+import re
+import time
+import zipfile
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from ..config import get_settings
+from .browser_pool import BrowserPool, get_browser_pool
+from .pdf_export import export_pdf_bytes, resolve_render_mode
+
+MANIFEST_NAME = "manifest.json"
+
+
+class _ZipSink:
+    """Write-only target for ZipFile that hands the written bytes back in chunks.
+
+    It has no seek(), so ZipFile writes each member followed by a data descriptor
+    and never rewinds; the archive can be sent as it is produced.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks = []
+        return out
+
+
+def _slug(value: Any) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "-", str(value or "")).strip("-").lower()[:48]
+
+
+def _filename(index: int, item: Dict[str, Any], template: str) -> str:
+    # The index prefix keeps names unique and in request order
+    requested = _slug(re.sub(r"\.pdf$", "", str(item.get("filename") or ""), flags=re.IGNORECASE))
+    if not requested:
+        personal = item["data"].get("personalDetails")
+        personal = personal if isinstance(personal, dict) else {}
+        requested = "-".join(p for p in (_slug(personal.get("fullName")) or "cv", _slug(template)) if p)
+    return f"{index + 1:03d}-{requested}.pdf"
+
+
+def _plan_item(index: int, item: Any) -> Tuple[str, Dict[str, Any], str, str, Optional[str]]:
+    if not isinstance(item, dict):
+        return "", {}, "", "", "Item must be an object"
+    template, data = item.get("template"), item.get("data")
+    if not isinstance(template, str) or not template or not data:
+        return str(template or ""), {}, "", "", "Missing template or data"
+    if not isinstance(data, dict):
+        return template, {}, "", "", "'data' must be an object"
+    try:
+        mode = resolve_render_mode(template, item.get("mode"))
+    except ValueError as exc:
+        return template, {}, "", "", str(exc)
+    return template, data, mode, _filename(index, item, template), None
+
+
+def _plan(index: int, item: Any) -> Tuple[str, Dict[str, Any], str, str, Optional[str]]:
+    """(template, data, mode, filename, error) for one requested export."""
+    try:
+        return _plan_item(index, item)
+    except Exception as exc:
+        # A malformed item fails on its own; it must not take the archive down with it
+        logger.warning("Bulk export item {} is invalid: {}", index, str(exc))
+        template = item.get("template") if isinstance(item, dict) else None
+        return template if isinstance(template, str) else "", {}, "", "", "Invalid item"
+
+
+@asynccontextmanager
+async def _batch_browser(needed: bool, pages: int) -> AsyncIterator[Optional[BrowserPool]]:
+    pool = get_browser_pool()
+    if not needed or (pool is not None and pool.running):
+        yield pool
+        return
+    # No shared pool in this process: one browser for the whole batch, not one per PDF
+    settings = get_settings()
+    pool = BrowserPool(max_concurrent_renders=pages, recycle_after=settings.PDF_BROWSER_RECYCLE_AFTER, watchdog_interval=settings.PDF_BROWSER_WATCHDOG_SECONDS)
+    try:
+        await pool.start()
+    except Exception as exc:
+        logger.warning("Bulk export could not start a browser, launching per item: {}", str(exc))
+        yield None
+        return
+    try:
+        yield pool
+    finally:
+        await pool.stop()
+
+
+async def stream_pdf_zip(items: List[Any], concurrency: int) -> AsyncIterator[bytes]:
+    """Render ``items`` and yield a ZIP archive of the PDFs as each one finishes.
+
+    At most ``concurrency`` renders run at once, and a finished PDF is held only until it
+    is written out, so memory stays bounded by the batch's parallelism rather than its
+    size. Failed items are skipped in the archive and described in manifest.json, which
+    is written last with one entry per requested item in request order.
+    """
+    concurrency = max(1, concurrency)
+    plans = [_plan(index, item) for index, item in enumerate(items)]
+    sink = _ZipSink()
+    archive = zipfile.ZipFile(sink, mode="w")
+    manifest: List[Dict[str, Any]] = [{} for _ in plans]
+    # Bounded, so renders pause while the client is slow to read
+    results: "asyncio.Queue[Tuple[int, Optional[bytes], Optional[str], float]]" = asyncio.Queue(maxsize=concurrency)
+    limiter = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+    needs_browser = any(mode in ("client", "server") for _, _, mode, _, error in plans if error is None)
+
+    async with _batch_browser(needs_browser, concurrency) as pool:
+
+        async def render(index: int) -> None:
+            template, data, mode, _, error = plans[index]
+            if error is not None:
+                await results.put((index, None, error, 0.0))
+                return
+            async with limiter:
+                start = time.perf_counter()
+                try:
+                    _, pdf_bytes = await export_pdf_bytes(template, data, mode, pool=pool)
+                except Exception as exc:
+                    logger.warning("Bulk export item {} ({}) failed: {}", index, template, str(exc))
+                    pdf_bytes, error = None, "Failed to generate PDF"
+                await results.put((index, pdf_bytes, error, time.perf_counter() - start))
+
+        tasks = [asyncio.create_task(render(index)) for index in range(len(plans))]
+        try:
+            for _ in plans:
+                index, pdf_bytes, error, elapsed = await results.get()
+                template, _, mode, filename, _ = plans[index]
+                entry: Dict[str, Any] = {"index": index, "template": template, "mode": mode, "status": "failed" if error else "done"}
+                if pdf_bytes is not None:
+                    info = zipfile.ZipInfo(filename, date_time=time.localtime()[:6])
+                    # PDF content streams are already compressed
+                    info.compress_type = zipfile.ZIP_STORED
+                    archive.writestr(info, pdf_bytes)
+                    entry.update(file=filename, bytes=len(pdf_bytes), render_ms=round(elapsed * 1000, 1))
+                    yield sink.drain()
+                else:
+                    entry["error"] = error
+                manifest[index] = entry
+            failed = sum(1 for entry in manifest if entry["status"] == "failed")
+            summary = {
+                "items": len(plans),
+                "done": len(plans) - failed,
+                "failed": failed,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                "results": manifest,
+            }
+            archive.writestr(MANIFEST_NAME, json.dumps(summary, indent=2), compress_type=zipfile.ZIP_DEFLATED)
+            archive.close()
+            yield sink.drain()
+        finally:
+            # The client went away or the batch finished: nothing may keep rendering
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
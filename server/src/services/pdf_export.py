@@ -1,39 +1,181 @@
+import asyncio
 from fastapi import HTTPException
-from typing import Any, Dict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 import time
-from playwright.async_api import async_playwright
+from uuid import uuid4
+from loguru import logger
+from playwright.async_api import Page, Route, TimeoutError as PlaywrightTimeoutError, async_playwright
 
 from ..config import get_settings
+from .browser_pool import CHROMIUM_ARGS, BrowserPool, get_browser_pool
+from .cache import LRUCache, make_cache_key
+from .html_render import render_resume_html, supports_server_render
+from .metrics import PDF_IN_FLIGHT, PDF_STAGE
+from .native_render import NativeRenderUnsupported, render_docx, render_pdf, supports_native_render
+from .preview_assets import intercept_preview_request
+from .token_store import get_token_store
 
-_STORE: Dict[str, Dict[str, Any]] = {}
+RENDER_MODES = ("client", "server", "native")
 
-def put_token(token: str, data: Dict[str, Any]) -> None:
+async def put_token(token: str, data: Dict[str, Any]) -> None:
     settings = get_settings()
-    _STORE[token] = {
-        "data": data,
-        "expires": time.time() + int(settings.TOKEN_TTL_SECONDS),
-    }
+    await get_token_store().aput(token, data, int(settings.TOKEN_TTL_SECONDS))
 
-def get_token(token: str) -> Dict[str, Any]:
-    entry = _STORE.get(token)
+async def get_token(token: str) -> Dict[str, Any]:
+    entry = await get_token_store().aget(token)
     if not entry:
         raise HTTPException(status_code=404, detail="Not found")
-    if time.time() > entry["expires"]:
-        _STORE.pop(token, None)
+    data, expires = entry
+    if time.time() > expires:
         raise HTTPException(status_code=410, detail="Expired")
-    return entry["data"]
-
-async def generate_pdf_from_preview(preview_url: str) -> bytes:
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(args=[
-            "--no-sandbox",
-            "--disable-setuid-sandbox",
-            "--disable-dev-shm-usage",
-        ])
-        context = await browser.new_context()
-        page = await context.new_page()
-        await page.emulate_media(media="screen")
-        await page.goto(preview_url, wait_until="networkidle")
+    return data
+
+_RENDER_CACHE: Optional[LRUCache] = None
+
+def get_render_cache() -> Optional[LRUCache]:
+    global _RENDER_CACHE
+    settings = get_settings()
+    if _RENDER_CACHE is None and settings.PDF_RENDER_CACHE_MAX_BYTES > 0:
+        _RENDER_CACHE = LRUCache(
+            max_bytes=settings.PDF_RENDER_CACHE_MAX_BYTES,
+            ttl_seconds=settings.PDF_RENDER_CACHE_TTL_SECONDS,
+            disk_dir=settings.PDF_RENDER_CACHE_DIR or None,
+            max_disk_bytes=settings.PDF_RENDER_CACHE_MAX_DISK_BYTES,
+            encode=bytes,
+            decode=bytes,
+        )
+    return _RENDER_CACHE
+
+def resolve_render_mode(template: str, mode: Optional[str] = None) -> str:
+    settings = get_settings()
+    mode = (mode or settings.PDF_TEMPLATE_RENDER_MODES.get(template) or settings.PDF_RENDER_MODE).lower()
+    if mode not in RENDER_MODES:
+        raise ValueError(f"Unknown render mode: {mode}")
+    # Templates the native engine has no layout for still render in Chromium
+    if mode == "native" and not supports_native_render(template):
+        mode = "server"
+    # Templates without a server-side port still go through the client preview
+    if mode == "server" and not supports_server_render(template):
+        return "client"
+    return mode
+
+def render_cache_key(template: str, data: Dict[str, Any], mode: str = "client") -> str:
+    # Bump PDF_RENDERER_VERSION whenever the preview templates change so stale PDFs are not served
+    settings = get_settings()
+    return make_cache_key(template, data, mode, settings.APP_VERSION, settings.PDF_RENDERER_VERSION)
+
+async def export_pdf_bytes(template: str, data: Dict[str, Any], mode: str = "client", pool: Optional[BrowserPool] = None) -> Tuple[str, bytes]:
+    key = render_cache_key(template, data, mode)
+    cache = get_render_cache()
+    cached = await cache.aget(key) if cache is not None else None
+    if cached is not None:
+        return key, cached
+
+    if mode == "native":
+        pdf_bytes = await generate_pdf_native(template, data, pool)
+    elif mode == "server":
+        pdf_bytes = await generate_pdf_from_html(render_resume_html(template, data), pool)
+    else:
+        pdf_bytes = await _render_client_preview(template, data, pool)
+    if cache is not None:
+        await cache.aset(key, pdf_bytes)
+    return key, pdf_bytes
+
+async def export_docx_bytes(template: str, data: Dict[str, Any]) -> Tuple[str, bytes]:
+    key = render_cache_key(template, data, "docx")
+    cache = get_render_cache()
+    cached = await cache.aget(key) if cache is not None else None
+    if cached is not None:
+        return key, cached
+    with PDF_STAGE.time(mode="docx", stage="total"):
+        docx_bytes = await asyncio.to_thread(render_docx, template, data)
+    if cache is not None:
+        await cache.aset(key, docx_bytes)
+    return key, docx_bytes
+
+async def generate_pdf_native(template: str, data: Dict[str, Any], pool: Optional[BrowserPool] = None) -> bytes:
+    try:
+        with PDF_IN_FLIGHT.track(), PDF_STAGE.time(mode="native", stage="total"):
+            # Layout is CPU-bound; keep it off the event loop
+            return await asyncio.to_thread(render_pdf, template, data)
+    except NativeRenderUnsupported as exc:
+        logger.info("Native render unavailable for {}: {}; using Chromium", template, str(exc))
+    if supports_server_render(template):
+        return await generate_pdf_from_html(render_resume_html(template, data), pool)
+    return await _render_client_preview(template, data, pool)
+
+async def _render_client_preview(template: str, data: Dict[str, Any], pool: Optional[BrowserPool] = None) -> bytes:
+    token = uuid4().hex
+    await put_token(token, data)
+    settings = get_settings()
+    preview_url = f"{settings.CLIENT_BASE_URL}/preview?template={template}&token={token}"
+    return await generate_pdf_from_preview(preview_url, pool)
+
+async def _with_page(mode: str, render: Callable[[Page], Awaitable[bytes]], pool: Optional[BrowserPool] = None, **context_options: Any) -> bytes:
+    start = time.perf_counter()
+    with PDF_IN_FLIGHT.track(), PDF_STAGE.time(mode=mode, stage="total"):
+        pool = pool or get_browser_pool()
+        if pool is not None and pool.running:
+            # Acquiring includes waiting for a render slot, so pool saturation shows up here
+            async with pool.page(**context_options) as page:
+                PDF_STAGE.observe(time.perf_counter() - start, mode=mode, stage="browser_acquire")
+                return await render(page)
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(args=CHROMIUM_ARGS)
+            context = await browser.new_context(**context_options)
+            page = await context.new_page()
+            PDF_STAGE.observe(time.perf_counter() - start, mode=mode, stage="browser_acquire")
+            pdf_bytes = await render(page)
+            await context.close()
+            await browser.close()
+            return pdf_bytes
+
+async def generate_pdf_from_preview(preview_url: str, pool: Optional[BrowserPool] = None) -> bytes:
+    return await _with_page("client", lambda page: _render_pdf(page, preview_url), pool)
+
+async def generate_pdf_from_html(html: str, pool: Optional[BrowserPool] = None) -> bytes:
+    # Self-contained markup: no scripts to run and nothing to fetch
+    return await _with_page("server", lambda page: _render_html_pdf(page, html), pool, java_script_enabled=False)
+
+async def _block_request(route: Route) -> None:
+    await route.abort()
+
+async def _render_html_pdf(page: Page, html: str) -> bytes:
+    await page.route("**/*", _block_request)
+    await page.emulate_media(media="print")
+    with PDF_STAGE.time(mode="server", stage="set_content"):
+        await page.set_content(html, wait_until="load")
+    with PDF_STAGE.time(mode="server", stage="pdf"):
+        return await page.pdf(format="A4", print_background=True, prefer_css_page_size=True)
+
+async def _wait_until_ready(page: Page) -> None:
+    # PreviewPage sets data-cv-ready once the paginated pages are painted; this returns
+    # as soon as that happens instead of waiting out a quiet network
+    settings = get_settings()
+    timeout_ms = settings.PDF_READY_TIMEOUT_SECONDS * 1000
+    try:
+        await page.wait_for_selector("html[data-cv-ready]", state="attached", timeout=timeout_ms)
+    except PlaywrightTimeoutError:
+        # Older client builds never set the attribute; give them the old network idle wait
+        logger.warning("Preview did not signal readiness within {}s, waiting for network idle", settings.PDF_READY_TIMEOUT_SECONDS)
+        await page.wait_for_load_state("networkidle", timeout=timeout_ms)
+        return
+    if await page.get_attribute("html", "data-cv-ready") == "error":
+        raise RuntimeError("Preview page failed to load the CV data")
+
+async def _render_pdf(page: Page, preview_url: str) -> bytes:
+    settings = get_settings()
+    await page.route("**/*", intercept_preview_request)
+    await page.emulate_media(media="screen")
+    if settings.PDF_READY_SIGNAL:
+        with PDF_STAGE.time(mode="client", stage="goto"):
+            await page.goto(preview_url, wait_until="domcontentloaded")
+        with PDF_STAGE.time(mode="client", stage="ready"):
+            await _wait_until_ready(page)
+    else:
+        with PDF_STAGE.time(mode="client", stage="goto"):
+            await page.goto(preview_url, wait_until="networkidle")
+    with PDF_STAGE.time(mode="client", stage="fonts"):
         await page.evaluate(
             """
             () => new Promise((resolve) => {
@@ -47,12 +189,11 @@ async def generate_pdf_from_preview(preview_url: str) -> bytes:
             })
             """
         )
+    with PDF_STAGE.time(mode="client", stage="pdf"):
         pdf_bytes = await page.pdf(
             format="A4",
             print_background=True,
             prefer_css_page_size=True,
             margin={"top": "0px"},
         )
-        await context.close()
-        await browser.close()
-        return pdf_bytes
+    return pdf_bytes
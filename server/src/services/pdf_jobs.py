@@ -0,0 +1,183 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from loguru import logger
+
+from ..config import get_settings
+from .pdf_export import export_pdf_bytes, get_render_cache, render_cache_key
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class PdfJob:
+    def __init__(self, template: str, data: Dict[str, Any], mode: str = "client"):
+        self.id = uuid4().hex
+        self.template = template
+        self.mode = mode
+        self.data: Optional[Dict[str, Any]] = data
+        self.status = QUEUED
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        self.key = render_cache_key(template, data, mode)
+        self.result: Optional[bytes] = None
+        self.error: Optional[str] = None
+        self._done = asyncio.Event()
+
+    def complete(self, result: bytes) -> None:
+        self.result = result
+        self.status = DONE
+        self._finish()
+
+    def fail(self, error: str) -> None:
+        self.error = error
+        self.status = FAILED
+        self._finish()
+
+    def _finish(self) -> None:
+        self.data = None
+        self.finished = time.time()
+        self._done.set()
+
+    async def wait(self, timeout: Optional[float]) -> bool:
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._done.is_set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "template": self.template,
+            "mode": self.mode,
+            "created": self.created,
+            "finished": self.finished,
+            "error": self.error,
+        }
+
+
+class PdfJobQueue:
+    """Bounded queue of PDF exports rendered by a fixed set of background workers."""
+
+    def __init__(self, workers: int = 4, max_queue_depth: int = 64, result_ttl: float = 300.0):
+        self.workers = max(1, workers)
+        self.max_queue_depth = max(1, max_queue_depth)
+        self.result_ttl = result_ttl
+        self._queue: "asyncio.Queue[PdfJob]" = asyncio.Queue(maxsize=self.max_queue_depth)
+        self._jobs: Dict[str, PdfJob] = {}
+        # Finished jobs in the order they finished, so expiry is a scan from the front;
+        # jobs finish out of submission order, so _jobs cannot be swept that way
+        self._finished: "OrderedDict[str, PdfJob]" = OrderedDict()
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._work(i)) for i in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for job in self._jobs.values():
+            if job.status in (QUEUED, RUNNING):
+                job.fail("Server shutting down")
+                self._finished[job.id] = job
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    async def submit(self, template: str, data: Dict[str, Any], mode: str = "client") -> PdfJob:
+        # Loop-owned state (the asyncio queue, job events, the job maps): call from the event loop only
+        self._sweep()
+        job = PdfJob(template, data, mode)
+        cache = get_render_cache()
+        cached = await cache.aget(job.key) if cache is not None else None
+        if cached is not None:
+            job.complete(cached)
+            self._finished[job.id] = job
+        else:
+            try:
+                self._queue.put_nowait(job)
+            except asyncio.QueueFull:
+                raise QueueFullError(f"PDF export queue is full ({self.max_queue_depth} jobs)")
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[PdfJob]:
+        self._sweep()
+        return self._jobs.get(job_id)
+
+    def _sweep(self) -> None:
+        now = time.time()
+        while self._finished:
+            oldest = next(iter(self._finished.values()))
+            if now - oldest.finished < self.result_ttl:
+                break
+            self._finished.popitem(last=False)
+            self._jobs.pop(oldest.id, None)
+
+    async def _work(self, worker_id: int) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                job.status = RUNNING
+                _, pdf_bytes = await export_pdf_bytes(job.template, job.data, job.mode)
+                job.complete(pdf_bytes)
+            except asyncio.CancelledError:
+                job.fail("Cancelled")
+                raise
+            except ModuleNotFoundError:
+                job.fail("Playwright is not installed")
+            except Exception as exc:
+                logger.exception("PDF job {} failed on worker {}: {}", job.id, worker_id, str(exc))
+                job.fail("Failed to generate PDF")
+            finally:
+                self._finished[job.id] = job
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for job in self._jobs.values():
+            counts[job.status] += 1
+        return {"running": self.running, "workers": self.workers, "max_queue_depth": self.max_queue_depth, "depth": self.depth(), "jobs": counts}
+
+
+_QUEUE: Optional[PdfJobQueue] = None
+
+async def start_pdf_job_queue() -> None:
+    global _QUEUE
+    if _QUEUE is not None:
+        return
+    settings = get_settings()
+    _QUEUE = PdfJobQueue(
+        workers=settings.PDF_JOB_WORKERS,
+        max_queue_depth=settings.PDF_JOB_MAX_QUEUE,
+        result_ttl=settings.PDF_JOB_RESULT_TTL_SECONDS,
+    )
+    await _QUEUE.start()
+
+async def stop_pdf_job_queue() -> None:
+    global _QUEUE
+    if _QUEUE is not None:
+        await _QUEUE.stop()
+        _QUEUE = None
+
+def get_pdf_job_queue() -> Optional[PdfJobQueue]:
+    return _QUEUE
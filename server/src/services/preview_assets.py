@@ -0,0 +1,115 @@
+import json
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from loguru import logger
+from playwright.async_api import Route
+
+from ..config import get_settings
+from .cache import LRUCache
+
+# Never needed to lay out a CV: trackers, error reporters and dev-server plumbing
+BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "segment.io",
+    "segment.com",
+    "hotjar.com",
+    "plausible.io",
+    "posthog.com",
+    "sentry.io",
+    "clarity.ms",
+    "facebook.net",
+)
+BLOCKED_RESOURCE_TYPES = ("media", "websocket", "eventsource", "manifest", "texttrack", "beacon", "ping")
+CACHEABLE_RESOURCE_TYPES = ("script", "stylesheet", "font", "image")
+FONT_HOSTS = ("fonts.googleapis.com", "fonts.gstatic.com")
+# Set by the browser's fetch of the body, which route.fetch() has already decoded
+_DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+_ASSET_CACHE: Optional[LRUCache] = None
+
+
+def _pack(status: int, headers: Dict[str, str], body: bytes) -> bytes:
+    return json.dumps({"status": status, "headers": headers}).encode("utf-8") + b"\n" + body
+
+
+def _unpack(raw: bytes) -> Tuple[int, Dict[str, str], bytes]:
+    head, _, body = raw.partition(b"\n")
+    meta = json.loads(head)
+    return meta["status"], meta["headers"], body
+
+
+def get_asset_cache() -> Optional[LRUCache]:
+    global _ASSET_CACHE
+    settings = get_settings()
+    if _ASSET_CACHE is None and settings.PDF_ASSET_CACHE_MAX_BYTES > 0:
+        _ASSET_CACHE = LRUCache(
+            max_bytes=settings.PDF_ASSET_CACHE_MAX_BYTES,
+            ttl_seconds=settings.PDF_ASSET_CACHE_TTL_SECONDS,
+            encode=bytes,
+            decode=bytes,
+        )
+    return _ASSET_CACHE
+
+
+def _host_matches(host: str, suffixes) -> bool:
+    return any(host == s or host.endswith("." + s) for s in suffixes)
+
+
+def should_block(url: str, resource_type: str) -> bool:
+    settings = get_settings()
+    parts = urlsplit(url)
+    if resource_type in BLOCKED_RESOURCE_TYPES or parts.path.endswith(".map"):
+        return True
+    if _host_matches(parts.hostname or "", BLOCKED_HOSTS):
+        return True
+    return any(pattern and pattern in url for pattern in settings.PDF_BLOCKED_URL_PATTERNS.split(","))
+
+
+def is_cacheable(url: str, resource_type: str) -> bool:
+    if resource_type not in CACHEABLE_RESOURCE_TYPES:
+        return False
+    parts = urlsplit(url)
+    client = urlsplit(get_settings().CLIENT_BASE_URL)
+    return parts.netloc == client.netloc or _host_matches(parts.hostname or "", FONT_HOSTS)
+
+
+def _storable(status: int, headers: Dict[str, str]) -> bool:
+    cache_control = headers.get("cache-control", "").lower()
+    return status == 200 and not any(d in cache_control for d in ("no-store", "no-cache", "private"))
+
+
+async def intercept_preview_request(route: Route) -> None:
+    """Drop what the preview does not need and serve template assets and fonts from memory.
+
+    Only GET requests for scripts, stylesheets, fonts and images from the client or the
+    font CDN are cached, and only when the response allows it, so dev-server modules
+    (served no-cache) are always fetched fresh while hashed build assets are not.
+    """
+    request = route.request
+    if should_block(request.url, request.resource_type):
+        await route.abort()
+        return
+    cache = get_asset_cache()
+    if cache is None or request.method != "GET" or not is_cacheable(request.url, request.resource_type):
+        await route.continue_()
+        return
+
+    cached = cache.get(request.url)
+    if cached is not None:
+        status, headers, body = _unpack(cached)
+        await route.fulfill(status=status, headers=headers, body=body)
+        return
+    try:
+        response = await route.fetch()
+        body = await response.body()
+    except Exception as exc:
+        logger.warning("Preview asset fetch failed for {}: {}", request.url, str(exc))
+        await route.abort()
+        return
+    headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+    if _storable(response.status, headers):
+        cache.set(request.url, _pack(response.status, headers, body))
+    await route.fulfill(status=response.status, headers=headers, body=body)
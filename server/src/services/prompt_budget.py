@@ -0,0 +1,143 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .heuristics import HeuristicScorer, html_to_lines
+
+# Token budgets for section text; Experience gets the most room since it carries most of the signal
+DEFAULT_SECTION_BUDGETS: Dict[str, int] = {
+    "Summary": 300,
+    "Experience": 1500,
+    "Education": 400,
+    "Skills": 300,
+    "Projects": 600,
+}
+DEFAULT_BUDGET = 300
+OMITTED = "…"
+
+_PIECES = re.compile(r"[^\W\d_]+|\d|[^\w\s]|_")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate SentencePiece/BPE token count without loading a tokenizer.
+
+    Words cost one token plus one per 7 characters, digits and punctuation one each
+    (Gemma and Llama split numbers into single digits). Errs on the high side.
+    """
+    total = 0
+    for piece in _PIECES.findall(text or ""):
+        total += 1 + len(piece) // 7 if piece[0].isalpha() else 1
+    return total
+
+
+def _line_priority(line: str) -> int:
+    words = line.split()
+    priority = 2 if HeuristicScorer.is_quantified(line) else 0
+    if words and HeuristicScorer.is_action_verb(words[0]):
+        priority += 1
+    return priority
+
+
+def _truncate(text: str, budget: int) -> str:
+    words = text.split(" ")
+    kept: List[str] = []
+    used = estimate_tokens(OMITTED)
+    for word in words:
+        cost = estimate_tokens(word)
+        if used + cost > budget:
+            break
+        kept.append(word)
+        used += cost
+    return " ".join(kept).rstrip(",;:") + OMITTED
+
+
+class PromptBudget:
+    """Fits section text into per-section token budgets.
+
+    Rich-text HTML is flattened to plain bullet lines first. Oversized sections are
+    summarised extractively: entry headers are kept, bullets with numbers and action
+    verbs win over the rest, the earliest (most recent) entries win over later ones,
+    and whatever still does not fit is cut with an ellipsis.
+    """
+
+    def __init__(self, section_budgets: Optional[Dict[str, int]] = None, default_budget: int = DEFAULT_BUDGET, max_resume_tokens: int = 3000):
+        self.section_budgets = {**DEFAULT_SECTION_BUDGETS, **(section_budgets or {})}
+        self.default_budget = max(1, default_budget)
+        self.max_resume_tokens = max(1, max_resume_tokens)
+
+    def budget_for(self, name: str) -> int:
+        return self.section_budgets.get(name, self.default_budget)
+
+    @staticmethod
+    def normalize(text: str) -> List[Tuple[str, List[str]]]:
+        # (header, body lines) per entry; single-line sections keep their text as the header
+        entries: List[Tuple[str, List[str]]] = []
+        for block in (text or "").split("\n\n"):
+            lines = html_to_lines(block)
+            if lines:
+                entries.append((lines[0], [f"- {line.lstrip('•·-* ')}" for line in lines[1:]]))
+        return entries
+
+    @staticmethod
+    def _render(entries: List[Tuple[str, List[str]]]) -> str:
+        return "\n\n".join("\n".join([header, *body]) for header, body in entries)
+
+    def compact_section(self, name: str, text: str, budget: Optional[int] = None) -> Tuple[str, bool]:
+        budget = budget or self.budget_for(name)
+        entries = self.normalize(text)
+        rendered = self._render(entries)
+        if estimate_tokens(rendered) <= budget:
+            return rendered, False
+
+        # Headers first, newest entries first, until the headers alone fill the budget
+        used = 0
+        kept: List[int] = []
+        for index, (header, _) in enumerate(entries):
+            cost = estimate_tokens(header) + 2
+            if used + cost > budget and kept:
+                break
+            kept.append(index)
+            used += cost
+        # Then body lines by priority; ties go to earlier lines, then to more recent entries,
+        # so every entry keeps its best bullets before any entry keeps its weaker ones
+        candidates = sorted(
+            ((-_line_priority(line), pos, index) for index in kept for pos, line in enumerate(entries[index][1])),
+        )
+        chosen = set()
+        for _, pos, index in candidates:
+            cost = estimate_tokens(entries[index][1][pos]) + 1
+            if used + cost <= budget:
+                chosen.add((index, pos))
+                used += cost
+        compacted: List[Tuple[str, List[str]]] = []
+        for index in kept:
+            header, body = entries[index]
+            lines = [line for pos, line in enumerate(body) if (index, pos) in chosen]
+            if len(lines) < len(body):
+                lines.append(f"- {OMITTED}")
+            compacted.append((header, lines))
+        rendered = self._render(compacted)
+        if len(kept) < len(entries):
+            rendered += f"\n\n({len(entries) - len(kept)} earlier entries omitted)"
+        if estimate_tokens(rendered) > budget:
+            rendered = _truncate(rendered, budget)
+        return rendered, True
+
+    def compact(self, sections: Dict[str, str], budgets: Optional[Dict[str, int]] = None) -> Tuple[Dict[str, str], List[str]]:
+        compacted: Dict[str, str] = {}
+        trimmed: List[str] = []
+        for name, text in sections.items():
+            budget = (budgets or {}).get(name) or self.budget_for(name)
+            compacted[name], was_trimmed = self.compact_section(name, text, budget)
+            if was_trimmed:
+                trimmed.append(name)
+        return compacted, trimmed
+
+    def fit_resume(self, sections: Dict[str, str]) -> Tuple[Dict[str, str], List[str]]:
+        """Compact every section, then shrink each one proportionally if the whole resume is still too long."""
+        compacted, trimmed = self.compact(sections)
+        sizes = {name: estimate_tokens(text) for name, text in compacted.items()}
+        total = sum(sizes.values())
+        if total <= self.max_resume_tokens:
+            return compacted, trimmed
+        scale = self.max_resume_tokens / total
+        return self.compact(sections, {name: max(1, int(size * scale)) for name, size in sizes.items()})
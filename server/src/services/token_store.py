@@ -0,0 +1,187 @@
+import asyncio
+import json
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Protocol, Tuple
+
+from loguru import logger
+
+from ..config import get_settings
+
+
+class TokenStore(Protocol):
+    def put(self, token: str, data: Dict[str, Any], ttl_seconds: float) -> None:
+        ...
+    def get(self, token: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        ...
+    def sweep(self) -> int:
+        ...
+    async def aput(self, token: str, data: Dict[str, Any], ttl_seconds: float) -> None:
+        ...
+    async def aget(self, token: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        ...
+    async def asweep(self) -> int:
+        ...
+    def close(self) -> None:
+        ...
+
+
+class MemoryTokenStore:
+    """Process-local store. Entries share one TTL, so insertion order is expiry order.
+
+    Loop-owned: async callers use ``aput``/``aget``/``asweep``, which stay on the event loop.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+
+    def put(self, token: str, data: Dict[str, Any], ttl_seconds: float) -> None:
+        self.sweep()
+        self._entries.pop(token, None)
+        self._entries[token] = (data, time.time() + ttl_seconds)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, token: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        return self._entries.get(token)
+
+    def sweep(self) -> int:
+        now = time.time()
+        removed = 0
+        while self._entries:
+            _, expires = next(iter(self._entries.values()))
+            if expires > now:
+                break
+            self._entries.popitem(last=False)
+            removed += 1
+        return removed
+
+    async def aput(self, token: str, data: Dict[str, Any], ttl_seconds: float) -> None:
+        self.put(token, data, ttl_seconds)
+
+    async def aget(self, token: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        return self.get(token)
+
+    async def asweep(self) -> int:
+        return self.sweep()
+
+    def close(self) -> None:
+        self._entries.clear()
+
+
+class SqliteTokenStore:
+    """File-backed store shared by every uvicorn worker on the host.
+
+    Async callers use ``aput``/``aget``/``asweep``, which run the blocking sqlite calls in a
+    worker thread so a busy database never stalls the event loop.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        self.max_entries = max(1, max_entries)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tokens (token TEXT PRIMARY KEY, data TEXT NOT NULL, expires REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tokens_expires ON tokens (expires)")
+
+    def _trim(self) -> int:
+        return self._conn.execute(
+            "DELETE FROM tokens WHERE token IN (SELECT token FROM tokens ORDER BY expires DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+
+    def put(self, token: str, data: Dict[str, Any], ttl_seconds: float) -> None:
+        raw = json.dumps(data)
+        with self._lock:
+            # One transaction, so other workers never see the table above the cap
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO tokens (token, data, expires) VALUES (?, ?, ?)",
+                    (token, raw, time.time() + ttl_seconds),
+                )
+                self._trim()
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def get(self, token: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        with self._lock:
+            row = self._conn.execute("SELECT data, expires FROM tokens WHERE token = ?", (token,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def sweep(self) -> int:
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM tokens WHERE expires <= ?", (time.time(),)).rowcount
+            removed += self._trim()
+        return removed
+
+    async def aput(self, token: str, data: Dict[str, Any], ttl_seconds: float) -> None:
+        await asyncio.to_thread(self.put, token, data, ttl_seconds)
+
+    async def aget(self, token: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        return await asyncio.to_thread(self.get, token)
+
+    async def asweep(self) -> int:
+        return await asyncio.to_thread(self.sweep)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_STORE: Optional[TokenStore] = None
+_SWEEPER: Optional[asyncio.Task] = None
+
+def _build_token_store() -> TokenStore:
+    settings = get_settings()
+    backend = settings.TOKEN_STORE_BACKEND.lower()
+    if backend == "sqlite":
+        path = settings.TOKEN_STORE_PATH or str(Path(tempfile.gettempdir()) / "cvforge-tokens.sqlite3")
+        return SqliteTokenStore(path, max_entries=settings.TOKEN_STORE_MAX_ENTRIES)
+    if backend != "memory":
+        raise ValueError(f"Unknown TOKEN_STORE_BACKEND: {settings.TOKEN_STORE_BACKEND}")
+    return MemoryTokenStore(max_entries=settings.TOKEN_STORE_MAX_ENTRIES)
+
+def get_token_store() -> TokenStore:
+    global _STORE
+    if _STORE is None:
+        _STORE = _build_token_store()
+    return _STORE
+
+async def _sweep_forever(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            removed = await get_token_store().asweep()
+            if removed:
+                logger.debug("Swept {} expired preview tokens", removed)
+        except Exception as exc:
+            logger.warning("Token sweep failed: {}", str(exc))
+
+async def start_token_store() -> None:
+    global _SWEEPER
+    get_token_store()
+    if _SWEEPER is None:
+        _SWEEPER = asyncio.create_task(_sweep_forever(get_settings().TOKEN_SWEEP_INTERVAL_SECONDS))
+
+async def stop_token_store() -> None:
+    global _STORE, _SWEEPER
+    if _SWEEPER is not None:
+        _SWEEPER.cancel()
+        _SWEEPER = None
+    if _STORE is not None:
+        _STORE.close()
+        _STORE = None
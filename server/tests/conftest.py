@@ -0,0 +1,16 @@
+import os
+
+# AppSettings has required fields; tests never read a .env file
+for key, value in {
+    "APP_NAME": "CVForge",
+    "APP_VERSION": "test",
+    "API_PREFIX": "/api",
+    "HOST": "127.0.0.1",
+    "PORT": "8000",
+    "DEBUG": "false",
+    "CORS_ALLOWED_ORIGINS": '["http://localhost:5173"]',
+    "CLIENT_BASE_URL": "http://127.0.0.1:5173",
+    "PDF_BROWSER_POOL_ENABLED": "false",
+    "LLM_WARMUP": "false",
+}.items():
+    os.environ.setdefault(key, value)
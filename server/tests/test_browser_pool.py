@@ -0,0 +1,49 @@
+import asyncio
+
+from src.services.browser_pool import BrowserPool, _BrowserHandle
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.closed = False
+        self.release = asyncio.Event()
+
+    def is_connected(self) -> bool:
+        return not self.closed
+
+    async def close(self) -> None:
+        await self.release.wait()
+        self.closed = True
+
+
+def test_stop_waits_for_closes_started_by_retire():
+    async def scenario():
+        pool = BrowserPool()
+        browser = FakeBrowser()
+        handle = _BrowserHandle(browser)
+        pool._current = handle
+        pool._retire(handle)
+        assert pool._current is None and len(pool._closing) == 1
+        stopping = asyncio.create_task(pool.stop())
+        await asyncio.sleep(0)
+        assert not stopping.done()
+        browser.release.set()
+        await stopping
+        assert browser.closed and not pool._closing
+
+    asyncio.run(scenario())
+
+
+def test_busy_browser_closes_on_last_release():
+    async def scenario():
+        pool = BrowserPool()
+        browser = FakeBrowser()
+        browser.release.set()
+        handle = _BrowserHandle(browser)
+        handle.active = 1
+        pool._retire(handle)
+        assert not pool._closing and pool._retiring == [handle]
+        await pool._release(handle)
+        assert browser.closed and not pool._retiring
+
+    asyncio.run(scenario())
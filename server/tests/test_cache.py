@@ -0,0 +1,92 @@
+import asyncio
+import os
+import time
+
+from src.services.cache import LRUCache, make_cache_key
+
+
+def test_cache_key_ignores_dict_order():
+    assert make_cache_key("m", {"a": 1, "b": 2}) == make_cache_key("m", {"b": 2, "a": 1})
+    assert make_cache_key("m", "x") != make_cache_key("n", "x")
+
+
+def test_evicts_least_recently_used_by_entries_and_bytes():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+    sized = LRUCache(max_bytes=10, encode=bytes, decode=bytes)
+    sized.set("x", b"123456")
+    sized.set("y", b"123456")
+    assert sized.get("x") is None and sized.get("y") == b"123456"
+    assert sized.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    cache = LRUCache(ttl_seconds=10)
+    cache.set("k", "v")
+    now[0] += 9
+    assert cache.get("k") == "v"
+    now[0] += 2
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    LRUCache(max_entries=4, disk_dir=str(tmp_path)).set("k", {"score": 7})
+    fresh = LRUCache(max_entries=4, disk_dir=str(tmp_path))
+    assert fresh.get("k") == {"score": 7}
+    assert fresh.stats()["disk_hits"] == 1
+    # Now in memory: no second disk read
+    assert fresh.get("k") == {"score": 7}
+    assert fresh.stats()["disk_hits"] == 1
+
+
+def test_expired_disk_entries_are_removed(tmp_path):
+    LRUCache(ttl_seconds=60, disk_dir=str(tmp_path)).set("k", 1)
+    path = tmp_path / "k.bin"
+    os.utime(path, (time.time() - 120, time.time() - 120))
+    assert LRUCache(ttl_seconds=60, disk_dir=str(tmp_path)).get("k") is None
+    assert not path.exists()
+
+
+def test_disk_tier_is_bounded(tmp_path):
+    cache = LRUCache(disk_dir=str(tmp_path), max_disk_bytes=25, encode=bytes, decode=bytes)
+    for key in "abcd":
+        cache.set(key, b"x" * 10)
+    assert sorted(p.name for p in tmp_path.glob("*.bin")) == ["c.bin", "d.bin"]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_disk_bound_uses_the_startup_index_not_a_rescan(tmp_path, monkeypatch):
+    for i, key in enumerate("cab"):
+        (tmp_path / f"{key}.bin").write_bytes(b"x" * 10)
+        os.utime(tmp_path / f"{key}.bin", (1000 + i, 1000 + i))
+    cache = LRUCache(disk_dir=str(tmp_path), max_disk_bytes=25, encode=bytes, decode=bytes)
+
+    def no_glob(*args):
+        raise AssertionError("disk tier rescanned on write")
+
+    monkeypatch.setattr(type(tmp_path), "glob", no_glob)
+    cache.set("d", b"x" * 10)
+    monkeypatch.undo()
+    # Files found at startup are evicted oldest mtime first
+    assert sorted(p.name for p in tmp_path.glob("*.bin")) == ["b.bin", "d.bin"]
+
+
+def test_async_access_reads_and_writes_disk_off_the_loop(tmp_path):
+    async def scenario():
+        cache = LRUCache(disk_dir=str(tmp_path), max_disk_bytes=1 << 20)
+        await cache.aset("k", [1, 2])
+        assert (tmp_path / "k.bin").exists()
+        fresh = LRUCache(disk_dir=str(tmp_path))
+        assert await fresh.aget("k") == [1, 2]
+        assert await fresh.aget("missing") is None
+        return fresh.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["disk_hits"] == 1 and stats["misses"] == 1
@@ -0,0 +1,50 @@
+from src.services.heuristics import HeuristicScorer
+
+STRONG = {
+    "Summary": "Backend engineer with eight years building payment and data platforms for fintech companies. "
+    "Led teams of five, cut infrastructure spend and shipped APIs used by millions of customers across Europe.",
+    "Experience": "Senior Engineer — Acme (Jan 2021 – Present)\n"
+    "<ul><li>Led a team of 5 engineers to rebuild the billing service.</li>"
+    "<li>Reduced p99 latency by 40% through query tuning.</li>"
+    "<li>Built a Kafka pipeline handling 2M events a day.</li></ul>\n\n"
+    "Engineer — Beta (Mar 2017 – Dec 2020)\n"
+    "<ul><li>Migrated 30 services to Kubernetes.</li><li>Cut AWS costs by $120k a year.</li></ul>",
+    "Education": "BSc Computer Science — State University (Sep 2013 – Jun 2017)",
+    "Skills": "Python, Go, PostgreSQL, Kafka, Kubernetes, AWS, Terraform, gRPC",
+}
+
+
+def test_scores_have_the_analyzer_shape_and_are_deterministic():
+    first, second = HeuristicScorer.score(STRONG), HeuristicScorer.score(STRONG)
+    assert first == second
+    for key in ("atsCompatibility", "contentQuality", "formattingAnalysis"):
+        assert 0 <= first[key]["score"] <= 100 and first[key]["summary"]
+    assert [s["name"] for s in first["sections"]] == list(STRONG)
+
+
+def test_strong_bullets_score_well():
+    metrics = HeuristicScorer.score(STRONG)["metrics"]
+    assert metrics["action_verb_ratio"] == 1.0
+    assert metrics["quantified_ratio"] == 1.0
+    assert metrics["section_coverage"] == 1.0
+    assert metrics["bullets"] == 5
+
+
+def test_weak_resume_scores_lower_and_says_why():
+    weak = {
+        "Experience": "Engineer — Acme (2021 – 2019)\n<ul><li>responsible for various tasks</li><li>helped the team</li></ul>",
+        "Skills": "Python",
+    }
+    result = HeuristicScorer.score(weak)
+    strong = HeuristicScorer.score(STRONG)
+    assert result["contentQuality"]["score"] < strong["contentQuality"]["score"]
+    assert result["atsCompatibility"]["score"] < strong["atsCompatibility"]["score"]
+    assert any("Missing key sections" in note for note in result["atsCompatibility"]["summary"])
+    assert any("end before they start" in note for note in result["formattingAnalysis"]["summary"])
+
+
+def test_action_verbs_in_any_tense():
+    assert all(HeuristicScorer.is_action_verb(w) for w in ("Led", "lead", "built", "Reduce", "optimized,"))
+    assert not HeuristicScorer.is_action_verb("responsible")
+    assert HeuristicScorer.is_quantified("saved twelve hours") is False
+    assert HeuristicScorer.is_quantified("saved 12 hours") and HeuristicScorer.is_quantified("tripled revenue to $3M")
@@ -0,0 +1,40 @@
+import pytest
+
+from src.services.html_render import SERVER_TEMPLATES, format_month_year, render_resume_html, sanitize_rich_text
+
+DATA = {
+    "personalDetails": {"fullName": "Ann <Lee>", "jobTitle": "Engineer", "email": "ann@example.com"},
+    "sections": [
+        {"id": "skills", "order": 2},
+        {"id": "summary", "order": 0},
+        {"id": "experience", "order": 1},
+    ],
+    "professionalSummary": {"content": "<p>Builds <strong>payments</strong><script>alert(1)</script></p>"},
+    "workExperiences": [{"position": "Engineer", "company": "Acme", "startDate": "2020-01", "endDate": "2023-06", "description": "<p onclick=\"x()\">Led billing</p>"}],
+    "skills": [{"name": "Python", "level": "Expert"}],
+    "theme": {"primaryColor": "#2563eb"},
+}
+
+
+@pytest.mark.parametrize("template", SERVER_TEMPLATES)
+def test_every_server_template_renders_the_cv(template):
+    html = render_resume_html(template, DATA)
+    assert "Ann &lt;Lee&gt;" in html
+    assert "<strong>payments</strong>" in html and "Led billing" in html and "Python" in html
+    assert "#2563eb" in html
+    # Sections follow the editor's order
+    assert html.index('data-section-id="summary"') < html.index('data-section-id="experience"') < html.index('data-section-id="skills"')
+
+
+def test_rich_text_is_sanitized():
+    html = render_resume_html("classic", DATA)
+    assert "<script" not in html and "alert(1)" not in html and "onclick" not in html
+    assert str(sanitize_rich_text('<a href="javascript:evil()">x</a><img src="http://t/p.gif">')) == '<a href="">x</a>'
+
+
+def test_dates_and_unsupported_templates():
+    assert format_month_year("2023-06") == "Jun 2023"
+    assert format_month_year("2023-06-01T00:00:00.000Z") == "Jun 2023"
+    assert format_month_year("Summer 2019") == "Summer 2019"
+    with pytest.raises(ValueError):
+        render_resume_html("modern", DATA)
@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes.review import router
+from src.services import cv_review
+from src.services.cv_review import CVReviewConfig, CVReviewService, KeywordIndexError
+from src.services.job_match import KeywordIndex, TermMatrix
+
+RESUME = {"sections": [{"id": "skills"}], "skills": [{"name": "Python"}, {"name": "Kubernetes"}]}
+
+
+def client() -> TestClient:
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("top_k", ["abc", 0, -3, 2.5, True])
+def test_batch_match_rejects_bad_top_k(top_k):
+    response = client().post(
+        "/api/review/job-match/batch", json={"resumes": [RESUME], "job_descriptions": ["Python"], "top_k": top_k}
+    )
+    assert response.status_code == 400 and "top_k" in response.json()["detail"]
+
+
+def test_batch_match_defaults_top_k():
+    response = client().post("/api/review/job-match/batch", json={"resumes": [RESUME], "job_descriptions": ["Python", "Go"]})
+    assert response.status_code == 200
+
+
+@pytest.fixture
+def corrupt_index(tmp_path, monkeypatch):
+    path = tmp_path / "index.npz"
+    path.write_bytes(b"not an npz")
+    monkeypatch.setenv("REVIEW_JD_INDEX_PATH", str(path))
+    monkeypatch.setattr(cv_review, "_KEYWORD_INDEX", None)
+    return path
+
+
+def test_unreadable_index_raises_a_clear_error(corrupt_index, monkeypatch):
+    with pytest.raises(KeywordIndexError, match="index.npz"):
+        cv_review.get_keyword_index()
+    monkeypatch.setenv("REVIEW_JD_INDEX_PATH", str(corrupt_index.with_name("missing.npz")))
+    with pytest.raises(KeywordIndexError, match="missing.npz"):
+        cv_review.get_keyword_index()
+
+
+def test_review_survives_an_unreadable_index(corrupt_index):
+    service = SimpleNamespace(config=CVReviewConfig())
+    review = {"overallScore": 70}
+    result = CVReviewService._with_job_match(service, review, {**RESUME, "job_description": "Python and Go"})
+    assert result == {"overallScore": 70}
+
+
+def dense(matrix: TermMatrix) -> np.ndarray:
+    out = np.zeros((matrix.rows, matrix.columns), dtype=np.float32)
+    for i in range(matrix.rows):
+        columns, weights = matrix.row(i)
+        out[i, columns] = weights
+    return out
+
+
+@pytest.mark.parametrize("budget", [1 << 22, 64, 1])
+def test_term_matrix_dot_matches_a_dense_product(budget):
+    texts = [
+        "python kubernetes aws terraform",
+        "go grpc kubernetes",
+        "",
+        "python data pipelines kafka spark python",
+        "react typescript css",
+        "aws lambda python kafka",
+    ]
+    index = KeywordIndex.fit(texts)
+    a, b = index.vectorize(texts[:4]), index.vectorize(texts[2:])
+    product = a.dot(b, budget)
+    assert product.shape == (4, 4)
+    np.testing.assert_allclose(product, dense(a) @ dense(b).T, atol=1e-6)
+    # The empty document scores zero against everything
+    assert not product[2].any()
@@ -0,0 +1,47 @@
+import pytest
+
+from src.services.json_repair import IncrementalJSONParser, extract_json
+
+
+def test_strict_json_after_chatter():
+    assert extract_json('Sure! Here it is: {"score": 8, "tips": ["a"]} Hope that helps.') == {"score": 8, "tips": ["a"]}
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ('```json\n{"score": 7,}\n```', {"score": 7}),
+        ("{'score': 7, 'ok': True}", {"score": 7, "ok": True}),
+        # A number cut off mid-way may have had more digits, so it is dropped
+        ('{"a": [1, 2', {"a": [1]}),
+        ('{"score": 85%, "of": 7/10}', {"score": 85, "of": 7}),
+        ('{"a": "unterminated', {"a": "unterminated"}),
+        ('{"a": 1 // note\n, "b": 2}', {"a": 1, "b": 2}),
+        # Bare values are read whole before any number coercion
+        ('{"b": https://x.com}', {"b": "https://x.com"}),
+        ('{"a": .5}', {"a": 0.5}),
+        ('{"a": 3/4}', {"a": "3/4"}),
+        ('{"a": 1 "b": 2}', {"a": 1, "b": 2}),
+    ],
+)
+def test_repairs_common_model_mistakes(text, expected):
+    assert extract_json(text) == expected
+
+
+def test_no_object_at_all():
+    assert extract_json("I cannot review this CV.") is None
+
+
+def test_feed_returns_the_object_once_it_closes():
+    parser = IncrementalJSONParser()
+    pieces = ['{"sco', 're": 9, "sum', 'mary": ["x"', "]}", " trailing"]
+    results = [parser.feed(piece) for piece in pieces]
+    assert results[:3] == [None, None, None]
+    assert results[3] == {"score": 9, "summary": ["x"]}
+    assert parser.finish() == {"score": 9, "summary": ["x"]}
+
+
+def test_finish_closes_an_interrupted_stream():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"score": 5, "sections": [{"name": "Skills"') is None
+    assert parser.finish() == {"score": 5, "sections": [{"name": "Skills"}]}
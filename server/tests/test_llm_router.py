@@ -0,0 +1,155 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.services.llm_router import Backend, LLMRouter, NoBackendAvailable
+
+
+class FakeClient:
+    def __init__(self, name, fail_with=None, chunks=("a", "b", "c")):
+        self.base_url = name
+        self.fail_with = fail_with
+        self.chunks = chunks
+        self.calls = 0
+        self.gate = None
+        self.stream_closed = False
+
+    async def generate(self, prompt, model):
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.fail_with is not None:
+            raise self.fail_with
+        return f"{self.base_url}:{prompt}"
+
+    async def generate_stream(self, prompt, model):
+        self.calls += 1
+        try:
+            if self.fail_with is not None:
+                raise self.fail_with
+            for chunk in self.chunks:
+                yield chunk
+        finally:
+            self.stream_closed = True
+
+
+def status_error(code):
+    request = httpx.Request("POST", "http://llm/api/generate")
+    return httpx.HTTPStatusError("boom", request=request, response=httpx.Response(code, request=request))
+
+
+def router(*clients, **options):
+    options.setdefault("retry_backoff", 0)
+    return LLMRouter([Backend(c, models=["llama3"]) for c in clients], **options)
+
+
+def test_picks_the_backend_with_fewest_outstanding_requests():
+    async def scenario():
+        busy, idle = FakeClient("busy"), FakeClient("idle")
+        r = router(busy, idle)
+        r.backends[0].outstanding = 2
+        assert await r.generate("p", "llama3") == "idle:p"
+        assert (busy.calls, idle.calls) == (0, 1)
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_calls_spread_over_backends():
+    async def scenario():
+        clients = [FakeClient(f"b{i}") for i in range(3)]
+        gate = asyncio.Event()
+        for client in clients:
+            client.gate = gate
+        r = router(*clients)
+        calls = [asyncio.create_task(r.generate("p", "llama3")) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert [b.outstanding for b in r.backends] == [1, 1, 1]
+        gate.set()
+        await asyncio.gather(*calls)
+        assert [b.outstanding for b in r.backends] == [0, 0, 0]
+
+    asyncio.run(scenario())
+
+
+def test_retries_on_another_backend_after_a_server_error():
+    async def scenario():
+        bad, good = FakeClient("bad", fail_with=status_error(503)), FakeClient("good")
+        r = router(bad, good)
+        r.backends[1].outstanding = 1  # make the failing backend the first pick
+        assert await r.generate("p", "llama3") == "good:p"
+        assert bad.calls == 1 and r.backends[0].failures == 1
+
+    asyncio.run(scenario())
+
+
+def test_client_errors_are_not_retried():
+    async def scenario():
+        bad, good = FakeClient("bad", fail_with=status_error(400)), FakeClient("good")
+        r = router(bad, good)
+        r.backends[1].outstanding = 1
+        with pytest.raises(httpx.HTTPStatusError):
+            await r.generate("p", "llama3")
+        assert good.calls == 0
+
+    asyncio.run(scenario())
+
+
+def test_missing_model_moves_to_a_backend_that_has_it():
+    async def scenario():
+        bad, good = FakeClient("bad", fail_with=status_error(404)), FakeClient("good")
+        r = router(bad, good)
+        r.backends[1].outstanding = 1
+        assert await r.generate("p", "llama3") == "good:p"
+        assert not r.backends[0].serves("llama3")
+        r.backends[1].outstanding = 0
+        assert await r.generate("q", "llama3") == "good:q"
+        assert bad.calls == 1
+
+    asyncio.run(scenario())
+
+
+def test_breaker_opens_after_repeated_failures_and_half_opens_later(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("src.services.llm_router.time.monotonic", lambda: now[0])
+
+    async def scenario():
+        client = FakeClient("only", fail_with=httpx.ConnectError("down"))
+        r = router(client, retry_attempts=0, breaker_failures=2, breaker_reset=30)
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectError):
+                await r.generate("p", "llama3")
+        assert r.stats()[0]["circuit"] == "open"
+        with pytest.raises(NoBackendAvailable):
+            await r.generate("p", "llama3")
+        now[0] += 31
+        client.fail_with = None
+        assert r.stats()[0]["circuit"] == "half_open"
+        assert await r.generate("p", "llama3") == "only:p"
+        assert r.stats()[0]["circuit"] == "closed"
+
+    asyncio.run(scenario())
+
+
+def test_stream_retries_only_before_the_first_chunk():
+    async def scenario():
+        bad, good = FakeClient("bad", fail_with=httpx.ReadTimeout("slow")), FakeClient("good")
+        r = router(bad, good)
+        r.backends[1].outstanding = 1
+        assert [chunk async for chunk in r.generate_stream("p", "llama3")] == ["a", "b", "c"]
+        assert bad.calls == 1 and good.calls == 1
+
+    asyncio.run(scenario())
+
+
+def test_stream_closes_the_backend_stream_when_the_consumer_stops():
+    async def scenario():
+        client = FakeClient("only")
+        r = router(client)
+        stream = r.generate_stream("p", "llama3")
+        assert await stream.__anext__() == "a"
+        await stream.aclose()
+        assert client.stream_closed
+        assert r.backends[0].outstanding == 0
+
+    asyncio.run(scenario())
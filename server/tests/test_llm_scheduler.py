@@ -0,0 +1,178 @@
+import asyncio
+
+import pytest
+
+from src.services import llm_scheduler
+from src.services.llm_scheduler import BULK, INTERACTIVE, LLMScheduler, SchedulerOverloaded
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_admits_up_to_capacity_then_queues():
+    async def scenario():
+        scheduler = LLMScheduler(max_in_flight=2)
+        order = []
+        release = asyncio.Event()
+
+        async def call(name):
+            async with scheduler.slot(INTERACTIVE, name):
+                order.append(name)
+                await release.wait()
+
+        tasks = [asyncio.create_task(call(n)) for n in ("a", "b", "c")]
+        await asyncio.sleep(0)
+        assert scheduler.in_flight == 2
+        assert scheduler.stats()["waiting"][INTERACTIVE] == 1
+        release.set()
+        await asyncio.gather(*tasks)
+        assert order == ["a", "b", "c"]
+        assert scheduler.in_flight == 0
+
+    run(scenario())
+
+
+def test_clients_take_turns_within_a_class():
+    async def scenario():
+        scheduler = LLMScheduler(max_in_flight=1)
+        order = []
+        gate = asyncio.Event()
+
+        async def call(client, tag):
+            async with scheduler.slot(BULK, client):
+                order.append(tag)
+                await gate.wait()
+
+        holder = asyncio.create_task(call("x", "x0"))
+        await asyncio.sleep(0)
+        tasks = [asyncio.create_task(call("a", f"a{i}")) for i in range(3)]
+        tasks.append(asyncio.create_task(call("b", "b0")))
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(holder, *tasks)
+        assert order == ["x0", "a0", "b0", "a1", "a2"]
+
+    run(scenario())
+
+
+def test_interactive_goes_first_and_bulk_leaves_room():
+    async def scenario():
+        scheduler = LLMScheduler(max_in_flight=4)
+        assert scheduler.bulk_max_in_flight == 3
+        gate = asyncio.Event()
+
+        async def call(priority, client="c"):
+            async with scheduler.slot(priority, client):
+                await gate.wait()
+
+        bulk = [asyncio.create_task(call(BULK)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert scheduler.stats()["in_flight"][BULK] == 3
+        # The slot bulk cannot take is free for an interactive call straight away
+        interactive = asyncio.create_task(call(INTERACTIVE))
+        await asyncio.sleep(0)
+        assert scheduler.stats()["in_flight"][INTERACTIVE] == 1
+        gate.set()
+        await asyncio.gather(interactive, *bulk)
+        assert scheduler.in_flight == 0
+
+    run(scenario())
+
+
+def test_deadline_sheds_and_frees_queue_entry():
+    async def scenario():
+        scheduler = LLMScheduler(max_in_flight=1, deadlines={INTERACTIVE: 0.05})
+        gate = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot():
+                await gate.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerOverloaded) as info:
+            async with scheduler.slot():
+                pass
+        assert info.value.retry_after >= 1.0
+        assert scheduler.stats()["waiting"][INTERACTIVE] == 0
+        gate.set()
+        await holder
+        assert scheduler.in_flight == 0 and scheduler.shed == 1
+
+    run(scenario())
+
+
+def test_full_queue_is_shed_up_front():
+    async def scenario():
+        scheduler = LLMScheduler(max_in_flight=1, max_waiting=1)
+        gate = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot():
+                await gate.wait()
+
+        tasks = [asyncio.create_task(hold()) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerOverloaded):
+            async with scheduler.slot():
+                pass
+        gate.set()
+        await asyncio.gather(*tasks)
+
+    run(scenario())
+
+
+def test_cancelled_waiter_leaves_no_slot_behind():
+    async def scenario():
+        scheduler = LLMScheduler(max_in_flight=1)
+        gate = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot():
+                await gate.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        gate.set()
+        await asyncio.gather(holder, waiter, return_exceptions=True)
+        assert scheduler.in_flight == 0
+        assert scheduler.stats()["waiting"][INTERACTIVE] == 0
+
+    run(scenario())
+
+
+def test_grant_racing_the_deadline_keeps_the_slot(monkeypatch):
+    # On 3.12+ wait_for can raise TimeoutError after the future already got its result;
+    # simulate that ordering on any version
+    async def scenario():
+        scheduler = LLMScheduler(max_in_flight=1)
+        gate = asyncio.Event()
+        outcomes = []
+
+        async def hold():
+            async with scheduler.slot():
+                await gate.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+
+        async def granted_then_timed_out(future, timeout):
+            gate.set()
+            await holder
+            assert future.done()
+            raise asyncio.TimeoutError
+
+        monkeypatch.setattr(llm_scheduler.asyncio, "wait_for", granted_then_timed_out)
+        try:
+            async with scheduler.slot():
+                outcomes.append("ran")
+        except SchedulerOverloaded:
+            outcomes.append("shed")
+        assert outcomes == ["ran"]
+        assert scheduler.in_flight == 0
+
+    run(scenario())
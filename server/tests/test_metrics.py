@@ -0,0 +1,35 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes.health import router as health_router
+from src.api.routes.metrics import router as metrics_router
+from src.services.metrics import REVIEW_STAGE
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(metrics_router)
+    app.include_router(health_router)
+    return TestClient(app)
+
+
+def test_metrics_renders_prometheus_text():
+    REVIEW_STAGE.observe(0.2, stage="heuristics")
+    response = make_client().get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert "# TYPE review_stage_duration_seconds histogram" in body
+    assert 'review_stage_duration_seconds_bucket{stage="heuristics",le="0.25"}' in body
+    assert 'review_stage_duration_seconds_bucket{stage="heuristics",le="+Inf"}' in body
+    # Registered collectors render alongside the instrumented metrics
+    assert "# TYPE llm_scheduler_in_flight gauge" in body
+    assert "# TYPE cache_hits_total counter" in body
+
+
+def test_probes_without_warmup():
+    client = make_client()
+    assert client.get("/health/live").json() == {"status": "alive"}
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
@@ -0,0 +1,95 @@
+import asyncio
+from datetime import datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes import health
+from src.services.cv_review import OllamaClient
+from src.services.model_keeper import KeepAliveWindow, ModelKeeper
+
+
+class FakeOllama:
+    def __init__(self, failures: int = 0):
+        self.base_url = "http://ollama"
+        self.failures = failures
+        self.keep_alive = None
+        self.keep_alive_models = set()
+        self.preloads = []
+
+    async def preload(self, model, keep_alive=None, timeout=None):
+        self.preloads.append((model, keep_alive))
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("not up yet")
+        return 0.1
+
+
+def test_window_spanning_midnight_belongs_to_the_day_it_starts():
+    window = KeepAliveWindow("22:00-02:00", "fri")
+    friday_late, saturday_early, saturday_late = datetime(2024, 5, 3, 23, 0), datetime(2024, 5, 4, 1, 0), datetime(2024, 5, 4, 23, 0)
+    assert window.seconds_left(friday_late) == 3 * 3600
+    assert window.seconds_left(saturday_early) == 3600
+    assert window.seconds_left(saturday_late) == 0
+    assert KeepAliveWindow().seconds_left() == float("inf")
+
+
+def test_keeper_is_ready_once_every_model_loaded_and_pins_only_its_models():
+    async def scenario():
+        client = FakeOllama()
+        keeper = ModelKeeper(client, ["llama3", "gemma2:2b"])
+        assert not keeper.ready
+        await keeper.refresh()
+        assert keeper.ready
+        assert client.preloads == [("llama3:latest", -1), ("gemma2:2b", -1)]
+        assert client.keep_alive == -1 and client.keep_alive_models == {"llama3:latest", "gemma2:2b"}
+
+    asyncio.run(scenario())
+
+
+def test_generate_payload_carries_keep_alive_only_for_managed_models():
+    client = OllamaClient("http://ollama")
+    client.keep_alive, client.keep_alive_models = -1, {"llama3:latest"}
+    assert client._payload("llama3", prompt="p")["keep_alive"] == -1
+    assert "keep_alive" not in client._payload("mistral", prompt="p")
+
+
+def test_warm_up_survives_unexpected_errors():
+    async def scenario():
+        keeper = ModelKeeper(FakeOllama(), ["llama3"])
+        real_refresh = keeper.refresh
+        calls = []
+
+        async def flaky_refresh():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            await real_refresh()
+
+        keeper.refresh = flaky_refresh
+        keeper.start()
+        for _ in range(200):
+            if keeper.warmed_at is not None:
+                break
+            await asyncio.sleep(0.01)
+        await keeper.stop()
+        assert keeper.ready and len(calls) == 2
+
+    asyncio.run(scenario())
+
+
+def test_readiness_reports_503_until_models_are_warm(monkeypatch):
+    client = FakeOllama(failures=1)
+    keeper = ModelKeeper(client, ["llama3"])
+    monkeypatch.setattr(health, "get_model_keeper", lambda: keeper)
+    app = FastAPI()
+    app.include_router(health.router)
+    api = TestClient(app)
+    warming = api.get("/health/ready")
+    assert warming.status_code == 503 and warming.json()["status"] == "warming"
+    asyncio.run(keeper.refresh())
+    assert api.get("/health/ready").status_code == 503
+    asyncio.run(keeper.refresh())
+    ready = api.get("/health/ready")
+    assert ready.status_code == 200 and ready.json()["models"]["llama3:latest"]["ready"]
+    assert api.get("/health/live").json() == {"status": "alive"}
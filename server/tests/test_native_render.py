@@ -0,0 +1,51 @@
+import io
+
+from docx import Document
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes.pdf import router
+from src.services.native_render import build_document, parse_rich_text, render_docx, render_pdf
+
+DIRTY = {
+    "personalDetails": {"fullName": "Ann\x0b Lee", "jobTitle": "Engineer\x0c"},
+    "sections": [{"id": "summary", "title": "Summary\x01", "isVisible": True}],
+    "professionalSummary": {"content": "<p>Ships\x0b things\x1f</p>"},
+}
+
+
+def test_control_characters_are_stripped_from_text():
+    doc = build_document(DIRTY)
+    assert (doc.name, doc.role) == ("Ann Lee", "Engineer")
+    assert parse_rich_text("<p>a\x0bb</p>")[0].runs == [("ab", False, False)]
+    assert parse_rich_text("plain\x0c")[0].runs == [("plain", False, False)]
+
+
+def test_documents_with_control_characters_render():
+    text = "\n".join(p.text for p in Document(io.BytesIO(render_docx("classic", DIRTY))).paragraphs)
+    assert "Ann Lee" in text and "Ships things" in text
+    assert render_pdf("classic", DIRTY).startswith(b"%PDF")
+
+
+def test_docx_export_rejects_templates_without_a_native_layout():
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    response = TestClient(app).post("/api/export-docx", json={"template": "modern", "data": DIRTY})
+    assert response.status_code == 400 and "modern" in response.json()["detail"]
+
+
+def test_renders_the_same_sections_as_the_html_templates():
+    data = {
+        "personalDetails": {"fullName": "Ann Lee"},
+        "sections": [
+            {"id": "experience", "title": "Work", "order": 2, "isVisible": False},
+            {"id": "summary", "title": "About", "order": 1, "isVisible": True},
+        ],
+        "professionalSummary": {"content": "<p>Ships things</p>"},
+        "workExperiences": [{"position": "Engineer", "company": "Acme"}],
+        "awards": [{"title": "Best Paper"}],
+        "languages": [{"language": "French"}],
+    }
+    doc = build_document(data)
+    # Ordered by "order"; isVisible is ignored and unlisted sections are not drawn, as in the HTML path
+    assert [(s.id, s.title) for s in doc.sections] == [("summary", "About"), ("experience", "Work")]
@@ -0,0 +1,87 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from src.services.cv_review import OllamaClient
+
+
+def client_for(handler) -> OllamaClient:
+    client = OllamaClient("http://ollama:11434/")
+    client._http = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_generate_posts_a_non_streaming_request():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(200, json={"response": "hello", "done": True})
+
+    async def scenario():
+        client = client_for(handler)
+        try:
+            return await client.generate("Say hi", "llama3")
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(scenario()) == "hello"
+    assert seen == [("/api/generate", {"model": "llama3", "prompt": "Say hi", "stream": False})]
+
+
+def test_calls_overlap_on_the_shared_pool():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.1)
+        return httpx.Response(200, json={"response": "ok"})
+
+    async def scenario():
+        client = client_for(handler)
+        try:
+            start = time.perf_counter()
+            results = await asyncio.gather(*(client.generate(f"p{i}", "llama3") for i in range(8)))
+            return results, time.perf_counter() - start
+        finally:
+            await client.aclose()
+
+    results, elapsed = asyncio.run(scenario())
+    assert results == ["ok"] * 8
+    # Sequential calls would take 0.8s
+    assert elapsed < 0.5
+
+
+def test_stream_yields_text_until_done():
+    lines = [{"response": "Hel"}, {"response": ""}, {"response": "lo"}, {"done": True, "eval_count": 2}, {"response": "ignored"}]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, content="\n".join(json.dumps(line) for line in lines).encode())
+
+    async def scenario():
+        client = client_for(handler)
+        try:
+            return [chunk async for chunk in client.generate_stream("p", "llama3")]
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(scenario()) == ["Hel", "lo"]
+
+
+def test_errors_surface_to_the_caller():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/tags":
+            return httpx.Response(200, json={"models": [{"name": "llama3:latest"}]})
+        return httpx.Response(500, json={"error": "out of memory"})
+
+    async def scenario():
+        client = client_for(handler)
+        try:
+            assert await client.list_models() == ["llama3:latest"]
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.generate("p", "llama3")
+        finally:
+            await client.aclose()
+
+    asyncio.run(scenario())
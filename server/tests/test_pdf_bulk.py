@@ -0,0 +1,62 @@
+import asyncio
+import io
+import json
+import zipfile
+
+from src.services import pdf_bulk
+
+
+def collect(items, concurrency=2):
+    async def scenario():
+        return b"".join([chunk async for chunk in pdf_bulk.stream_pdf_zip(items, concurrency)])
+
+    return zipfile.ZipFile(io.BytesIO(asyncio.run(scenario())))
+
+
+def fake_export(calls):
+    async def export(template, data, mode, pool=None):
+        calls.append(template)
+        if data.get("fail"):
+            raise RuntimeError("boom")
+        await asyncio.sleep(0.01 if data.get("slow") else 0)
+        return "key", f"%PDF-{template}".encode()
+
+    return export
+
+
+def test_archive_streams_pdfs_and_manifest_in_request_order(monkeypatch):
+    calls = []
+    monkeypatch.setattr(pdf_bulk, "export_pdf_bytes", fake_export(calls))
+    items = [
+        {"template": "classic", "mode": "native", "data": {"slow": True, "personalDetails": {"fullName": "Ann Lee"}}},
+        {"template": "classic", "mode": "native", "data": {"fail": True}},
+        {"template": "professional", "mode": "native", "data": {"a": 1}, "filename": "My CV.pdf"},
+    ]
+    archive = collect(items)
+    assert archive.testzip() is None
+    assert sorted(archive.namelist()) == ["001-ann-lee-classic.pdf", "003-my-cv.pdf", "manifest.json"]
+    assert archive.read("003-my-cv.pdf") == b"%PDF-professional"
+    assert archive.getinfo("001-ann-lee-classic.pdf").compress_type == zipfile.ZIP_STORED
+    manifest = json.loads(archive.read("manifest.json"))
+    assert [entry["index"] for entry in manifest["results"]] == [0, 1, 2]
+    assert [entry["status"] for entry in manifest["results"]] == ["done", "failed", "done"]
+    assert manifest["done"] == 2 and manifest["failed"] == 1
+
+
+def test_malformed_items_fail_alone(monkeypatch):
+    calls = []
+    monkeypatch.setattr(pdf_bulk, "export_pdf_bytes", fake_export(calls))
+    items = [
+        {"template": "classic", "mode": "native", "data": {"personalDetails": "not an object"}},
+        {"template": "classic", "data": "oops"},
+        {"template": ["classic"], "data": {"a": 1}},
+        {"template": "classic", "mode": 5, "data": {"a": 1}},
+        {"template": "classic", "mode": "bogus", "data": {"a": 1}},
+        7,
+    ]
+    archive = collect(items)
+    assert archive.testzip() is None
+    results = json.loads(archive.read("manifest.json"))["results"]
+    assert [entry["status"] for entry in results] == ["done", "failed", "failed", "failed", "failed", "failed"]
+    assert archive.namelist() == ["001-cv-classic.pdf", "manifest.json"]
+    assert calls == ["classic"]
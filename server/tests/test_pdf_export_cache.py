@@ -0,0 +1,70 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes.pdf import router
+from src.services import pdf_export
+from src.services.cache import LRUCache
+
+DATA = {"personalDetails": {"fullName": "Ann Lee"}}
+
+
+@pytest.fixture
+def api(monkeypatch):
+    renders = []
+
+    async def render(template, data, pool=None):
+        renders.append(template)
+        return b"%PDF-" + template.encode()
+
+    monkeypatch.setattr(pdf_export, "_RENDER_CACHE", LRUCache(max_bytes=1 << 20, encode=bytes, decode=bytes))
+    monkeypatch.setattr(pdf_export, "generate_pdf_native", render)
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    client = TestClient(app)
+    client.renders = renders
+    return client
+
+
+def export(api, data=DATA, **headers):
+    return api.post("/api/export-pdf", json={"template": "classic", "data": data, "mode": "native"}, headers=headers)
+
+
+def test_identical_exports_render_once(api):
+    first, second = export(api), export(api)
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content == b"%PDF-classic"
+    assert api.renders == ["classic"]
+    assert api.get("/api/export-pdf/cache").json()["hits"] == 1
+
+
+def test_if_none_match_is_answered_before_rendering(api):
+    etag = export(api).headers["etag"]
+    assert api.renders == ["classic"]
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = export(api, **{"If-None-Match": header})
+        assert response.status_code == 304 and response.content == b""
+        assert response.headers["etag"] == etag
+    assert api.renders == ["classic"]
+
+
+def test_different_data_gets_a_different_etag(api):
+    etag = export(api).headers["etag"]
+    changed = export(api, data={"personalDetails": {"fullName": "Bo Chen"}}, **{"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+    assert len(api.renders) == 2
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"template": ["classic"], "data": DATA},
+        {"template": {"a": 1}, "data": DATA},
+        {"template": "classic", "data": DATA, "mode": 1},
+        {"template": "classic", "data": ["x"]},
+    ],
+)
+def test_malformed_payloads_are_rejected(api, payload):
+    response = api.post("/api/export-pdf", json=payload)
+    assert response.status_code == 400
+    assert api.renders == []
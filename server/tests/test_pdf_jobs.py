@@ -0,0 +1,87 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes.pdf import router
+from src.services import pdf_jobs
+from src.services.cache import LRUCache
+from src.services.pdf_jobs import DONE, PdfJobQueue
+
+
+def test_sweep_evicts_every_expired_job_regardless_of_submission_order(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(pdf_jobs.time, "time", lambda: now[0])
+    monkeypatch.setattr(pdf_jobs, "get_render_cache", lambda: None)
+    slow = asyncio.Event()
+
+    async def export(template, data, mode, pool=None):
+        if template == "slow":
+            await slow.wait()
+        return "key", b"%PDF"
+
+    monkeypatch.setattr(pdf_jobs, "export_pdf_bytes", export)
+
+    async def scenario():
+        queue = PdfJobQueue(workers=2, result_ttl=60)
+        await queue.start()
+        first = await queue.submit("slow", {"n": 1})
+        second = await queue.submit("fast", {"n": 2})
+        assert await second.wait(1) and second.status == DONE
+        # The job ahead of it is still running, yet the finished one must still expire
+        now[0] += 61
+        assert queue.get(second.id) is None
+        assert queue.get(first.id) is first
+        slow.set()
+        assert await first.wait(1)
+        now[0] += 30
+        assert queue.get(first.id) is first
+        now[0] += 31
+        assert queue.get(first.id) is None
+        assert queue.stats()["jobs"][DONE] == 0
+        await queue.stop()
+
+    asyncio.run(scenario())
+
+
+def test_cached_render_completes_the_job_without_queueing(monkeypatch, tmp_path):
+    cache = LRUCache(disk_dir=str(tmp_path), encode=bytes, decode=bytes)
+    monkeypatch.setattr(pdf_jobs, "get_render_cache", lambda: cache)
+
+    async def scenario():
+        queue = PdfJobQueue(workers=1)
+        key = pdf_jobs.render_cache_key("classic", {"n": 1}, "native")
+        await cache.aset(key, b"%PDF-cached")
+        # Only on disk, as after a restart
+        cache._entries.clear()
+        job = await queue.submit("classic", {"n": 1}, "native")
+        assert job.status == DONE and job.result == b"%PDF-cached"
+        assert queue.depth() == 0 and cache.stats()["disk_hits"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_job_routes_run_on_the_event_loop(monkeypatch):
+    monkeypatch.setattr(pdf_jobs, "get_render_cache", lambda: None)
+
+    async def export(template, data, mode, pool=None):
+        return "key", b"%PDF-" + template.encode()
+
+    monkeypatch.setattr(pdf_jobs, "export_pdf_bytes", export)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await pdf_jobs.start_pdf_job_queue()
+        yield
+        await pdf_jobs.stop_pdf_job_queue()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(router, prefix="/api")
+    with TestClient(app) as api:
+        created = api.post("/api/export-pdf/jobs", json={"template": "classic", "data": {"a": 1}, "mode": "native"})
+        assert created.status_code == 202
+        status = api.get(f"/api/export-pdf/jobs/{created.json()['job_id']}", params={"wait": 5}).json()
+        assert status["status"] == DONE
+        download = api.get(status["download_url"])
+        assert download.status_code == 200 and download.content == b"%PDF-classic"
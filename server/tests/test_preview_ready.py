@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from src.services.pdf_export import _wait_until_ready
+
+
+class FakePage:
+    def __init__(self, ready=None):
+        # None: the page never sets data-cv-ready (an older client build)
+        self.ready = ready
+        self.calls = []
+
+    async def wait_for_selector(self, selector, state, timeout):
+        self.calls.append(("selector", selector))
+        if self.ready is None:
+            raise PlaywrightTimeoutError("timed out")
+
+    async def get_attribute(self, selector, name):
+        return self.ready
+
+    async def wait_for_load_state(self, state, timeout):
+        self.calls.append(("load_state", state))
+
+
+def test_returns_as_soon_as_the_preview_signals_ready():
+    page = FakePage(ready="true")
+    asyncio.run(_wait_until_ready(page))
+    assert page.calls == [("selector", "html[data-cv-ready]")]
+
+
+def test_a_preview_that_failed_to_load_data_is_an_error():
+    with pytest.raises(RuntimeError, match="failed to load"):
+        asyncio.run(_wait_until_ready(FakePage(ready="error")))
+
+
+def test_older_clients_fall_back_to_network_idle():
+    page = FakePage()
+    asyncio.run(_wait_until_ready(page))
+    assert page.calls == [("selector", "html[data-cv-ready]"), ("load_state", "networkidle")]
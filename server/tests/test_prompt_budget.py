@@ -0,0 +1,46 @@
+from src.services.prompt_budget import OMITTED, PromptBudget, estimate_tokens
+
+
+def experience(entries: int, bullets: int) -> str:
+    blocks = []
+    for e in range(entries):
+        lines = [f"Engineer {e} — Company {e} (Jan {2020 - e} – Dec {2020 - e})"]
+        for b in range(bullets):
+            lines.append(f"- Reduced costs by {b + 10}% across the platform" if b == bullets - 1 else "- worked on assorted internal tooling")
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+def test_token_estimate_counts_digits_and_long_words():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("2024") == 4
+    assert estimate_tokens("internationalization") == 1 + len("internationalization") // 7
+
+
+def test_text_within_budget_is_only_normalised():
+    text, trimmed = PromptBudget().compact_section("Skills", "<ul><li>Python</li><li>Go</li></ul>")
+    assert trimmed is False
+    assert text == "Python\n- Go"
+
+
+def test_oversized_section_keeps_headers_and_measurable_bullets():
+    text, trimmed = PromptBudget().compact_section("Experience", experience(3, 8), budget=120)
+    assert trimmed and estimate_tokens(text) <= 120
+    assert "Engineer 0 — Company 0" in text
+    # The quantified bullet outranks the filler that came before it
+    assert "Reduced costs by 17%" in text
+    assert f"- {OMITTED}" in text
+
+
+def test_newest_entries_survive_when_headers_alone_overflow():
+    text, trimmed = PromptBudget().compact_section("Experience", experience(20, 1), budget=60)
+    assert trimmed and estimate_tokens(text) <= 60
+    assert "Company 0" in text and "Company 19" not in text
+
+
+def test_fit_resume_shrinks_everything_to_the_total_budget():
+    budget = PromptBudget(max_resume_tokens=300)
+    sections = {"Experience": experience(4, 10), "Projects": experience(3, 10), "Summary": "Engineer. " * 80}
+    fitted, trimmed = budget.fit_resume(sections)
+    assert sum(estimate_tokens(t) for t in fitted.values()) <= 300
+    assert set(trimmed) == set(sections)
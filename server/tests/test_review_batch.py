@@ -0,0 +1,70 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes.review import router
+from src.services.cv_review import DedupingLLMClient
+
+
+def client() -> TestClient:
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    return TestClient(app)
+
+
+def test_batch_rejects_items_that_are_not_objects():
+    response = client().post("/api/review/batch", json={"items": ["x", 1]})
+    assert response.status_code == 400
+    assert "0, 1" in response.json()["detail"]
+
+
+def test_batch_requires_items():
+    assert client().post("/api/review/batch", json={"items": []}).status_code == 400
+
+
+class FlakyClient:
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    async def generate(self, prompt: str, model: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(0)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("backend down")
+        return f"answer to {prompt}"
+
+
+def test_deduping_client_shares_answers():
+    async def scenario():
+        inner = FlakyClient(failures=0)
+        deduped = DedupingLLMClient(inner)
+        results = await asyncio.gather(*(deduped.generate("p", "m") for _ in range(3)))
+        assert results == ["answer to p"] * 3
+        assert await deduped.generate("p", "m") == "answer to p"
+        assert inner.calls == 1 and deduped.requested == 4 and deduped.issued == 1
+
+    asyncio.run(scenario())
+
+
+def test_deduping_client_does_not_keep_failures():
+    async def scenario():
+        inner = FlakyClient(failures=1)
+        deduped = DedupingLLMClient(inner)
+        first = await asyncio.gather(deduped.generate("p", "m"), deduped.generate("p", "m"), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in first)
+        # The failure was shared by the concurrent callers but not kept for later ones
+        assert await deduped.generate("p", "m") == "answer to p"
+        assert inner.calls == 2 and deduped.issued == 2
+
+    asyncio.run(scenario())
+
+
+def test_batch_rejects_unknown_strategies_up_front():
+    api = client()
+    response = api.post("/api/review/batch", json={"strategy": "bogus", "items": [{"sections": [1]}]})
+    assert response.status_code == 400 and "bogus" in response.json()["detail"]
+    response = api.post("/api/review/batch", json={"items": [{"sections": [1]}, {"sections": [1], "strategy": "nope"}]})
+    assert response.status_code == 400 and "nope" in response.json()["detail"]
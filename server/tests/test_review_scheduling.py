@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+from src.services.cache import LRUCache
+from src.services.cv_review import CVReviewConfig, CVReviewService
+from src.services.llm_scheduler import BULK, INTERACTIVE, LLMScheduler
+from src.services.single_flight import SingleFlight
+
+ANSWER = json.dumps({"score": 80, "strengths": ["clear"], "areas_to_improve": [], "suggestions": []})
+
+
+class FakeLLM:
+    def __init__(self):
+        self.calls = 0
+        self.gate = asyncio.Event()
+
+    async def generate(self, prompt, model):
+        self.calls += 1
+        await self.gate.wait()
+        return ANSWER
+
+
+def service(llm, scheduler, flights=None, cache=None, priority=INTERACTIVE):
+    return CVReviewService(llm, CVReviewConfig(), cache, flights=flights, scheduler=scheduler, priority=priority)
+
+
+async def hold_every_slot(scheduler):
+    release = asyncio.Event()
+
+    async def hold():
+        async with scheduler.slot(BULK, "other"):
+            await release.wait()
+
+    holders = [asyncio.create_task(hold()) for _ in range(scheduler.max_in_flight)]
+    await asyncio.sleep(0)
+    return release, holders
+
+
+def test_cache_hits_do_not_wait_for_a_scheduler_slot():
+    async def scenario():
+        llm, cache = FakeLLM(), LRUCache(max_entries=10)
+        llm.gate.set()
+        scheduler = LLMScheduler(max_in_flight=1, bulk_max_in_flight=1)
+        warm = service(llm, scheduler, cache=cache)
+        await warm._run_limited(asyncio.Semaphore(2), warm.section_analyzer.analyze_section, "Skills", "Python", "llama3")
+        assert llm.calls == 1
+
+        release, holders = await hold_every_slot(scheduler)
+        result = await asyncio.wait_for(
+            warm._run_limited(asyncio.Semaphore(2), warm.section_analyzer.analyze_section, "Skills", "Python", "llama3"), 1
+        )
+        assert result["score"] == 80 and llm.calls == 1
+        assert scheduler.stats()["waiting"][INTERACTIVE] == 0
+        release.set()
+        await asyncio.gather(*holders)
+
+    asyncio.run(scenario())
+
+
+def test_interactive_calls_do_not_join_a_bulk_flight():
+    async def scenario():
+        llm, flights = FakeLLM(), SingleFlight()
+        scheduler = LLMScheduler(max_in_flight=2)
+        bulk = service(llm, scheduler, flights=flights, priority=BULK)
+        interactive = service(llm, scheduler, flights=flights)
+        args = ("Skills", "Python", "llama3")
+        bulk_call = asyncio.create_task(bulk._run_limited(asyncio.Semaphore(1), bulk.section_analyzer.analyze_section, *args))
+        await asyncio.sleep(0)
+        interactive_call = asyncio.create_task(
+            interactive._run_limited(asyncio.Semaphore(1), interactive.section_analyzer.analyze_section, *args)
+        )
+        await asyncio.sleep(0)
+        assert flights.stats()["started"] == 2 and flights.stats()["shared"] == 0
+        # Same class still coalesces
+        again = asyncio.create_task(interactive._run_limited(asyncio.Semaphore(1), interactive.section_analyzer.analyze_section, *args))
+        await asyncio.sleep(0)
+        assert flights.stats()["shared"] == 1
+        llm.gate.set()
+        results = await asyncio.gather(bulk_call, interactive_call, again)
+        assert all(r["score"] == 80 for r in results)
+
+    asyncio.run(scenario())
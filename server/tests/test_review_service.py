@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+from src.services.cv_review import CVReviewConfig, CVReviewService
+
+# One answer that parses as a section result and as the combined analysis
+ANSWER = json.dumps({
+    "score": 75,
+    "strengths": ["clear"],
+    "areas_to_improve": [],
+    "suggestions": ["add numbers"],
+    "atsCompatibility": {"score": 70, "summary": ["ok"]},
+    "contentQuality": {"score": 60, "summary": ["ok"]},
+    "formattingAnalysis": {"score": 80, "summary": ["ok"]},
+})
+
+PAYLOAD = {
+    "sections": [{"id": "summary"}],
+    "professionalSummary": {"content": "Backend engineer building payment systems."},
+    "workExperiences": [{"position": "Engineer", "company": "Acme", "startDate": "2020", "endDate": "2023", "description": "Built billing."}],
+    "education": [{"degree": "BSc", "institution": "State", "startDate": "2016", "endDate": "2020"}],
+    "skills": [{"name": "Python"}, {"name": "Go"}],
+    "projects": [{"name": "Ledger", "description": "Double-entry ledger service."}],
+}
+
+
+class CountingLLM:
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def generate(self, prompt, model):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            return ANSWER
+        finally:
+            self.active -= 1
+
+
+def review(limit: int, monkeypatch):
+    monkeypatch.setenv("REVIEW_MAX_CONCURRENCY", str(limit))
+    llm = CountingLLM()
+    result = asyncio.run(CVReviewService(llm, CVReviewConfig()).review_cv_payload(PAYLOAD))
+    return llm, result
+
+
+def test_section_and_combined_prompts_run_concurrently(monkeypatch):
+    llm, result = review(10, monkeypatch)
+    # Five sections plus the combined analysis, all in flight together
+    assert llm.calls == 6 and llm.peak == 6
+    assert [s["name"] for s in result["sections"]] == ["Summary", "Experience", "Education", "Skills", "Projects"]
+    assert all(s["score"] == 75 for s in result["sections"])
+
+
+def test_concurrency_is_bounded_per_request(monkeypatch):
+    llm, result = review(2, monkeypatch)
+    assert llm.calls == 6 and llm.peak == 2
+    assert len(result["sections"]) == 5
+
+
+def test_a_failing_prompt_does_not_sink_the_review(monkeypatch):
+    monkeypatch.setenv("REVIEW_MAX_CONCURRENCY", "10")
+
+    class PartlyFailing(CountingLLM):
+        async def generate(self, prompt, model):
+            if "Section: 'Skills'" in prompt:
+                raise ConnectionError("backend went away")
+            return await super().generate(prompt, model)
+
+    result = asyncio.run(CVReviewService(PartlyFailing(), CVReviewConfig()).review_cv_payload(PAYLOAD))
+    scores = {s["name"]: s["score"] for s in result["sections"]}
+    assert scores["Skills"] == 0.0 and scores["Experience"] == 75
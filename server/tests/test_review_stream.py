@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes.review import router
+from src.services import cv_review
+from src.services.cv_review import CVReviewConfig, CVReviewService
+
+from tests.test_review_service import ANSWER, PAYLOAD
+
+
+class StreamingLLM:
+    def __init__(self):
+        self.closed = 0
+
+    async def generate(self, prompt, model):
+        return ANSWER
+
+    async def generate_stream(self, prompt, model):
+        # Slower for the combined prompt, so section events come first
+        await asyncio.sleep(0.05 if "Task: analyze one CV section" not in prompt else 0)
+        try:
+            for start in range(0, len(ANSWER), 16):
+                yield ANSWER[start:start + 16]
+        finally:
+            self.closed += 1
+
+
+def stream(monkeypatch, llm):
+    monkeypatch.setattr(
+        cv_review, "create_default_cv_review_service",
+        lambda stream=False, client_id="default": CVReviewService(llm, CVReviewConfig(), stream=stream),
+    )
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    return TestClient(app).post("/api/review/stream", json=PAYLOAD)
+
+
+def test_stream_emits_sections_as_they_finish_then_the_result(monkeypatch):
+    llm = StreamingLLM()
+    response = stream(monkeypatch, llm)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    kinds = [e["event"] for e in events]
+    assert kinds[0] == "start" and kinds[-1] == "result"
+    assert kinds.count("section") == 5 and kinds.count("analysis") == 1
+    assert kinds.index("analysis") == len(kinds) - 2
+    assert sorted(e["index"] for e in events if e["event"] == "section") == list(range(5))
+    assert events[-1]["review"]["sections"][0]["score"] == 75
+    # Every model stream was closed once its object had arrived
+    assert llm.closed == 6
+
+
+def test_stream_reports_failures_as_an_error_event(monkeypatch):
+    def broken(stream=False, client_id="default"):
+        raise RuntimeError("no backend")
+
+    monkeypatch.setattr(cv_review, "create_default_cv_review_service", broken)
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    response = TestClient(app).post("/api/review/stream", json=PAYLOAD)
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events == [{"event": "error", "detail": "Review failed: no backend"}]
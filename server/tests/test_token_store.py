@@ -0,0 +1,77 @@
+import pytest
+
+from src.services import token_store
+from src.services.token_store import MemoryTokenStore, SqliteTokenStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryTokenStore(max_entries=3)
+    else:
+        store = SqliteTokenStore(str(tmp_path / "tokens" / "store.sqlite3"), max_entries=3)
+        yield store
+        store.close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(token_store.time, "time", lambda: now[0])
+    return now
+
+
+def test_round_trip_with_expiry(store, clock):
+    store.put("t", {"name": "Ann"}, 60)
+    assert store.get("t") == ({"name": "Ann"}, 1060.0)
+    assert store.get("missing") is None
+
+
+def test_sweep_drops_expired_and_oldest_beyond_the_cap(store, clock):
+    store.put("old", {}, 10)
+    clock[0] += 11
+    assert store.sweep() >= 1
+    assert store.get("old") is None
+    for i in range(5):
+        store.put(f"t{i}", {"i": i}, 60)
+        clock[0] += 1
+    store.sweep()
+    assert [store.get(f"t{i}") is not None for i in range(5)] == [False, False, True, True, True]
+
+
+def test_sqlite_store_is_shared_between_connections(tmp_path, clock):
+    path = str(tmp_path / "shared.sqlite3")
+    writer, reader = SqliteTokenStore(path), SqliteTokenStore(path)
+    try:
+        writer.put("t", {"ok": True}, 60)
+        assert reader.get("t") == ({"ok": True}, 1060.0)
+    finally:
+        writer.close()
+        reader.close()
+
+
+def test_cap_holds_on_put_without_a_sweep(store, clock):
+    for i in range(5):
+        store.put(f"t{i}", {"i": i}, 60)
+        clock[0] += 1
+    assert [store.get(f"t{i}") is not None for i in range(5)] == [False, False, True, True, True]
+
+
+def test_preview_data_route_reads_the_store(monkeypatch, tmp_path):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from src.api.routes.pdf import router
+    from src.services.pdf_export import put_token
+
+    store = SqliteTokenStore(str(tmp_path / "store.sqlite3"))
+    monkeypatch.setattr(token_store, "_STORE", store)
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    try:
+        with TestClient(app) as client:
+            client.portal.call(put_token, "t", {"name": "Ann"})
+            assert client.get("/api/cv-data/t").json() == {"name": "Ann"}
+            assert client.get("/api/cv-data/missing").status_code == 404
+    finally:
+        store.close()